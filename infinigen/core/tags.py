@@ -6,8 +6,11 @@
 
 from __future__ import annotations
 
+import functools
+import threading
+import weakref
 from abc import ABCMeta
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 from enum import Enum, EnumMeta
 
 
@@ -16,17 +19,27 @@ class ABCEnumMeta(EnumMeta, ABCMeta):
 
 
 class Tag:
+    __slots__ = ()
+
     def __neg__(self) -> Negated:
         return Negated(self)
 
+    def to_string(self) -> str:
+        tag = self
+        raise ValueError(f"to_string unhandled {tag=}")
+
 
 class StringTag(Tag):
     def __init__(self, desc: str):
         self.desc = desc
 
+    def to_string(self) -> str:
+        return self.desc
+
 
 class EnumTag(Tag, Enum, metaclass=ABCEnumMeta):
-    pass
+    def to_string(self) -> str:
+        return self.value
 
 
 class Semantics(EnumTag):
@@ -108,7 +121,7 @@ class Semantics(EnumTag):
 
     # Object Access Method
     AccessStandingNear = "access-stand-near"
-    AccessSit = "access-stand-near"
+    AccessSit = "access-sit"
     AccessOpenDoor = "access-open-door"
     AccessHand = "access-with-hand"
 
@@ -132,18 +145,17 @@ class Semantics(EnumTag):
     NoChildren = "no-children"
 
     def __str__(self):
-        return f"{self.__class__.__name__}({self.value})"
+        return self._str_cache
 
     def __repr__(self):
-        return f"{self.__class__.__name__}.{self.name}"
+        return self._repr_cache
 
     def __lt__(self, other):
         return self.name < other.name
 
-    @classmethod
-    @property
-    def floors(cls):
-        return [Semantics.GroundFloor, Semantics.SecondFloor, Semantics.ThirdFloor]
+
+# assigned after the class body so that it is not collected as an enum member
+Semantics.floors = (Semantics.GroundFloor, Semantics.SecondFloor, Semantics.ThirdFloor)
 
 
 class Subpart(EnumTag):
@@ -161,22 +173,73 @@ class Subpart(EnumTag):
     StaircaseWall = "staircase-wall"  # TODO Lingjie Remove
 
     def __str__(self):
-        return f"{self.__class__.__name__}({self.value})"
+        return self._str_cache
 
     def __repr__(self):
-        return f"{self.__class__.__name__}.{self.name}"
+        return self._repr_cache
 
 
-@dataclass(frozen=True)
-class FromGenerator(Tag):
+# members are fixed, so precompute their str/repr once rather than formatting per call
+for _member in (*Semantics, *Subpart):
+    _member._str_cache = f"{_member.__class__.__name__}({_member.value})"
+    _member._repr_cache = f"{_member.__class__.__name__}.{_member.name}"
+del _member
+
+
+# Hash-consing table: equal dataclass tags are always the same instance, so
+# set membership / intersection over tags only ever needs identity hashing
+_INTERN: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+# Tags compare by identity, so two threads missing on the same key must not
+# each register their own instance
+_INTERN_LOCK = threading.Lock()
+
+
+class _InternedTag(Tag):
+    """Base for frozen dataclass tags, which are interned on construction"""
+
+    __slots__ = ()
+
+    def __new__(cls, *args, **kwargs):
+        key = (cls, *args, *kwargs.values())
+        inst = _INTERN.get(key)
+        if inst is None:
+            with _INTERN_LOCK:
+                inst = _INTERN.get(key)
+                if inst is None:
+                    inst = super().__new__(cls)
+                    _INTERN[key] = inst
+        return inst
+
+    def __reduce__(self):
+        # route pickling through __new__ so unpickled tags are interned too
+        return self.__class__, tuple(
+            getattr(self, f.name) for f in fields(self) if f.init
+        )
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+@dataclass(frozen=True, eq=False, slots=True, weakref_slot=True)
+class FromGenerator(_InternedTag):
     generator: type
+    _name: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_name", self.generator.__name__)
 
     def __repr__(self):
-        return f"{self.__class__.__name__}({self.generator.__name__})"
+        return f"{self.__class__.__name__}({self._name})"
 
+    def to_string(self) -> str:
+        return self._name
 
-@dataclass(frozen=True)
-class Negated(Tag):
+
+@dataclass(frozen=True, eq=False, slots=True, weakref_slot=True)
+class Negated(_InternedTag):
     tag: Tag
 
     def __str__(self):
@@ -188,12 +251,16 @@ class Negated(Tag):
     def __neg__(self):
         return self.tag
 
+    def to_string(self) -> str:
+        tag = self
+        raise ValueError(f"Negated tag {tag=} is not allowed here")
+
     def __post_init__(self):
         assert not isinstance(self.tag, Negated), "dont construct double negative tags"
 
 
-@dataclass(frozen=True)
-class Variable(Tag):
+@dataclass(frozen=True, eq=False, slots=True, weakref_slot=True)
+class Variable(_InternedTag):
     name: str
 
     def __post_init__(self):
@@ -206,12 +273,17 @@ class Variable(Tag):
         return self.name
 
 
-@dataclass(frozen=True)
-class SpecificObject(Tag):
+@dataclass(frozen=True, eq=False, slots=True, weakref_slot=True)
+class SpecificObject(_InternedTag):
     name: str
 
 
-def decompose_tags(tags: set[Tag]):
+def _freeze(tags) -> frozenset[Tag]:
+    return tags if isinstance(tags, frozenset) else frozenset(tags)
+
+
+@functools.lru_cache(maxsize=4096)
+def _decompose_frozen(tags: frozenset[Tag]) -> tuple[frozenset[Tag], frozenset[Tag]]:
     positive, negative = set(), set()
 
     for t in tags:
@@ -220,35 +292,113 @@ def decompose_tags(tags: set[Tag]):
         else:
             positive.add(t)
 
-    return positive, negative
+    return frozenset(positive), frozenset(negative)
 
 
-def contradiction(tags: set[Tag]):
-    pos, neg = decompose_tags(tags)
+def decompose_tags(tags: set[Tag]) -> tuple[frozenset[Tag], frozenset[Tag]]:
+    return _decompose_frozen(_freeze(tags))
 
-    if pos.intersection(neg):
-        return True
 
-    if len([t for t in pos if isinstance(t, FromGenerator)]) > 1:
-        return True
-    if len([t for t in tags if isinstance(t, SpecificObject | Variable)]) > 1:
+# One bit per closed-enum tag, so sets of them can be compared as plain ints
+_TAG_BITS: dict[Tag, int] = {
+    tag: 1 << i for i, tag in enumerate((*Semantics, *Subpart))
+}
+
+
+@dataclass(frozen=True)
+class TagMask:
+    """Bitmask form of a set of tags
+
+    Semantics / Subpart members are stored as bits of pos_mask / neg_mask, any other
+    tag (FromGenerator, Variable, SpecificObject, StringTag) is kept in pos_extra / neg_extra
+    """
+
+    pos_mask: int
+    neg_mask: int
+    pos_extra: frozenset[Tag]
+    neg_extra: frozenset[Tag]
+
+    def issuperset(self, other: TagMask) -> bool:
+        return (
+            self.pos_mask & other.pos_mask == other.pos_mask
+            and self.neg_mask & other.neg_mask == other.neg_mask
+            and self.pos_extra >= other.pos_extra
+            and self.neg_extra >= other.neg_extra
+        )
+
+
+@functools.lru_cache(maxsize=4096)
+def _mask_frozen(tags: frozenset[Tag]) -> TagMask:
+    pos, neg = _decompose_frozen(tags)
+
+    def split(group):
+        mask, extra = 0, []
+        for tg in group:
+            bit = _TAG_BITS.get(tg)
+            if bit is None:
+                extra.append(tg)
+            else:
+                mask |= bit
+        return mask, frozenset(extra)
+
+    pos_mask, pos_extra = split(pos)
+    neg_mask, neg_extra = split(neg)
+    return TagMask(pos_mask, neg_mask, pos_extra, neg_extra)
+
+
+def to_mask(tags: set[Tag]) -> TagMask:
+    return _mask_frozen(_freeze(tags))
+
+
+def _mask_contradiction(m: TagMask) -> bool:
+    if m.pos_mask & m.neg_mask or m.pos_extra & m.neg_extra:
         return True
 
+    # FromGenerator / SpecificObject / Variable are never enum tags, so only extras need checking.
+    # More than one of either kind is contradictory, stop as soon as a second one is seen
+    seen_gen = seen_obj = False
+    for t in m.pos_extra:
+        if isinstance(t, FromGenerator):
+            if seen_gen:
+                return True
+            seen_gen = True
+        elif isinstance(t, (SpecificObject, Variable)):
+            if seen_obj:
+                return True
+            seen_obj = True
+
     return False
 
 
+def contradiction(tags: set[Tag]):
+    return _mask_contradiction(to_mask(tags))
+
+
+@functools.lru_cache(maxsize=8192)
+def _implies_frozen(t1: frozenset[Tag], t2: frozenset[Tag]) -> bool:
+    m1, m2 = _mask_frozen(t1), _mask_frozen(t2)
+
+    return not _mask_contradiction(m1) and m1.issuperset(m2)
+
+
 def implies(t1: set[Tag], t2: set[Tag]):
-    p1, n1 = decompose_tags(t1)
-    p2, n2 = decompose_tags(t2)
+    return _implies_frozen(_freeze(t1), _freeze(t2))
 
-    return not contradiction(t1) and p1.issuperset(p2) and n1.issuperset(n2)
 
+@functools.lru_cache(maxsize=8192)
+def _satisfies_frozen(t1: frozenset[Tag], t2: frozenset[Tag]) -> bool:
+    m1, m2 = _mask_frozen(t1), _mask_frozen(t2)
 
-def satisfies(t1: set[Tag], t2: set[Tag]):
-    p1, n1 = decompose_tags(t1)
-    p2, n2 = decompose_tags(t2)
+    return (
+        m1.pos_mask & m2.pos_mask == m2.pos_mask
+        and m1.pos_extra >= m2.pos_extra
+        and not (m1.neg_mask & m2.pos_mask or m1.neg_extra & m2.pos_extra)
+        and not (m2.neg_mask & m1.pos_mask or m2.neg_extra & m1.pos_extra)
+    )
 
-    return p1.issuperset(p2) and not n1.intersection(p2) and not n2.intersection(p1)
+
+def satisfies(t1: set[Tag], t2: set[Tag]):
+    return _satisfies_frozen(_freeze(t1), _freeze(t2))
 
 
 def difference(t1: set[Tag], t2: set[Tag]):
@@ -260,44 +410,90 @@ def difference(t1: set[Tag], t2: set[Tag]):
     p1, n1 = decompose_tags(t1)
     p2, n2 = decompose_tags(t2)
 
-    pos = p1.union(n2 - n1)
-    neg = n1.union(p2 - p1)
+    # pos = p1 | (n2 - n1), neg = n1 | (p2 - p1), built as one set without temporaries
+    return frozenset(
+        (
+            *p1,
+            *(n for n in n2 if n not in n1),
+            *(Negated(n) for n in n1),
+            *(Negated(p) for p in p2 if p not in p1),
+        )
+    )
+
+
+# __members__ rather than iteration, so that enum aliases resolve too
+_NAME_TO_TAG: dict[str, Tag] = {**Semantics.__members__, **Subpart.__members__}
+
+
+def _fac_index(fac_context) -> dict[str, type]:
+    # Keyed by the factories themselves rather than by fac_context, so that a
+    # mutated context (even at the same length) misses, and no context is kept alive
+    return _fac_index_of(tuple(fac_context))
+
 
-    return pos.union(Negated(n) for n in neg)
+@functools.lru_cache(maxsize=8)
+def _fac_index_of(factories: tuple[type, ...]) -> dict[str, type]:
+    index = {}
+    for f in factories:
+        index.setdefault(f.__name__, f)  # keep the first match, as a linear scan would
+    return index
+
+
+def _to_tag_identity(s: Tag, fac_context=None) -> Tag:
+    return s
+
+
+def _to_tag_type(s: type, fac_context=None) -> Tag:
+    if not fac_context:
+        raise ValueError(f"to_tag got {s=} but {fac_context=}")
+    if s not in fac_context:
+        raise ValueError(f"Got {s=} of type=type but it was not in fac_context")
+    return FromGenerator(s)
+
+
+def _to_tag_str(s: str, fac_context=None) -> Tag:
+    # strip all leading "-" at once; an even count cancels out
+    negate = False
+    while s.startswith("-"):
+        s = s[1:]
+        negate = not negate
+
+    tag = _resolve_tag_name(s, fac_context)
+    return Negated(tag) if negate else tag
+
+
+# exact-type fast paths for to_tag, anything else goes through the isinstance checks
+_TO_TAG_DISPATCH = {
+    Semantics: _to_tag_identity,
+    Subpart: _to_tag_identity,
+    str: _to_tag_str,
+    type: _to_tag_type,
+}
 
 
 def to_tag(s: str | Tag | type, fac_context=None) -> Tag:
+    fn = _TO_TAG_DISPATCH.get(type(s))
+    if fn is not None:
+        return fn(s, fac_context)
+
     if isinstance(s, Tag):
         return s
 
-    if type(s) is type:
-        if not fac_context:
-            raise ValueError(f"to_tag got {s=} but {fac_context=}")
-        if s not in fac_context:
-            raise ValueError(f"Got {s=} of type=type but it was not in fac_context")
-        return FromGenerator(s)
-
     assert isinstance(s, str), s
+    return _to_tag_str(s, fac_context)
 
-    if s.startswith("-"):
-        return Negated(to_tag(s[1:]))
 
+def _resolve_tag_name(s: str, fac_context=None) -> Tag:
     if fac_context is not None:
-        fac = next((f for f in fac_context.keys() if f.__name__ == s), None)
-        if fac:
+        fac = _fac_index(fac_context).get(s)
+        if fac is not None:
             return FromGenerator(fac)
 
     s = s.strip("\"'")
 
-    try:
-        return Semantics[s]
-    except KeyError:
-        pass
-
-    try:
-        return Subpart[s]
-    except KeyError:
-        pass
+    tag = _NAME_TO_TAG.get(s)
+    if tag is not None:
+        return tag
 
     raise ValueError(
         f"to_tag got {s=} but could not resolve it. Please see tags.Semantics and tags.Subpart for available tag strings"
@@ -307,65 +503,34 @@ def to_tag(s: str | Tag | type, fac_context=None) -> Tag:
 def to_string(tag: Tag | str):
     if isinstance(tag, str):
         return tag
-
-    if isinstance(tag, Semantics) or isinstance(tag, Subpart):
-        return tag.value
-    elif isinstance(tag, StringTag):
-        return tag.desc
-    elif isinstance(tag, FromGenerator):
-        return tag.__name__
-    elif isinstance(tag, Negated):
-        raise ValueError(f"Negated tag {tag=} is not allowed here")
+    elif isinstance(tag, Tag):
+        return tag.to_string()
     else:
         raise ValueError(f"to_string unhandled {tag=}")
 
 
-def to_tag_set(x, fac_context=None):
+def to_tag_set(x, fac_context=None) -> frozenset[Tag]:
     if x is None:
-        return set()
-    elif isinstance(x, (set, list, tuple, frozenset)):
-        return {to_tag(xi, fac_context=fac_context) for xi in x}
-    else:
-        return {to_tag(x, fac_context=fac_context)}
-
-
-def get_room_types():
-    """Get all room-related Semantics tags.
-
-    Returns:
-        List of room type Semantics tags, sorted by name
-    """
-    room_types = {
-        Semantics.Kitchen,
-        Semantics.Bedroom,
-        Semantics.LivingRoom,
-        Semantics.Closet,
-        Semantics.Hallway,
-        Semantics.Bathroom,
-        Semantics.Garage,
-        Semantics.Balcony,
-        Semantics.DiningRoom,
-        Semantics.Utility,
-        Semantics.StaircaseRoom,
-        Semantics.Warehouse,
-        Semantics.Office,
-        Semantics.MeetingRoom,
-        Semantics.OpenOffice,
-        Semantics.BreakRoom,
-        Semantics.Restroom,
-        Semantics.FactoryOffice,
-    }
-    return sorted(room_types, key=lambda x: x.name)
-
+        return frozenset()
+    elif not isinstance(x, (set, list, tuple, frozenset)):
+        return frozenset((to_tag(x, fac_context=fac_context),))
+
+    # fast path: enum members and plain strings skip the generic to_tag checks
+    result = []
+    append = result.append
+    for xi in x:
+        tp = type(xi)
+        if tp is Semantics or tp is Subpart:
+            append(xi)
+        elif tp is str:
+            append(_to_tag_str(xi, fac_context))
+        else:
+            append(to_tag(xi, fac_context=fac_context))
+    return frozenset(result)
 
-def get_object_types():
-    """Get all object-related Semantics tags (excluding room types, structural types, and solver flags).
 
-    Returns:
-        List of object type Semantics tags, sorted by name
-    """
-    # Room types
-    room_types = {
+ROOM_TYPES = frozenset(
+    {
         Semantics.Kitchen,
         Semantics.Bedroom,
         Semantics.LivingRoom,
@@ -385,9 +550,11 @@ def get_object_types():
         Semantics.Restroom,
         Semantics.FactoryOffice,
     }
+)
 
-    # Structural/system types (not objects)
-    structural_types = {
+# Structural/system types (not objects)
+STRUCTURAL_TYPES = frozenset(
+    {
         Semantics.Root,
         Semantics.New,
         Semantics.RoomNode,
@@ -402,9 +569,11 @@ def get_object_types():
         Semantics.Object,
         Semantics.Cutter,
     }
+)
 
-    # Solver feature flags (not object types)
-    solver_flags = {
+# Solver feature flags (not object types)
+SOLVER_FLAGS = frozenset(
+    {
         Semantics.RealPlaceholder,
         Semantics.OversizePlaceholder,
         Semantics.AssetAsPlaceholder,
@@ -415,9 +584,30 @@ def get_object_types():
         Semantics.NoCollision,
         Semantics.NoChildren,
     }
+)
 
-    all_semantics = set(Semantics)
-    exclude_types = room_types | structural_types | solver_flags
-    object_types = all_semantics - exclude_types
+_ROOM_TYPES_SORTED = tuple(sorted(ROOM_TYPES, key=lambda x: x.name))
+_OBJECT_TYPES_SORTED = tuple(
+    sorted(
+        set(Semantics) - (ROOM_TYPES | STRUCTURAL_TYPES | SOLVER_FLAGS),
+        key=lambda x: x.name,
+    )
+)
+
+
+def get_room_types():
+    """Get all room-related Semantics tags.
+
+    Returns:
+        List of room type Semantics tags, sorted by name
+    """
+    return list(_ROOM_TYPES_SORTED)
+
+
+def get_object_types():
+    """Get all object-related Semantics tags (excluding room types, structural types, and solver flags).
 
-    return sorted(object_types, key=lambda x: x.name)
+    Returns:
+        List of object type Semantics tags, sorted by name
+    """
+    return list(_OBJECT_TYPES_SORTED)
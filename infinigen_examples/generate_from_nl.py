@@ -5,9 +5,9 @@
 """CLI interface for generating indoor scenes from natural language."""
 
 import argparse
+import functools
 import logging
 import os
-import subprocess
 import sys
 from pathlib import Path
 
@@ -21,15 +21,60 @@ logging.basicConfig(
 
 from infinigen import repo_root
 
-# Import only the functions we need, not the whole module to avoid bpy import
-from infinigen.core.init import apply_scene_seed, parse_args_blender
-from infinigen_examples.nlp.generate_from_nl import generate_scene_from_nl
-
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _libstdcpp_preload():
+    """Return the conda env's libstdc++ to LD_PRELOAD for bpy, or None if there is none."""
+    conda_prefix = os.environ.get("CONDA_PREFIX", "")
+    if conda_prefix:
+        libstdcpp = os.path.join(conda_prefix, "lib", "libstdc++.so.6")
+        if os.path.exists(libstdcpp):
+            return libstdcpp
+    return None
+
+
+def _run_generate_indoors_subprocess(indoors_args):
+    """Run generate_indoors.py in a fresh interpreter, exiting if it fails."""
+    import subprocess
+
+    cmd = [
+        sys.executable,
+        "-m",
+        "infinigen_examples.generate_indoors",
+        "--output_folder",
+        str(indoors_args.output_folder),
+        "--seed",
+        indoors_args.seed,
+        "--task",
+        *indoors_args.task,
+        "--configs",
+        *indoors_args.configs,
+    ]
+
+    # Add overrides if provided
+    if indoors_args.overrides:
+        cmd.extend(["--overrides", *indoors_args.overrides])
+
+    # Ensure correct libstdc++ is used for bpy compatibility
+    preload = _libstdcpp_preload()
+    env = {**os.environ, "LD_PRELOAD": preload} if preload else None
+    logger.info(f"Running command: {' '.join(cmd)}")
+    result = subprocess.run(cmd, cwd=repo_root(), env=env, check=False)
+
+    if result.returncode != 0:
+        logger.error(f"Scene generation failed with return code {result.returncode}")
+        sys.exit(result.returncode)
+
+
 def main(args):
     """Main function for CLI interface."""
+    # Deferred so that --help and argument errors return before the heavy imports.
+    # Import only the functions we need, not the whole module to avoid bpy import
+    from infinigen.core.init import apply_scene_seed
+    from infinigen_examples.nlp.generate_from_nl import generate_scene_from_nl
+
     # apply_scene_seed expects string or None; convert int seed to hex string
     seed_arg = hex(args.seed)[2:] if args.seed is not None else None
     scene_seed = apply_scene_seed(seed_arg)
@@ -48,6 +93,8 @@ def main(args):
             ollama_model=args.ollama_model,
             ollama_base_url=args.ollama_base_url,
             base_config=args.base_config,
+            use_cache=not args.no_cache,
+            semantic_cache=args.semantic_cache,
         )
 
         logger.info(f"Generated config file: {config_path}")
@@ -56,46 +103,30 @@ def main(args):
         if args.generate_scene:
             logger.info("Generating scene using generated config...")
 
-            # Extract config filename without extension
-            config_name = config_path.stem
-
-            # Build command to call generate_indoors.py
-            cmd = [
-                sys.executable,
-                "-m",
-                "infinigen_examples.generate_indoors",
-                "--output_folder",
-                str(args.output_folder),
-                "--seed",
-                str(scene_seed) if scene_seed else "0",
-                "--task",
-                *args.task,
-                "--configs",
-                "base_indoors",  # Include base config
-                config_name,  # Our generated config
-            ]
-
-            # Add overrides if provided
-            if args.overrides:
-                cmd.extend(["--overrides", *args.overrides])
-
-            env = os.environ.copy()
-            # Ensure correct libstdc++ is used for bpy compatibility
-            conda_prefix = os.environ.get("CONDA_PREFIX", "")
-            if conda_prefix:
-                libstdcpp = os.path.join(conda_prefix, "lib", "libstdc++.so.6")
-                if os.path.exists(libstdcpp):
-                    env["LD_PRELOAD"] = libstdcpp
-            logger.info(f"Running command: {' '.join(cmd)}")
-            result = subprocess.run(cmd, cwd=repo_root(), env=env, check=False)
-
-            if result.returncode != 0:
-                logger.error(
-                    f"Scene generation failed with return code {result.returncode}"
-                )
-                sys.exit(result.returncode)
+            # Same arguments generate_indoors.py would parse from its command line
+            indoors_args = argparse.Namespace(
+                output_folder=args.output_folder,
+                input_folder=None,
+                seed=str(scene_seed) if scene_seed else "0",
+                task=args.task,
+                configs=[
+                    "base_indoors",  # Include base config
+                    config_path.stem,  # Our generated config
+                ],
+                overrides=args.overrides,
+                task_uniqname=None,
+            )
+
+            if args.subprocess:
+                _run_generate_indoors_subprocess(indoors_args)
             else:
-                logger.info("Scene generation completed successfully")
+                # Runs in this interpreter, which therefore must already be able to load bpy
+                # (e.g. started with the right libstdc++ preloaded); see --subprocess otherwise
+                from infinigen_examples import generate_indoors
+
+                generate_indoors.main(indoors_args)
+
+            logger.info("Scene generation completed successfully")
         else:
             logger.info(
                 "Config file generated. Use --generate-scene to generate the scene."
@@ -139,6 +170,12 @@ if __name__ == "__main__":
         action="store_true",
         help="Also generate the scene after creating config (default: False, only creates config)",
     )
+    parser.add_argument(
+        "--subprocess",
+        action="store_true",
+        help="With --generate-scene, run generate_indoors in a separate Python process "
+        "(with libstdc++ preloaded for bpy) instead of in this one",
+    )
     parser.add_argument(
         "--use-openai",
         action="store_true",
@@ -175,6 +212,17 @@ if __name__ == "__main__":
         default="infinigen_examples/configs_indoor/base_indoors.gin",
         help="Base gin config file to include (default: base_indoors.gin)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query the LLM instead of reusing a cached result for the same input",
+    )
+    parser.add_argument(
+        "--semantic-cache",
+        action="store_true",
+        help="Also reuse cached results of similar (paraphrased) inputs, matched by "
+        "embedding similarity via Ollama's nomic-embed-text model",
+    )
     parser.add_argument(
         "-t",
         "--task",
@@ -207,7 +255,10 @@ if __name__ == "__main__":
         help="Debug logging for specific modules",
     )
 
-    args = parse_args_blender(parser)
+    # Same argv handling as infinigen.core.init.parse_args_blender, inlined so that
+    # parsing does not need to import infinigen.core.init (gin, numpy, ...)
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else None
+    args = parser.parse_args(argv)
 
     logging.getLogger("infinigen").setLevel(logging.INFO)
     logging.getLogger("infinigen.core.nodes.node_wrangler").setLevel(logging.CRITICAL)
@@ -4,9 +4,17 @@
 
 """Gin config file generation from parsed constraints."""
 
+import functools
 import logging
+import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable
+
+try:
+    import ahocorasick
+except ImportError:
+    # optional, build_consgraph_matcher falls back to plain substring checks
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
@@ -139,6 +147,43 @@ ROOM_TO_CONSGRAPH_FILTERS = {
 # Base filters always included for fundamental constraint satisfaction
 BASE_CONSGRAPH_FILTERS = ["node", "furniture", "fullness"]
 
+# Freeze the mapping values so they can be merged with a single set.update, and intern
+# the keyword vocabulary so set operations on it can short-circuit on identity
+TAG_TO_CONSGRAPH_FILTERS = {
+    k: frozenset(map(sys.intern, v)) for k, v in TAG_TO_CONSGRAPH_FILTERS.items()
+}
+ROOM_TO_CONSGRAPH_FILTERS = {
+    k: frozenset(map(sys.intern, v)) for k, v in ROOM_TO_CONSGRAPH_FILTERS.items()
+}
+BASE_CONSGRAPH_FILTERS = [sys.intern(f) for f in BASE_CONSGRAPH_FILTERS]
+_BASE_CONSGRAPH_SET = frozenset(BASE_CONSGRAPH_FILTERS)
+_EMPTY = frozenset()
+
+
+def _collect_consgraph_filters(rooms, primary, secondary) -> list[str]:
+    filters = set(_BASE_CONSGRAPH_SET)
+
+    # Add filters from room types
+    for room in rooms:
+        filters.update(ROOM_TO_CONSGRAPH_FILTERS.get(room, _EMPTY))
+
+    # Add filters from primary objects
+    for obj in primary:
+        filters.update(TAG_TO_CONSGRAPH_FILTERS.get(obj, _EMPTY))
+
+    # Add filters from secondary objects
+    for obj in secondary:
+        filters.update(TAG_TO_CONSGRAPH_FILTERS.get(obj, _EMPTY))
+
+    return sorted(filters)
+
+
+@functools.lru_cache(maxsize=1024)
+def _collect_consgraph_filters_cached(
+    rooms: tuple, primary: tuple, secondary: tuple
+) -> tuple[str, ...]:
+    return tuple(_collect_consgraph_filters(rooms, primary, secondary))
+
 
 def auto_generate_consgraph_filters(parsed_data: Dict[str, Any]) -> list[str]:
     """Auto-generate consgraph_filters from object/room types in parsed_data.
@@ -147,24 +192,57 @@ def auto_generate_consgraph_filters(parsed_data: Dict[str, Any]) -> list[str]:
     restrict_child_primary/secondary to tell the solver which constraints to keep.
     This ensures the solver has the right bounds to place the requested objects.
     """
-    filters = set(BASE_CONSGRAPH_FILTERS)
+    fields = (
+        parsed_data.get("restrict_parent_rooms") or (),
+        parsed_data.get("restrict_child_primary") or (),
+        parsed_data.get("restrict_child_secondary") or (),
+    )
 
-    # Add filters from room types
-    for room in parsed_data.get("restrict_parent_rooms") or []:
-        for f in ROOM_TO_CONSGRAPH_FILTERS.get(room, []):
-            filters.add(f)
+    # The result is a sorted set, so sorted tuples of the inputs are a canonical cache key
+    try:
+        key = tuple(tuple(sorted(f)) for f in fields)
+        hash(key)
+    except TypeError:
+        return _collect_consgraph_filters(*fields)
 
-    # Add filters from primary objects
-    for obj in parsed_data.get("restrict_child_primary") or []:
-        for f in TAG_TO_CONSGRAPH_FILTERS.get(obj, []):
-            filters.add(f)
+    return list(_collect_consgraph_filters_cached(*key))
 
-    # Add filters from secondary objects
-    for obj in parsed_data.get("restrict_child_secondary") or []:
-        for f in TAG_TO_CONSGRAPH_FILTERS.get(obj, []):
-            filters.add(f)
 
-    return sorted(filters)
+@functools.lru_cache(maxsize=256)
+def _build_consgraph_matcher(filters: frozenset[str]) -> Callable[[str], bool]:
+    if "" in filters:
+        # the empty string is a substring of every key
+        return lambda key: True
+
+    if ahocorasick is None or not filters:
+        return lambda key: any(fi in key for fi in filters)
+
+    automaton = ahocorasick.Automaton()
+    for fi in filters:
+        automaton.add_word(fi, fi)
+    automaton.make_automaton()
+
+    def matches(key: str) -> bool:
+        return next(automaton.iter(key), None) is not None
+
+    return matches
+
+
+def build_consgraph_matcher(filters: Iterable[str]) -> Callable[[str], bool]:
+    """Build a predicate telling whether a constraint key is kept by consgraph_filters.
+
+    Equivalent to ``any(fi in key for fi in filters)``, the substring match used by
+    restrict_solving, but uses an Aho-Corasick automaton (if ``pyahocorasick`` is
+    installed) so each key is scanned once regardless of the number of filters.
+    Matchers are cached per distinct filter set.
+
+    Args:
+        filters: consgraph filter keywords
+
+    Returns:
+        Function mapping a constraint / score term key to whether it matches any filter
+    """
+    return _build_consgraph_matcher(frozenset(filters))
 
 
 def format_list_value(value: list) -> str:
@@ -180,8 +258,7 @@ def format_list_value(value: list) -> str:
         return "[]"
 
     # Format as list with quoted strings
-    formatted_items = [f"'{item}'" for item in value]
-    return "[" + ", ".join(formatted_items) + "]"
+    return "['" + "', '".join(map(str, value)) + "']"
 
 
 def format_value(value: Any) -> str:
@@ -193,26 +270,117 @@ def format_value(value: Any) -> str:
     Returns:
         Formatted string for gin config
     """
-    if value is None:
-        return "None"
-    elif isinstance(value, bool):
-        return "True" if value else "False"
+    fn = _FORMATTERS.get(type(value))
+    if fn is not None:
+        return fn(value)
+
+    # Subclasses of the handled types; bool must come before int
+    if isinstance(value, bool):
+        return _format_bool(value)
     elif isinstance(value, (int, float)):
         return str(value)
     elif isinstance(value, str):
-        return f"'{value}'"
+        return _format_str(value)
     elif isinstance(value, list):
         return format_list_value(value)
     elif isinstance(value, dict):
-        # Format dict as Python dict literal
-        items = []
-        for k, v in value.items():
-            items.append(f"'{k}': {format_value(v)}")
-        return "{" + ", ".join(items) + "}"
+        return _format_dict(value)
     else:
         return str(value)
 
 
+def _format_bool(value: bool) -> str:
+    return "True" if value else "False"
+
+
+def _format_str(value: str) -> str:
+    return f"'{value}'"
+
+
+def _format_dict(value: dict) -> str:
+    # Format dict as Python dict literal. Nested dicts are walked with an explicit
+    # stack instead of recursing, and all pieces are joined once at the end
+    out = ["{"]
+    stack = [iter(value.items())]
+    first = True
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            out.append("}")
+            first = False
+            continue
+
+        if not first:
+            out.append(", ")
+        k, v = item
+        out.append(f"'{k}': ")
+        if isinstance(v, dict):
+            out.append("{")
+            stack.append(iter(v.items()))
+            first = True
+        else:
+            out.append(format_value(v))
+            first = False
+
+    return "".join(out)
+
+
+# Exact-type dispatch for format_value
+_FORMATTERS = {
+    type(None): lambda value: "None",
+    bool: _format_bool,
+    int: str,
+    float: str,
+    str: _format_str,
+    list: format_list_value,
+    dict: _format_dict,
+}
+
+
+# Sentinel distinguishing absent keys from keys explicitly set to None
+_MISSING = object()
+
+# (parsed_data key, gin line prefix) emitted by generate_restrict_solving_config, in order.
+# List values are emitted when non-empty, scalars when not None
+_RESTRICT_LIST_KEYS = (
+    ("restrict_parent_rooms", "restrict_solving.restrict_parent_rooms = "),
+    ("restrict_parent_objs", "restrict_solving.restrict_parent_objs = "),
+    ("restrict_child_primary", "restrict_solving.restrict_child_primary = "),
+    ("restrict_child_secondary", "restrict_solving.restrict_child_secondary = "),
+)
+_RESTRICT_SCALAR_KEYS = (
+    ("solve_max_rooms", "restrict_solving.solve_max_rooms = "),
+    ("solve_max_parent_obj", "restrict_solving.solve_max_parent_obj = "),
+)
+
+# (solve_steps key, gin line prefix), emitted when not None
+_SOLVE_STEPS_KEYS = (
+    ("large", "compose_indoors.solve_steps_large = "),
+    ("medium", "compose_indoors.solve_steps_medium = "),
+    ("small", "compose_indoors.solve_steps_small = "),
+)
+
+# (parsed_data key, gin line prefix, skip_none) emitted by generate_compose_indoors_config,
+# in order. skip_none keys are emitted as-is when not None, the others whenever present
+# in parsed_data, formatted with format_value
+_COMPOSE_KEYS = (
+    ("solve_large_enabled", "compose_indoors.solve_large_enabled = ", False),
+    ("solve_medium_enabled", "compose_indoors.solve_medium_enabled = ", False),
+    ("solve_small_enabled", "compose_indoors.solve_small_enabled = ", False),
+    ("terrain_enabled", "compose_indoors.terrain_enabled = ", False),
+    ("topview", "compose_indoors.topview = ", False),
+    ("animate_cameras_enabled", "compose_indoors.animate_cameras_enabled = ", False),
+    ("floating_objs_enabled", "compose_indoors.floating_objs_enabled = ", False),
+    ("num_floating", "compose_indoors.num_floating = ", True),
+    (
+        "restrict_single_supported_roomtype",
+        "compose_indoors.restrict_single_supported_roomtype = ",
+        False,
+    ),
+)
+
+
 def generate_restrict_solving_config(parsed_data: Dict[str, Any]) -> list[str]:
     """Generate restrict_solving config lines.
 
@@ -228,46 +396,34 @@ def generate_restrict_solving_config(parsed_data: Dict[str, Any]) -> list[str]:
         List of gin config lines
     """
     lines = []
+    get = parsed_data.get
 
-    if parsed_data.get("restrict_parent_rooms"):
-        value = format_list_value(parsed_data["restrict_parent_rooms"])
-        lines.append(f"restrict_solving.restrict_parent_rooms = {value}")
-
-    if parsed_data.get("restrict_parent_objs"):
-        value = format_list_value(parsed_data["restrict_parent_objs"])
-        lines.append(f"restrict_solving.restrict_parent_objs = {value}")
+    # Look each key up once; primary/secondary are needed again for consgraph_filters
+    rooms, objs, primary, secondary = [get(key) for key, _ in _RESTRICT_LIST_KEYS]
 
-    if parsed_data.get("restrict_child_primary"):
-        value = format_list_value(parsed_data["restrict_child_primary"])
-        lines.append(f"restrict_solving.restrict_child_primary = {value}")
-
-    if parsed_data.get("restrict_child_secondary"):
-        value = format_list_value(parsed_data["restrict_child_secondary"])
-        lines.append(f"restrict_solving.restrict_child_secondary = {value}")
-
-    if parsed_data.get("solve_max_rooms") is not None:
-        lines.append(
-            f"restrict_solving.solve_max_rooms = {parsed_data['solve_max_rooms']}"
-        )
+    for value, (_, prefix) in zip(
+        (rooms, objs, primary, secondary), _RESTRICT_LIST_KEYS
+    ):
+        if value:
+            lines.append(prefix + format_list_value(value))
 
-    if parsed_data.get("solve_max_parent_obj") is not None:
-        lines.append(
-            f"restrict_solving.solve_max_parent_obj = {parsed_data['solve_max_parent_obj']}"
-        )
+    for key, prefix in _RESTRICT_SCALAR_KEYS:
+        value = get(key)
+        if value is not None:
+            lines.append(prefix + str(value))
 
     # Auto-generate consgraph_filters when specific objects are requested
     # (following HelloRoom.md pattern: restrict_child + consgraph_filters together)
-    consgraph_filters = parsed_data.get("consgraph_filters")
-    if consgraph_filters is None and (
-        parsed_data.get("restrict_child_primary")
-        or parsed_data.get("restrict_child_secondary")
-    ):
+    consgraph_filters = get("consgraph_filters")
+    if consgraph_filters is None and (primary or secondary):
         consgraph_filters = auto_generate_consgraph_filters(parsed_data)
         logger.info(f"Auto-generated consgraph_filters: {consgraph_filters}")
 
     if consgraph_filters:
-        value = format_list_value(consgraph_filters)
-        lines.append(f"restrict_solving.consgraph_filters = {value}")
+        lines.append(
+            "restrict_solving.consgraph_filters = "
+            + format_list_value(consgraph_filters)
+        )
 
     return lines
 
@@ -282,85 +438,82 @@ def generate_compose_indoors_config(parsed_data: Dict[str, Any]) -> list[str]:
         List of gin config lines
     """
     lines = []
+    get = parsed_data.get
 
     # Solve steps
-    solve_steps = parsed_data.get("solve_steps")
+    solve_steps = get("solve_steps")
     if solve_steps:
-        if solve_steps.get("large") is not None:
-            lines.append(f"compose_indoors.solve_steps_large = {solve_steps['large']}")
-        if solve_steps.get("medium") is not None:
-            lines.append(
-                f"compose_indoors.solve_steps_medium = {solve_steps['medium']}"
-            )
-        if solve_steps.get("small") is not None:
-            lines.append(f"compose_indoors.solve_steps_small = {solve_steps['small']}")
-
-    # Stage enable/disable flags
-    if "solve_large_enabled" in parsed_data:
-        lines.append(
-            f"compose_indoors.solve_large_enabled = {format_value(parsed_data['solve_large_enabled'])}"
-        )
-
-    if "solve_medium_enabled" in parsed_data:
-        lines.append(
-            f"compose_indoors.solve_medium_enabled = {format_value(parsed_data['solve_medium_enabled'])}"
-        )
-
-    if "solve_small_enabled" in parsed_data:
-        lines.append(
-            f"compose_indoors.solve_small_enabled = {format_value(parsed_data['solve_small_enabled'])}"
-        )
-
-    # Scene configuration
-    if "terrain_enabled" in parsed_data:
-        lines.append(
-            f"compose_indoors.terrain_enabled = {format_value(parsed_data['terrain_enabled'])}"
-        )
-
-    if "topview" in parsed_data:
-        lines.append(
-            f"compose_indoors.topview = {format_value(parsed_data['topview'])}"
-        )
-
-    if "animate_cameras_enabled" in parsed_data:
-        lines.append(
-            f"compose_indoors.animate_cameras_enabled = {format_value(parsed_data['animate_cameras_enabled'])}"
-        )
-
-    if "floating_objs_enabled" in parsed_data:
-        lines.append(
-            f"compose_indoors.floating_objs_enabled = {format_value(parsed_data['floating_objs_enabled'])}"
-        )
-
-    if parsed_data.get("num_floating") is not None:
-        lines.append(f"compose_indoors.num_floating = {parsed_data['num_floating']}")
-
-    if "restrict_single_supported_roomtype" in parsed_data:
-        lines.append(
-            f"compose_indoors.restrict_single_supported_roomtype = {format_value(parsed_data['restrict_single_supported_roomtype'])}"
-        )
+        for key, prefix in _SOLVE_STEPS_KEYS:
+            value = solve_steps.get(key)
+            if value is not None:
+                lines.append(prefix + str(value))
+
+    # Stage enable/disable flags and scene configuration
+    for key, prefix, skip_none in _COMPOSE_KEYS:
+        value = get(key, _MISSING)
+        if value is _MISSING:
+            continue
+        if not skip_none:
+            lines.append(prefix + format_value(value))
+        elif value is not None:
+            lines.append(prefix + str(value))
 
     return lines
 
 
-def generate_gin_config(
+DEFAULT_BASE_CONFIG = "infinigen_examples/configs_indoor/base_indoors.gin"
+
+# Constant parts of the generated config, each followed by a blank line
+_DEFAULT_INCLUDE_BLOCK = f"include '{DEFAULT_BASE_CONFIG}'\n"
+_SINGLE_ROOM_BLOCK = "\n".join(
+    [
+        "# Single-room configuration",
+        "BlueprintSolidifier.enable_open = False",
+        "",
+        # Hide rooms that don't have furniture to show only the solved room
+        "# Hide non-solved rooms for cleaner output",
+        "compose_indoors.hide_other_rooms_enabled = True",
+        "compose_indoors.invisible_room_ceilings_enabled = True",
+        "",
+    ]
+)
+
+
+# Every parsed_data key read by the generators above; without any of them the config
+# is only the include line
+_CONFIG_KEYS = frozenset(
+    {
+        *(key for key, _ in _RESTRICT_LIST_KEYS),
+        *(key for key, _ in _RESTRICT_SCALAR_KEYS),
+        *(key for key, _, _ in _COMPOSE_KEYS),
+        "consgraph_filters",
+        "solve_steps",
+    }
+)
+
+
+def generate_gin_config_lines(
     parsed_data: Dict[str, Any],
-    base_config: str = "infinigen_examples/configs_indoor/base_indoors.gin",
-) -> str:
-    """Generate gin config file content from parsed data.
+    base_config: str = DEFAULT_BASE_CONFIG,
+) -> list[str]:
+    """Generate gin config file content from parsed data, as newline-terminated lines.
 
     Args:
         parsed_data: Parsed constraint data
         base_config: Base config file to include
 
     Returns:
-        Complete gin config file content as string
+        List of lines which concatenate to the complete gin config file content,
+        suitable for ``save_gin_config`` / ``file.writelines``
     """
-    lines = []
-
     # Include base config
-    lines.append(f"include '{base_config}'")
-    lines.append("")
+    if base_config == DEFAULT_BASE_CONFIG:
+        lines = [_DEFAULT_INCLUDE_BLOCK]
+    else:
+        lines = [f"include '{base_config}'\n"]
+
+    if parsed_data.keys().isdisjoint(_CONFIG_KEYS):
+        return lines
 
     # Generate restrict_solving config
     restrict_lines = generate_restrict_solving_config(parsed_data)
@@ -378,32 +531,104 @@ def generate_gin_config(
 
     # If solve_max_rooms is set, add single-room optimizations
     if parsed_data.get("solve_max_rooms") is not None:
-        lines.append("# Single-room configuration")
-        lines.append("BlueprintSolidifier.enable_open = False")
-        lines.append("")
-        # Hide rooms that don't have furniture to show only the solved room
-        lines.append("# Hide non-solved rooms for cleaner output")
-        lines.append("compose_indoors.hide_other_rooms_enabled = True")
-        lines.append("compose_indoors.invisible_room_ceilings_enabled = True")
-        lines.append("")
+        lines.append(_SINGLE_ROOM_BLOCK)
+
+    # Same content as "\n".join(lines), without materializing the full string
+    return [line + "\n" for line in lines[:-1]] + lines[-1:]
+
+
+def generate_gin_config(
+    parsed_data: Dict[str, Any],
+    base_config: str = DEFAULT_BASE_CONFIG,
+) -> str:
+    """Generate gin config file content from parsed data.
+
+    Args:
+        parsed_data: Parsed constraint data
+        base_config: Base config file to include
+
+    Returns:
+        Complete gin config file content as string
+    """
+    if base_config == DEFAULT_BASE_CONFIG and parsed_data.keys().isdisjoint(
+        _CONFIG_KEYS
+    ):
+        return _DEFAULT_INCLUDE_BLOCK
+
+    return "".join(generate_gin_config_lines(parsed_data, base_config=base_config))
+
+
+# Write buffer for save_gin_config, large enough that a config is a single write
+_WRITE_BUFFERING = 1 << 20
 
-    return "\n".join(lines)
+
+def _write_config_file(config_content: str | Iterable[str], output_path: Path):
+    with open(output_path, "w", buffering=_WRITE_BUFFERING, encoding="utf-8") as f:
+        if isinstance(config_content, str):
+            f.write(config_content)
+        else:
+            f.writelines(config_content)
 
 
 def save_gin_config(
-    config_content: str,
+    config_content: str | Iterable[str],
     output_path: Path,
 ) -> Path:
     """Save gin config content to file.
 
     Args:
-        config_content: Gin config file content
+        config_content: Gin config file content, or its lines as returned by
+            ``generate_gin_config_lines``
         output_path: Path to save config file
 
     Returns:
         Path to saved config file
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(config_content, encoding="utf-8")
+    _write_config_file(config_content, output_path)
     logger.info(f"Saved gin config to {output_path}")
     return output_path
+
+
+class ConfigWriter:
+    """Batched alternative to save_gin_config for writing many configs.
+
+    Configs are queued and written every ``batch`` configs, and on exit when used as
+    a context manager. Each parent directory is only created once per writer.
+
+    Example:
+        with ConfigWriter() as writer:
+            for parsed_data, path in jobs:
+                writer.write(generate_gin_config_lines(parsed_data), path)
+    """
+
+    def __init__(self, batch: int = 64):
+        self.batch = batch
+        self._seen_parents: set[Path] = set()
+        self._pending: list[tuple[str | Iterable[str], Path]] = []
+
+    def write(self, config_content: str | Iterable[str], output_path: Path) -> Path:
+        """Queue a config to be saved, same arguments as save_gin_config."""
+        self._pending.append((config_content, output_path))
+        if len(self._pending) >= self.batch:
+            self.flush()
+        return output_path
+
+    def flush(self):
+        """Write all queued configs."""
+        pending, self._pending = self._pending, []
+        for config_content, output_path in pending:
+            parent = output_path.parent
+            if parent not in self._seen_parents:
+                parent.mkdir(parents=True, exist_ok=True)
+                self._seen_parents.add(parent)
+            _write_config_file(config_content, output_path)
+
+        if pending:
+            logger.info(f"Saved {len(pending)} gin configs")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
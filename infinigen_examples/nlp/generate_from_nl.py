@@ -4,20 +4,92 @@
 
 """Main interface module for generating scenes from natural language."""
 
+import functools
 import hashlib
+import json
 import logging
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from infinigen_examples.nlp import (
     generate_config,
     parse_natural_language,
     post_process,
+    prompts,
     validate_constraints,
 )
 
 logger = logging.getLogger(__name__)
 
+# Generated configs and cached parse results go in these folders (relative to the configs
+# folder), sharded into subfolders by the first two hex characters of the input hash so
+# that no single directory accumulates thousands of files. generate_indoors finds the
+# configs by file stem anywhere below the configs folder, so the nesting is transparent.
+GENERATED_DIRNAME = "nl_generated"
+CACHE_DIRNAME = ".nl_cache"
+
+
+@functools.lru_cache(maxsize=1024)
+def _nl_hash(natural_language: str) -> str:
+    """8 hex character hash of an input, naming its config and cache entry.
+
+    Memoized since the same input is often submitted repeatedly (retries, edits).
+    """
+    return hashlib.blake2b(natural_language.encode("utf-8"), digest_size=4).hexdigest()
+
+
+def _cache_path(cache_dir: Path, input_hash: str) -> Path:
+    return cache_dir / input_hash[:2] / f"{input_hash}.parsed.json"
+
+
+def _config_path(configs_indoor_dir: Path, input_hash: str) -> Path:
+    return (
+        configs_indoor_dir
+        / GENERATED_DIRNAME
+        / input_hash[:2]
+        / f"nl_generated_{input_hash}.gin"
+    )
+
+
+def _load_cached_result(
+    cache_path: Path, expected: Dict[str, str]
+) -> Optional[Dict[str, Any]]:
+    """Load a cached parse result, or None if it is missing or unreadable.
+
+    Entries are keyed only by a short input hash, so an entry is also treated as
+    missing unless its fields match expected (the input text, LLM and prompt
+    version it must have been parsed with).
+    """
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable NL cache entry {cache_path}: {e}")
+        return None
+    if not isinstance(cached, dict) or not isinstance(cached.get("parsed_data"), dict):
+        logger.warning(f"Ignoring malformed NL cache entry {cache_path}")
+        return None
+    if any(cached.get(key) != value for key, value in expected.items()):
+        logger.debug(f"NL cache entry {cache_path} is for another input or LLM")
+        return None
+    return cached
+
+
+def _save_cached_result(cache_path: Path, cached: Dict[str, Any]):
+    """Atomically write a parse result to the cache; failures are only logged."""
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cached, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write NL cache entry {cache_path}: {e}")
+        tmp_path.unlink(missing_ok=True)
+
 
 def generate_scene_from_nl(
     natural_language: str,
@@ -29,6 +101,8 @@ def generate_scene_from_nl(
     ollama_model: str = "gemma3",
     ollama_base_url: str = "http://localhost:11434",
     base_config: str = "infinigen_examples/configs_indoor/base_indoors.gin",
+    use_cache: bool = True,
+    semantic_cache: bool = False,
     **kwargs,
 ) -> Path:
     """Generate indoor scene from natural language description.
@@ -39,6 +113,12 @@ def generate_scene_from_nl(
     3. Generates gin config file
     4. Returns path to generated config file
 
+    Unless use_cache is False, the processed constraints and config text are cached
+    on disk by input hash, so repeating an input skips the LLM call entirely. An
+    entry is only reused for the same input text, LLM (backend and model) and
+    prompt version (see prompts.get_prompt_version). With
+    semantic_cache, paraphrases of earlier inputs also reuse their LLM parse.
+
     Args:
         natural_language: Natural language description of desired scene
         output_folder: Output folder for generated files
@@ -49,6 +129,9 @@ def generate_scene_from_nl(
         ollama_model: Ollama model name (default: "gemma3")
         ollama_base_url: Ollama server base URL (default: "http://localhost:11434")
         base_config: Base gin config file to include
+        use_cache: Whether to reuse / store results in the on-disk cache (default: True)
+        semantic_cache: Whether to reuse LLM parses of similar earlier inputs, matched
+            by embedding similarity via Ollama (default: False)
         **kwargs: Additional arguments passed to scene generation
 
     Returns:
@@ -57,24 +140,178 @@ def generate_scene_from_nl(
     Raises:
         ValueError: If parsing or validation fails
     """
-    logger.info(f"Parsing natural language input: {natural_language}")
+    return generate_scenes_from_nl(
+        [natural_language],
+        output_folder,
+        scene_seed=scene_seed,
+        use_openai=use_openai,
+        api_key=api_key,
+        use_local_llm=use_local_llm,
+        ollama_model=ollama_model,
+        ollama_base_url=ollama_base_url,
+        base_config=base_config,
+        use_cache=use_cache,
+        semantic_cache=semantic_cache,
+        **kwargs,
+    )[0]
 
-    # Step 1: Parse natural language
-    try:
-        parsed_data = parse_natural_language.parse_natural_language(
-            natural_language,
-            use_openai=use_openai,
-            api_key=api_key,
-            use_local_llm=use_local_llm,
-            ollama_model=ollama_model,
-            ollama_base_url=ollama_base_url,
+
+def generate_scenes_from_nl(
+    natural_languages: Sequence[str],
+    output_folder: Path,
+    scene_seed: Optional[int] = None,
+    use_openai: bool = False,
+    api_key: Optional[str] = None,
+    use_local_llm: bool = True,
+    ollama_model: str = "gemma3",
+    ollama_base_url: str = "http://localhost:11434",
+    base_config: str = "infinigen_examples/configs_indoor/base_indoors.gin",
+    use_cache: bool = True,
+    semantic_cache: bool = False,
+    max_concurrency: int = 4,
+    **kwargs,
+) -> List[Path]:
+    """Generate gin configs for several natural language descriptions.
+
+    Same as generate_scene_from_nl for each input, except that the inputs missing
+    from the cache are sent to the LLM together, with up to max_concurrency requests
+    in flight (see parse_natural_language.parse_natural_language_batch).
+
+    Args:
+        natural_languages: Natural language descriptions of desired scenes
+        max_concurrency: Maximum number of concurrent LLM requests (default: 4)
+        Others: See generate_scene_from_nl
+
+    Returns:
+        Path to the generated gin config file of each input, in input order
+
+    Raises:
+        ValueError: If two different inputs have the same hash, and so would
+            share a config file
+    """
+    from infinigen import repo_root
+
+    configs_indoor_dir = repo_root() / "infinigen_examples" / "configs_indoor"
+    cache_dir = configs_indoor_dir / CACHE_DIRNAME
+
+    # Repeated inputs are handled once; a cache entry is only reused if it was
+    # parsed from the same text, by the same LLM and with the same prompt
+    inputs = list(dict.fromkeys(natural_languages))
+    input_hashes = {
+        natural_language: _nl_hash(natural_language) for natural_language in inputs
+    }
+    # Generated configs are named by the hash alone
+    by_hash = {}
+    for natural_language, input_hash in input_hashes.items():
+        other = by_hash.setdefault(input_hash, natural_language)
+        if other != natural_language:
+            raise ValueError(
+                f"Inputs {other!r} and {natural_language!r} have the same hash "
+                f"{input_hash}; generate their configs separately"
+            )
+
+    llm_id = parse_natural_language.get_llm_id(
+        use_openai=use_openai, use_local_llm=use_local_llm, ollama_model=ollama_model
+    )
+    prompt_version = prompts.get_prompt_version()
+
+    def cache_key(natural_language: str) -> Dict[str, str]:
+        return {
+            "natural_language": natural_language,
+            "llm": llm_id,
+            "prompt_version": prompt_version,
+        }
+
+    # natural language -> (parsed_data, config_content or None, cacheable)
+    results = {}
+    for natural_language in inputs:
+        cache_path = _cache_path(cache_dir, input_hashes[natural_language])
+        cached = (
+            _load_cached_result(cache_path, cache_key(natural_language))
+            if use_cache
+            else None
         )
-        logger.info(f"LLM parsed data: {parsed_data}")
-    except Exception as e:
-        logger.error(f"Failed to parse natural language: {e}")
-        logger.info("Using default parsed data")
-        parsed_data = parse_natural_language.get_default_parsed_data()
+        if cached is not None:
+            logger.info(f"Using cached parse result: {cache_path}")
+            # The config text is only reusable if it was generated against the same base config
+            config_content = (
+                cached.get("config_content")
+                if cached.get("base_config") == base_config
+                else None
+            )
+            results[natural_language] = (cached["parsed_data"], config_content, True)
+
+    # Step 1: Parse natural language (uncached inputs only)
+    to_parse = [
+        natural_language
+        for natural_language in inputs
+        if natural_language not in results
+    ]
+    for natural_language in to_parse:
+        logger.info(f"Parsing natural language input: {natural_language}")
+    parsed = parse_natural_language.parse_natural_language_batch(
+        to_parse,
+        max_concurrency=max_concurrency,
+        return_exceptions=True,
+        use_openai=use_openai,
+        api_key=api_key,
+        use_local_llm=use_local_llm,
+        ollama_model=ollama_model,
+        ollama_base_url=ollama_base_url,
+        semantic_cache_dir=(
+            cache_dir / "semantic" if use_cache and semantic_cache else None
+        ),
+    )
+    for natural_language, parsed_data in zip(to_parse, parsed):
+        # Don't cache the defaults we fall back to when the LLM call failed
+        parse_ok = not isinstance(parsed_data, Exception)
+        if parse_ok:
+            logger.info(f"LLM parsed data: {parsed_data}")
+        else:
+            logger.info("Using default parsed data")
+            parsed_data = parse_natural_language.get_default_parsed_data()
+        parsed_data = _post_process_and_validate(parsed_data, natural_language)
+        results[natural_language] = (parsed_data, None, parse_ok)
 
+    config_paths = {}
+    for natural_language in inputs:
+        parsed_data, config_content, cacheable = results[natural_language]
+        input_hash = input_hashes[natural_language]
+        # Step 4: Generate gin config
+        if config_content is None:
+            config_content = generate_config.generate_gin_config(
+                parsed_data,
+                base_config=base_config,
+            )
+            if use_cache and cacheable:
+                _save_cached_result(
+                    _cache_path(cache_dir, input_hash),
+                    {
+                        **cache_key(natural_language),
+                        "parsed_data": parsed_data,
+                        "base_config": base_config,
+                        "config_content": config_content,
+                    },
+                )
+
+        # Step 5: Save config file
+        # Save below configs_indoor folder so generate_indoors.py can find it
+        config_path = _config_path(configs_indoor_dir, input_hash)
+        config_path.parent.mkdir(parents=True, exist_ok=True)
+
+        generate_config.save_gin_config(config_content, config_path)
+
+        logger.info(f"Generated gin config: {config_path}")
+        logger.info(f"Config content:\n{config_content}")
+        config_paths[natural_language] = config_path
+
+    return [config_paths[natural_language] for natural_language in natural_languages]
+
+
+def _post_process_and_validate(
+    parsed_data: Dict[str, Any], natural_language: str
+) -> Dict[str, Any]:
+    """Run steps 2-3 on the LLM output: post-process and validate."""
     # Step 2: Post-process parsed data (pass original text for fallback extraction)
     parsed_data = post_process.post_process_parsed_data(
         parsed_data, input_text=natural_language
@@ -93,27 +330,4 @@ def generate_scene_from_nl(
             "Some constraints are invalid, but continuing with corrected values"
         )
 
-    # Step 4: Generate gin config
-    config_content = generate_config.generate_gin_config(
-        parsed_data,
-        base_config=base_config,
-    )
-
-    # Step 5: Save config file
-    # Save to configs_indoor folder so generate_indoors.py can find it
-    from infinigen import repo_root
-
-    configs_indoor_dir = repo_root() / "infinigen_examples" / "configs_indoor"
-    configs_indoor_dir.mkdir(parents=True, exist_ok=True)
-
-    # Generate unique filename based on input hash
-    input_hash = hashlib.md5(natural_language.encode()).hexdigest()[:8]
-    config_filename = f"nl_generated_{input_hash}.gin"
-    config_path = configs_indoor_dir / config_filename
-
-    generate_config.save_gin_config(config_content, config_path)
-
-    logger.info(f"Generated gin config: {config_path}")
-    logger.info(f"Config content:\n{config_content}")
-
-    return config_path
+    return parsed_data
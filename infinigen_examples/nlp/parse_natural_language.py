@@ -4,25 +4,100 @@
 
 """Natural language parsing module using LLM."""
 
+import copy
+import functools
 import json
 import logging
 import os
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
 
 from infinigen_examples.nlp import prompts
 
+try:
+    import ollama
+except ImportError:
+    # optional, only needed by parse_with_local_llm
+    ollama = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import orjson
+except ImportError:
+    # optional, LLM responses are then decoded with the json module
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Model used by parse_with_openai
+OPENAI_MODEL = "gpt-4o-mini"
+
+# (base_url, model_name) pairs whose server and model were already checked
+_VERIFIED_MODELS: set[tuple[str, str]] = set()
+
+
+# Keep-alive pool for the httpx client inside each Ollama Client, so that the model
+# check, chat and embed requests of a process reuse the same few connections
+_OLLAMA_CLIENT_KWARGS = (
+    {"limits": httpx.Limits(max_connections=4, max_keepalive_connections=4)}
+    if httpx is not None
+    else {}
+)
 
-def parse_with_openai(input_text: str, api_key: Optional[str] = None) -> Dict[str, Any]:
-    """Parse natural language using OpenAI API.
+
+# Seconds to wait for the model list, which also tells whether the server is up
+_MODEL_CHECK_TIMEOUT = 5
+
+
+@functools.lru_cache(maxsize=8)
+def get_ollama_client(base_url: str, timeout: Optional[float] = None):
+    """Return a shared Ollama Client for base_url, or None for the legacy module API.
+
+    The client (and its connection pool) is reused for the lifetime of the process.
 
     Args:
-        input_text: Natural language input text
-        api_key: OpenAI API key (if None, uses OPENAI_API_KEY env var)
+        base_url: Ollama server base URL
+        timeout: Timeout of each request in seconds (None: wait indefinitely)
+    """
+    try:
+        return ollama.Client(host=base_url, timeout=timeout, **_OLLAMA_CLIENT_KWARGS)
+    except (AttributeError, TypeError) as e:
+        # Fallback to old API if Client doesn't exist or doesn't support host parameter
+        logger.warning(f"Using legacy ollama API: {e}")
+        return None
 
-    Returns:
-        Parsed structured data as dictionary
+
+def _list_model_names(api) -> list[str]:
+    """Names of the models installed on the Ollama server (Client or legacy module)."""
+    models_response = api.list()
+    if isinstance(models_response, dict):
+        model_list = models_response.get("models", [])
+    else:
+        model_list = (
+            models_response.models if hasattr(models_response, "models") else []
+        )
+    return [
+        model["name"] if isinstance(model, dict) else model.name for model in model_list
+    ]
+
+
+def _is_connection_error(e: Exception) -> bool:
+    """Whether e means the Ollama server could not be reached."""
+    if isinstance(e, ConnectionError):
+        return True
+    return httpx is not None and isinstance(e, httpx.TransportError)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_openai_client(api_key: str):
+    """Return a shared OpenAI client for api_key.
+
+    openai is imported here rather than at module level: it is slow to import and
+    only needed by parse_with_openai. The import and client setup run once per key.
     """
     try:
         import openai
@@ -30,7 +105,83 @@ def parse_with_openai(input_text: str, api_key: Optional[str] = None) -> Dict[st
         raise ImportError(
             "openai package is required. Install with: pip install openai"
         )
+    return openai.OpenAI(api_key=api_key)
+
+
+def _loads_json(content: str) -> Any:
+    """Decode a JSON response, with orjson if it is installed.
 
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers handle
+    decode errors the same way either way.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _message_content(response) -> str:
+    """Message content of an Ollama chat response (or stream chunk), dict or object."""
+    if isinstance(response, dict):
+        return response["message"]["content"]
+    return (
+        response.message.content
+        if hasattr(response.message, "content")
+        else str(response.message)
+    )
+
+
+def _read_json_stream(chunks) -> str:
+    """Concatenate streamed chat chunks until the top-level JSON object is closed.
+
+    Tracks brace depth (ignoring braces inside JSON strings) and stops reading as
+    soon as the outermost object ends. Closing the stream then stops the server from
+    generating anything after it, such as the trailing whitespace some models
+    keep emitting in JSON mode.
+
+    Returns:
+        Content received so far; the complete object unless the stream ended early
+    """
+    parts = []
+    depth = 0
+    in_string = escaped = False
+    try:
+        for chunk in chunks:
+            piece = _message_content(chunk)
+            for i, c in enumerate(piece):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif c == "\\":
+                        escaped = True
+                    elif c == '"':
+                        in_string = False
+                elif c == '"':
+                    in_string = True
+                elif c == "{":
+                    depth += 1
+                elif c == "}" and depth:
+                    depth -= 1
+                    if depth == 0:
+                        parts.append(piece[: i + 1])
+                        return "".join(parts)
+            parts.append(piece)
+        return "".join(parts)
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def parse_with_openai(input_text: str, api_key: Optional[str] = None) -> Dict[str, Any]:
+    """Parse natural language using OpenAI API.
+
+    Args:
+        input_text: Natural language input text
+        api_key: OpenAI API key (if None, uses OPENAI_API_KEY env var)
+
+    Returns:
+        Parsed structured data as dictionary
+    """
     if api_key is None:
         api_key = os.getenv("OPENAI_API_KEY")
         if api_key is None:
@@ -38,42 +189,25 @@ def parse_with_openai(input_text: str, api_key: Optional[str] = None) -> Dict[st
                 "OpenAI API key not provided. Set OPENAI_API_KEY environment variable or pass api_key parameter."
             )
 
-    client = openai.OpenAI(api_key=api_key)
+    client = _get_openai_client(api_key)
 
-    prompt = prompts.get_prompt(input_text)
-    examples = prompts.get_examples()
-
-    # Build messages with examples
+    # All static content (instructions + few-shot examples) goes in one system message
+    # so that its prefix is identical, and cacheable, across calls
     messages = [
-        {
-            "role": "system",
-            "content": "You are a natural language parser for indoor scene generation. Extract structured information and return valid JSON only.",
-        }
+        {"role": "system", "content": prompts.get_system_prompt()},
+        {"role": "user", "content": prompts.get_user_prompt(input_text)},
     ]
 
-    # Add examples for few-shot learning
-    for example in examples:
-        messages.append({"role": "user", "content": example["input"]})
-        messages.append(
-            {
-                "role": "assistant",
-                "content": json.dumps(example["output"], ensure_ascii=False),
-            }
-        )
-
-    # Add actual input
-    messages.append({"role": "user", "content": prompt})
-
     try:
         response = client.chat.completions.create(
-            model="gpt-4o-mini",  # Use cost-effective model
+            model=OPENAI_MODEL,  # Use cost-effective model
             messages=messages,
             temperature=0.1,  # Low temperature for consistent parsing
             response_format={"type": "json_object"},
         )
 
         content = response.choices[0].message.content
-        parsed = json.loads(content)
+        parsed = _loads_json(content)
         logger.info("Successfully parsed natural language input")
         logger.debug(f"Parsed JSON: {parsed}")
         return parsed
@@ -107,151 +241,72 @@ def parse_with_local_llm(
         ConnectionError: If Ollama server is not reachable
         ValueError: If parsing fails
     """
-    try:
-        import ollama
-    except ImportError:
+    if ollama is None:
         raise ImportError(
             "ollama package is required. Install with: pip install ollama"
         )
 
-    # Check if Ollama server is reachable
-    try:
-        import requests
-
-        response = requests.get(f"{base_url}/api/tags", timeout=5)
-        response.raise_for_status()
-    except (requests.exceptions.RequestException, ImportError) as e:
-        logger.error(f"Failed to connect to Ollama server at {base_url}: {e}")
-        raise ConnectionError(
-            f"Ollama server is not reachable at {base_url}. "
-            "Make sure Ollama is running. You can start it with: ollama serve"
-        ) from e
-
-    # Create Ollama client with base_url
-    try:
-        # Try new API: Client object
-        from ollama import Client
-
-        client = Client(host=base_url)
-        use_client_api = True
-    except (ImportError, AttributeError, TypeError) as e:
-        # Fallback to old API if Client doesn't exist or doesn't support host parameter
-        logger.warning(f"Using legacy ollama API: {e}")
-        use_client_api = False
-        client = None
-
-    # Check if model exists
-    try:
-        if use_client_api:
-            models_response = client.list()
-            if isinstance(models_response, dict):
-                model_list = models_response.get("models", [])
-            else:
-                model_list = (
-                    models_response.models if hasattr(models_response, "models") else []
-                )
-            model_names = [
-                model["name"] if isinstance(model, dict) else model.name
-                for model in model_list
-            ]
-        else:
-            models = ollama.list()
-            if isinstance(models, dict):
-                model_list = models.get("models", [])
-            else:
-                model_list = models.models if hasattr(models, "models") else []
-            model_names = [
-                model["name"] if isinstance(model, dict) else model.name
-                for model in model_list
-            ]
-
-        if model_name not in model_names:
+    client = get_ollama_client(base_url, timeout)
+    # Legacy API: module-level functions (may not support base_url or timeouts)
+    api = client if client is not None else ollama
+
+    # Check that the server is reachable and the model exists, once per process.
+    # A short timeout, so an unreachable server fails fast rather than on the chat
+    if (base_url, model_name) not in _VERIFIED_MODELS:
+        check_timeout = (
+            _MODEL_CHECK_TIMEOUT
+            if timeout is None
+            else min(timeout, _MODEL_CHECK_TIMEOUT)
+        )
+        check_api = (
+            get_ollama_client(base_url, check_timeout) if client is not None else ollama
+        )
+        try:
+            model_names = _list_model_names(check_api)
+        except Exception as e:
+            if _is_connection_error(e):
+                logger.error(f"Failed to connect to Ollama server at {base_url}: {e}")
+                raise ConnectionError(
+                    f"Ollama server is not reachable at {base_url}. "
+                    "Make sure Ollama is running. You can start it with: ollama serve"
+                ) from e
             logger.warning(
-                f"Model '{model_name}' not found in local Ollama models. "
-                f"Available models: {', '.join(model_names) if model_names else 'none'}. "
-                f"Install with: ollama pull {model_name}"
+                f"Could not verify model existence: {e}. Continuing anyway..."
             )
-            # Try to continue anyway - Ollama might auto-download
-    except Exception as e:
-        logger.warning(f"Could not verify model existence: {e}. Continuing anyway...")
-
-    prompt = prompts.get_prompt(input_text)
-    examples = prompts.get_examples()
-
-    # Build system message with examples for few-shot learning
-    system_content = "You are a natural language parser for indoor scene generation. Extract structured information and return valid JSON only.\n\n"
-
-    # Add examples
-    for example in examples:
-        system_content += f"Example input: {example['input']}\n"
-        system_content += (
-            f"Example output: {json.dumps(example['output'], ensure_ascii=False)}\n\n"
-        )
+        else:
+            if model_name not in model_names:
+                logger.warning(
+                    f"Model '{model_name}' not found in local Ollama models. "
+                    f"Available models: {', '.join(model_names) if model_names else 'none'}. "
+                    f"Install with: ollama pull {model_name}"
+                )
+                # Try to continue anyway - Ollama might auto-download
+            _VERIFIED_MODELS.add((base_url, model_name))
 
-    # Build the full prompt with JSON format requirement
-    full_prompt = f"{system_content}{prompt}\n\nReturn only valid JSON, no other text."
+    # Only the user message varies between calls, so Ollama can reuse the KV cache
+    # of the (long) system prompt prefix
+    user_prompt = prompts.get_user_prompt(input_text)
 
     try:
         # Use Ollama chat API
-        if use_client_api:
-            # New API: Use Client object
-            response = client.chat(
-                model=model_name,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a natural language parser for indoor scene generation. Extract structured information and return valid JSON only.",
-                    },
-                    {
-                        "role": "user",
-                        "content": full_prompt,
-                    },
-                ],
-                options={
-                    "temperature": temperature,
-                },
-            )
-        else:
-            # Old API: Direct function call (may not support base_url)
-            response = ollama.chat(
-                model=model_name,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a natural language parser for indoor scene generation. Extract structured information and return valid JSON only.",
-                    },
-                    {
-                        "role": "user",
-                        "content": full_prompt,
-                    },
-                ],
-                options={
-                    "temperature": temperature,
-                },
-            )
-
-        # Extract content from response
-        # Handle both dict and object response formats
-        if isinstance(response, dict):
-            content = response["message"]["content"]
-        else:
-            content = (
-                response.message.content
-                if hasattr(response.message, "content")
-                else str(response.message)
-            )
-
-        # Try to extract JSON from response (may contain markdown code blocks)
-        import re
-
-        json_match = re.search(r"\{.*\}", content, re.DOTALL)
-        if json_match:
-            content = json_match.group(0)
-        else:
-            logger.warning("No JSON found in response, trying to parse entire content")
+        response = api.chat(
+            model=model_name,
+            messages=[
+                {"role": "system", "content": prompts.get_system_prompt()},
+                {"role": "user", "content": user_prompt},
+            ],
+            # Grammar-constrained decoding: the response is always a JSON object
+            format="json",
+            options={
+                "temperature": temperature,
+            },
+            # Streamed so we can stop as soon as the JSON object is complete
+            stream=True,
+        )
+        content = _read_json_stream(response)
 
         # Parse JSON
-        parsed = json.loads(content)
+        parsed = _loads_json(content)
         logger.info(
             f"Successfully parsed natural language input using local LLM ({model_name})"
         )
@@ -286,6 +341,23 @@ def parse_with_local_llm(
         raise
 
 
+def get_llm_id(
+    use_openai: bool = False,
+    use_local_llm: bool = True,
+    ollama_model: str = "gemma3",
+) -> str:
+    """Name the backend and model that parse_natural_language uses for these arguments.
+
+    Stored parse results record it, so that switching models does not reuse them.
+
+    Returns:
+        "<backend>/<model>", e.g. "ollama/gemma3"
+    """
+    if use_local_llm:
+        return f"ollama/{ollama_model}"
+    return f"openai/{OPENAI_MODEL}"
+
+
 def parse_natural_language(
     input_text: str,
     use_openai: bool = False,
@@ -293,11 +365,17 @@ def parse_natural_language(
     use_local_llm: bool = True,
     ollama_model: str = "gemma3",
     ollama_base_url: str = "http://localhost:11434",
+    semantic_cache_dir: Optional[str] = None,
+    semantic_threshold: float = 0.92,
+    semantic_ttl: Optional[float] = None,
 ) -> Dict[str, Any]:
     """Parse natural language input to structured constraints.
 
     This function extracts only information that can be controlled via gin config.
 
+    If semantic_cache_dir is given, inputs whose embedding is close enough to a
+    previously parsed input reuse that result instead of calling the LLM.
+
     Args:
         input_text: Natural language description of desired scene
         use_openai: Whether to use OpenAI API (default: False)
@@ -305,6 +383,9 @@ def parse_natural_language(
         use_local_llm: Whether to use local LLM (default: True)
         ollama_model: Ollama model name (default: "gemma3")
         ollama_base_url: Ollama server base URL (default: "http://localhost:11434")
+        semantic_cache_dir: Directory of the semantic cache (default: None, disabled)
+        semantic_threshold: Minimum cosine similarity for a semantic cache hit
+        semantic_ttl: Maximum age in seconds of reusable cache entries (None: no limit)
 
     Returns:
         Dictionary with parsed constraints:
@@ -316,39 +397,109 @@ def parse_natural_language(
             ...
         }
     """
+    if not (use_local_llm or use_openai):
+        raise ValueError("Either use_openai or use_local_llm must be True")
+
+    cache = embedding = None
+    if semantic_cache_dir is not None:
+        from infinigen_examples.nlp import semantic_cache
+
+        cache = semantic_cache.get_semantic_cache(str(semantic_cache_dir))
+        # Parse results are only reused for the same LLM and prompt
+        parsed_by = (
+            f"{get_llm_id(use_openai, use_local_llm, ollama_model)}"
+            f"@{prompts.get_prompt_version()}"
+        )
+        try:
+            embedding = cache.embed([input_text], base_url=ollama_base_url)[0]
+        except Exception as e:
+            logger.warning(f"Could not embed input for semantic cache: {e}")
+            cache = None
+        else:
+            cached = cache.lookup(
+                embedding,
+                parsed_by,
+                threshold=semantic_threshold,
+                ttl=semantic_ttl,
+            )
+            if cached is not None:
+                return copy.deepcopy(cached)
+
     if use_local_llm:
-        return parse_with_local_llm(
+        parsed = parse_with_local_llm(
             input_text,
             model_name=ollama_model,
             base_url=ollama_base_url,
         )
-    elif use_openai:
-        return parse_with_openai(input_text, api_key)
     else:
-        raise ValueError("Either use_openai or use_local_llm must be True")
+        parsed = parse_with_openai(input_text, api_key)
+
+    if cache is not None:
+        cache.add(input_text, embedding, copy.deepcopy(parsed), parsed_by)
+    return parsed
+
+
+def parse_natural_language_batch(
+    input_texts: Sequence[str],
+    max_concurrency: int = 4,
+    return_exceptions: bool = False,
+    **kwargs,
+) -> List[Any]:
+    """Parse several natural language inputs with overlapping LLM requests.
+
+    Up to max_concurrency inputs are in flight at once. The server may still decode
+    them one after another, but HTTP round-trips and JSON handling overlap, and all
+    requests share the process-wide client and its connection pool.
+
+    Args:
+        input_texts: Natural language inputs
+        max_concurrency: Maximum number of concurrent requests (default: 4)
+        return_exceptions: If True, a failed input yields its exception instead of
+            the default parsed data
+        **kwargs: Arguments passed to parse_natural_language
+
+    Returns:
+        Parsed data (or exception) for each input, in input order
+    """
+
+    def parse_one(input_text: str) -> Any:
+        try:
+            return parse_natural_language(input_text, **kwargs)
+        except Exception as e:
+            logger.error(f"Failed to parse natural language {input_text!r}: {e}")
+            return e if return_exceptions else get_default_parsed_data()
+
+    if len(input_texts) <= 1 or max_concurrency <= 1:
+        return [parse_one(input_text) for input_text in input_texts]
+
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(input_texts))) as pool:
+        return list(pool.map(parse_one, input_texts))
+
+
+_DEFAULT_PARSED_DATA = {
+    "restrict_parent_rooms": None,
+    "restrict_parent_objs": None,
+    "restrict_child_primary": None,
+    "restrict_child_secondary": None,
+    "solve_max_rooms": 1,
+    "solve_max_parent_obj": None,
+    "consgraph_filters": None,
+    "solve_steps": None,
+    "solve_large_enabled": True,
+    "solve_medium_enabled": True,
+    "solve_small_enabled": True,
+    "terrain_enabled": False,
+    "topview": False,
+    "animate_cameras_enabled": False,
+    "floating_objs_enabled": False,
+    "restrict_single_supported_roomtype": False,
+}
 
 
 def get_default_parsed_data() -> Dict[str, Any]:
     """Get default parsed data structure with all fields set to None/defaults.
 
     Returns:
-        Dictionary with default values
+        Dictionary with default values (a fresh copy, safe to modify)
     """
-    return {
-        "restrict_parent_rooms": None,
-        "restrict_parent_objs": None,
-        "restrict_child_primary": None,
-        "restrict_child_secondary": None,
-        "solve_max_rooms": 1,
-        "solve_max_parent_obj": None,
-        "consgraph_filters": None,
-        "solve_steps": None,
-        "solve_large_enabled": True,
-        "solve_medium_enabled": True,
-        "solve_small_enabled": True,
-        "terrain_enabled": False,
-        "topview": False,
-        "animate_cameras_enabled": False,
-        "floating_objs_enabled": False,
-        "restrict_single_supported_roomtype": False,
-    }
+    return dict(_DEFAULT_PARSED_DATA)
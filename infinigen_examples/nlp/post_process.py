@@ -4,24 +4,75 @@
 
 """Post-processing module for parsed LLM output."""
 
+import functools
 import logging
-from typing import Any, Dict, List, Optional
+import re
+from typing import Any, Dict, List, Optional, Tuple
 
-from infinigen_examples.nlp import parse_natural_language
+from infinigen_examples.nlp import parse_natural_language, tag_mapping
+
+try:
+    import ahocorasick
+except ImportError:
+    # optional, fallback_extract_rooms falls back to one substring check per keyword
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+# Parsed data as returned when the LLM call fails; never mutated
+_DEFAULTS = parse_natural_language.get_default_parsed_data()
+
 
 # ──────────────────────────────────────────────
 # Keyword-based fallback extraction helpers
 # ──────────────────────────────────────────────
 
 
+@functools.lru_cache(maxsize=1)
+def _room_keywords() -> Tuple[Tuple[str, str], ...]:
+    """(keyword, room tag name) pairs used by fallback_extract_rooms.
+
+    Sorted by length descending so longer matches ("living room") beat shorter ones
+    ("room"). Keywords that are also object names (e.g. "closet" can mean a piece of
+    furniture OR a room) are skipped to avoid furniture → room confusion.
+    """
+    return tuple(
+        (keyword, tag.name)
+        for keyword, tag in sorted(
+            tag_mapping.ROOM_MAPPINGS.items(), key=lambda x: -len(x[0])
+        )
+        if keyword not in tag_mapping.AMBIGUOUS_KEYWORDS
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _room_keyword_re() -> re.Pattern:
+    """Regex matching any keyword of _room_keywords(), for a fast no-room check."""
+    return re.compile("|".join(re.escape(keyword) for keyword, _ in _room_keywords()))
+
+
+@functools.lru_cache(maxsize=1)
+def _room_keyword_automaton():
+    """Aho-Corasick automaton over _room_keywords(), or None without pyahocorasick.
+
+    Each keyword maps to (rank in _room_keywords(), room tag name).
+    """
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for rank, (keyword, name) in enumerate(_room_keywords()):
+        automaton.add_word(keyword, (rank, name))
+    automaton.make_automaton()
+    return automaton
+
+
 def fallback_extract_rooms(input_text: str) -> Optional[List[str]]:
     """Extract room types from input text using keyword matching.
 
     Used as a fallback when the LLM fails to populate restrict_parent_rooms.
-    Scans the input text for known room keywords from tag_mapping.
+    Scans the input text for known room keywords from tag_mapping, in a single
+    pass if pyahocorasick is installed.
 
     To avoid false positives, keywords that also map to an *object* type
     (e.g. "closet" can mean a piece of furniture OR a room) are skipped.
@@ -32,30 +83,67 @@ def fallback_extract_rooms(input_text: str) -> Optional[List[str]]:
     Returns:
         List of room type Semantics names, or None if nothing found
     """
-    from infinigen_examples.nlp import tag_mapping
-
-    # Build a set of keywords that are ambiguous (exist in BOTH room and object mappings)
-    object_keywords = set(tag_mapping.OBJECT_MAPPINGS.keys())
-
-    rooms: List[str] = []
     input_lower = input_text.lower()
-    # Sort by length descending so longer matches ("living room") beat shorter ones ("room")
-    for keyword, tag in sorted(
-        tag_mapping.ROOM_MAPPINGS.items(), key=lambda x: -len(x[0])
-    ):
-        # Skip keywords that are also object names to avoid furniture → room confusion
-        if keyword in object_keywords:
-            continue
-        if keyword in input_lower and tag.name not in rooms:
-            rooms.append(tag.name)
+
+    automaton = _room_keyword_automaton()
+    if automaton is None:
+        # Most inputs that reach this fallback name no room at all: reject those
+        # with one regex scan instead of one substring check per keyword
+        if _room_keyword_re().search(input_lower) is None:
+            return None
+        matched = [name for keyword, name in _room_keywords() if keyword in input_lower]
+    else:
+        # Order hits by keyword rank, as if the keywords were checked longest first
+        hits = {value for _, value in automaton.iter(input_lower)}
+        matched = [name for _, name in sorted(hits)]
+
+    # Dedupe, keeping the first (longest keyword) occurrence of each room
+    rooms = list(dict.fromkeys(matched))
     return rooms if rooms else None
 
 
+# Explicit "~에만" / "... only" phrases and the stage flags they imply, in priority order:
+# "바닥과 벽에만" must win over "바닥에만" / "벽에만" when several phrases appear.
+_FLOOR_AND_WALL_ONLY = {
+    "solve_large_enabled": True,
+    "solve_medium_enabled": True,
+    "solve_small_enabled": False,
+}
+_FLOOR_ONLY = {
+    "solve_large_enabled": True,
+    "solve_medium_enabled": False,
+    "solve_small_enabled": False,
+}
+_WALL_ONLY = {
+    "solve_large_enabled": False,
+    "solve_medium_enabled": True,
+    "solve_small_enabled": False,
+}
+_ON_TOP_ONLY = {
+    "solve_large_enabled": True,
+    "solve_medium_enabled": False,
+    "solve_small_enabled": True,
+}
+_STAGE_PHRASES = {
+    "바닥과 벽에만": _FLOOR_AND_WALL_ONLY,
+    "floor and wall only": _FLOOR_AND_WALL_ONLY,
+    "바닥에만": _FLOOR_ONLY,
+    "floor only": _FLOOR_ONLY,
+    "벽에만": _WALL_ONLY,
+    "wall only": _WALL_ONLY,
+    "위에만": _ON_TOP_ONLY,
+    "on top only": _ON_TOP_ONLY,
+}
+_STAGE_PRIORITY = {phrase: i for i, phrase in enumerate(_STAGE_PHRASES)}
+_STAGE_RE = re.compile("|".join(map(re.escape, _STAGE_PHRASES)))
+
+
 def fallback_extract_stage_flags(input_text: str) -> Optional[Dict[str, bool]]:
     """Extract stage flags from input text using keyword matching.
 
     Used as a fallback when the LLM sets stage_exclusive / stage_types
-    incorrectly.  Directly checks the raw text for "~에만" patterns.
+    incorrectly.  Directly checks the raw text for "~에만" patterns, scanning
+    it once for all of them.
 
     Args:
         input_text: Original natural language input
@@ -65,120 +153,67 @@ def fallback_extract_stage_flags(input_text: str) -> Optional[Dict[str, bool]]:
     """
     text = input_text.lower()
 
-    # "바닥과 벽에만" must be checked *before* "바닥에만"
-    if "바닥과 벽에만" in text or "floor and wall only" in text:
-        return {
-            "solve_large_enabled": True,
-            "solve_medium_enabled": True,
-            "solve_small_enabled": False,
-        }
-    if "바닥에만" in text or "floor only" in text:
-        return {
-            "solve_large_enabled": True,
-            "solve_medium_enabled": False,
-            "solve_small_enabled": False,
-        }
-    if "벽에만" in text or "wall only" in text:
-        return {
-            "solve_large_enabled": False,
-            "solve_medium_enabled": True,
-            "solve_small_enabled": False,
-        }
-    if "위에만" in text or "on top only" in text:
-        return {
-            "solve_large_enabled": True,
-            "solve_medium_enabled": False,
-            "solve_small_enabled": True,
-        }
-    return None
+    phrases = _STAGE_RE.findall(text)
+    if not phrases:
+        return None
+    return dict(_STAGE_PHRASES[min(phrases, key=_STAGE_PRIORITY.__getitem__)])
 
 
 def fill_defaults(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Fill missing fields with default values.
+    """Fill missing fields with default values, in place.
+
+    parsed_data itself is modified and returned; callers that still need the
+    original must pass a copy.
 
     Args:
         parsed_data: Parsed data from LLM (may have missing fields)
 
     Returns:
-        Parsed data with all fields filled
+        parsed_data, with all fields filled
 
         None values from LLM are replaced with defaults for fields that have defaults.
         This ensures that fields with default values (like solve_max_rooms=1) are preserved
         even if LLM returns None, while explicitly None fields remain None.
     """
-    defaults = parse_natural_language.get_default_parsed_data()
-
-    # Start with defaults
-    result = defaults.copy()
+    # Only update fields the LLM left missing / None
+    for key, default in _DEFAULTS.items():
+        if parsed_data.get(key) is None:
+            parsed_data[key] = default
 
-    # Merge parsed data with defaults, but only update non-None values
-    # This preserves defaults for fields where LLM returned None
-    for key, value in parsed_data.items():
-        if value is not None:
-            result[key] = value
-        # If value is None and key exists in defaults, keep the default value
-        # (This is already the case since we start with defaults.copy())
+    # Drop None values of fields without a default
+    for key in [k for k, v in parsed_data.items() if v is None and k not in _DEFAULTS]:
+        del parsed_data[key]
 
     # Clamp solve_max_rooms to at least 1 (validation will also enforce this)
-    if result.get("solve_max_rooms") is not None and result["solve_max_rooms"] < 1:
-        result["solve_max_rooms"] = 1
-
-    return result
-
-
-def normalize_room_names(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Normalize room names to Semantics tag names.
-
-    Args:
-        parsed_data: Parsed data with potentially non-normalized room names
-
-    Returns:
-        Parsed data with normalized room names
-    """
-    from infinigen_examples.nlp import tag_mapping
-
-    if parsed_data.get("restrict_parent_rooms"):
-        normalized_rooms = []
-        for room in parsed_data["restrict_parent_rooms"]:
-            mapped = tag_mapping.map_room_name_to_tag(room)
-            if mapped:
-                normalized_rooms.append(mapped.name)
-            else:
-                # If mapping fails, try using the name as-is (might already be normalized)
-                normalized_rooms.append(room)
-        parsed_data["restrict_parent_rooms"] = normalized_rooms
+    if (
+        parsed_data.get("solve_max_rooms") is not None
+        and parsed_data["solve_max_rooms"] < 1
+    ):
+        parsed_data["solve_max_rooms"] = 1
 
     return parsed_data
 
 
-def normalize_object_names(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Normalize object names to Semantics tag names.
+_STAGE_FLAG_KEYS = (
+    "solve_large_enabled",
+    "solve_medium_enabled",
+    "solve_small_enabled",
+)
 
-    Args:
-        parsed_data: Parsed data with potentially non-normalized object names
 
-    Returns:
-        Parsed data with normalized object names
-    """
-    from infinigen_examples.nlp import tag_mapping
-
-    for key in [
-        "restrict_parent_objs",
-        "restrict_child_primary",
-        "restrict_child_secondary",
-    ]:
-        if parsed_data.get(key):
-            normalized_objs = []
-            for obj in parsed_data[key]:
-                mapped = tag_mapping.map_object_name_to_tag(obj)
-                if mapped:
-                    normalized_objs.append(mapped.name)
-                else:
-                    # If mapping fails, try using the name as-is (might already be normalized)
-                    normalized_objs.append(obj)
-            parsed_data[key] = normalized_objs
+@functools.lru_cache(maxsize=64)
+def _stage_flags_cached(
+    stage_items: frozenset, exclusive: bool
+) -> Tuple[bool, bool, bool]:
+    """stage_types_to_stage_flags for stage_types given as a frozenset of items.
 
-    return parsed_data
+    Real prompts produce only a handful of distinct stage_types patterns.
+    Returns the flags as a tuple in _STAGE_FLAG_KEYS order.
+    """
+    stage_flags = tag_mapping.stage_types_to_stage_flags(
+        dict(stage_items), exclusive=exclusive
+    )
+    return tuple(stage_flags[key] for key in _STAGE_FLAG_KEYS)
 
 
 def process_stage_types(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -198,16 +233,27 @@ def process_stage_types(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Parsed data with stage flags properly set
     """
-    from infinigen_examples.nlp import tag_mapping
-
     stage_types = parsed_data.get("stage_types")
     stage_exclusive = parsed_data.get("stage_exclusive", False)
 
     if stage_types and isinstance(stage_types, dict):
-        # Convert detailed stage types to high-level flags
-        stage_flags = tag_mapping.stage_types_to_stage_flags(
-            stage_types, exclusive=stage_exclusive
-        )
+        # Convert detailed stage types to high-level flags.
+        # Only all-bool stage_types are cached: the mapping only honours values
+        # that are True itself, while 1 == True would share a cache entry, and
+        # unhashable values (e.g. lists) from the LLM could not be keyed at all
+        if all(type(value) is bool for value in stage_types.values()):
+            stage_flags = dict(
+                zip(
+                    _STAGE_FLAG_KEYS,
+                    _stage_flags_cached(
+                        frozenset(stage_types.items()), bool(stage_exclusive)
+                    ),
+                )
+            )
+        else:
+            stage_flags = tag_mapping.stage_types_to_stage_flags(
+                stage_types, exclusive=stage_exclusive
+            )
 
         logger.info(
             f"stage_types={stage_types}, stage_exclusive={stage_exclusive} "
@@ -241,6 +287,108 @@ def process_stage_types(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
     return parsed_data
 
 
+_BOOL_FIELDS = (
+    "solve_large_enabled",
+    "solve_medium_enabled",
+    "solve_small_enabled",
+    "terrain_enabled",
+    "topview",
+    "animate_cameras_enabled",
+    "floating_objs_enabled",
+    "restrict_single_supported_roomtype",
+)
+_INT_FIELDS = ("solve_max_rooms", "solve_max_parent_obj")
+_OBJECT_KEYS = (
+    "restrict_parent_objs",
+    "restrict_child_primary",
+    "restrict_child_secondary",
+)
+_SOLVE_STEPS_KEYS = ("large", "medium", "small")
+_TRUE_STRINGS = frozenset(("true", "1", "yes", "on"))
+
+
+def _to_int(value: Any, name: str) -> Optional[int]:
+    """Convert value to int, or warn and return None if it cannot be converted."""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        logger.warning(f"Could not convert {name} to int: {value}")
+        return None
+
+
+# Per-field fixers, called as fixer(value, field) for non-None values and returning
+# the corrected value. Values already of the right type (the common case) are
+# returned as-is without any conversion.
+
+
+def _fix_bool(value: Any, field: str) -> bool:
+    if type(value) is bool:
+        return value
+    if isinstance(value, str):
+        # Convert string booleans
+        return value.lower() in _TRUE_STRINGS
+    # Convert other types to bool
+    return bool(value)
+
+
+def _fix_int(value: Any, field: str) -> Optional[int]:
+    return value if type(value) is int else _to_int(value, field)
+
+
+def _fix_solve_steps(value: Any, field: str) -> Any:
+    # Ensure solve_steps is a dict with integer values
+    if not value:
+        return value
+    if not isinstance(value, dict):
+        return None
+    normalized_steps = {}
+    for key in _SOLVE_STEPS_KEYS:
+        step = value.get(key)
+        if step is not None:
+            if type(step) is not int:
+                step = _to_int(step, f"{field}.{key}")
+            if step is not None:
+                normalized_steps[key] = step
+    return normalized_steps if normalized_steps else None
+
+
+def _fix_room_names(value: Any, field: str) -> Any:
+    # If mapping fails, keep the name as-is (might already be normalized)
+    if not value:
+        return value
+    tag_names = tag_mapping.ROOM_TAG_NAMES
+    return [tag_names.get(room.lower().strip(), room) for room in value]
+
+
+def _fix_object_names(value: Any, field: str) -> Any:
+    # If mapping fails, keep the name as-is (might already be normalized)
+    if not value:
+        return value
+    tag_names = tag_mapping.OBJECT_TAG_NAMES
+    return [tag_names.get(obj.lower().strip(), obj) for obj in value]
+
+
+_TYPE_FIXERS = (
+    *((field, _fix_bool) for field in _BOOL_FIELDS),
+    *((field, _fix_int) for field in _INT_FIELDS),
+    ("solve_steps", _fix_solve_steps),
+)
+_NAME_FIXERS = (
+    ("restrict_parent_rooms", _fix_room_names),
+    *((key, _fix_object_names) for key in _OBJECT_KEYS),
+)
+_ALL_FIXERS = _TYPE_FIXERS + _NAME_FIXERS
+
+
+def _apply_fixers(parsed_data: Dict[str, Any], fixers) -> Dict[str, Any]:
+    """Apply (field, fixer) pairs to the non-None fields of parsed_data, in place."""
+    for field, fixer in fixers:
+        value = parsed_data.get(field)
+        if value is not None:
+            parsed_data[field] = fixer(value, field)
+    return parsed_data
+
+
 def fix_common_errors(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
     """Fix common errors in LLM output.
 
@@ -250,58 +398,44 @@ def fix_common_errors(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Corrected parsed data
     """
-    # Ensure boolean fields are actually booleans
-    bool_fields = [
-        "solve_large_enabled",
-        "solve_medium_enabled",
-        "solve_small_enabled",
-        "terrain_enabled",
-        "topview",
-        "animate_cameras_enabled",
-        "floating_objs_enabled",
-        "restrict_single_supported_roomtype",
-    ]
-
-    for field in bool_fields:
-        value = parsed_data.get(field)
-        if value is not None:
-            if isinstance(value, str):
-                # Convert string booleans
-                parsed_data[field] = value.lower() in ("true", "1", "yes", "on")
-            elif not isinstance(value, bool):
-                # Convert other types to bool
-                parsed_data[field] = bool(value)
-
-    # Ensure integer fields are actually integers
-    int_fields = ["solve_max_rooms", "solve_max_parent_obj"]
-    for field in int_fields:
-        value = parsed_data.get(field)
-        if value is not None:
-            try:
-                parsed_data[field] = int(value)
-            except (ValueError, TypeError):
-                logger.warning(f"Could not convert {field} to int: {value}")
-                parsed_data[field] = None
+    return _apply_fixers(parsed_data, _TYPE_FIXERS)
 
-    # Ensure solve_steps is a dict with integer values
-    if parsed_data.get("solve_steps"):
-        steps = parsed_data["solve_steps"]
-        if isinstance(steps, dict):
-            normalized_steps = {}
-            for key in ["large", "medium", "small"]:
-                value = steps.get(key)
-                if value is not None:
-                    try:
-                        normalized_steps[key] = int(value)
-                    except (ValueError, TypeError):
-                        logger.warning(
-                            f"Could not convert solve_steps.{key} to int: {value}"
-                        )
-            parsed_data["solve_steps"] = normalized_steps if normalized_steps else None
-        else:
-            parsed_data["solve_steps"] = None
 
-    return parsed_data
+def normalize_room_names(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize room names to Semantics tag names.
+
+    Args:
+        parsed_data: Parsed data with potentially non-normalized room names
+
+    Returns:
+        Parsed data with normalized room names
+    """
+    return _apply_fixers(parsed_data, _NAME_FIXERS[:1])
+
+
+def normalize_object_names(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize object names to Semantics tag names.
+
+    Args:
+        parsed_data: Parsed data with potentially non-normalized object names
+
+    Returns:
+        Parsed data with normalized object names
+    """
+    return _apply_fixers(parsed_data, _NAME_FIXERS[1:])
+
+
+def _finalize(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill defaults, apply stage_types, then fix types and normalize names, in place.
+
+    Equivalent to fill_defaults, process_stage_types, fix_common_errors,
+    normalize_room_names and normalize_object_names in that order, with the last
+    three fused into a single walk over the fields.
+    """
+    fill_defaults(parsed_data)
+    # Reads the flags as the LLM returned them, so it has to run before type fixing
+    process_stage_types(parsed_data)
+    return _apply_fixers(parsed_data, _ALL_FIXERS)
 
 
 def post_process_parsed_data(
@@ -310,6 +444,10 @@ def post_process_parsed_data(
 ) -> Dict[str, Any]:
     """Apply all post-processing steps to parsed data.
 
+    parsed_data is modified in place (and is usually the returned dict), so
+    callers that still need the raw LLM output must pass a copy, e.g.
+    ``post_process_parsed_data(parsed_data.copy(), ...)``.
+
     Args:
         parsed_data: Raw parsed data from LLM
         input_text: Original natural language input (used for fallback extraction)
@@ -317,20 +455,18 @@ def post_process_parsed_data(
     Returns:
         Post-processed parsed data ready for config generation
     """
-    # Fill defaults
-    processed = fill_defaults(parsed_data)
-
-    # Process stage_types if present (convert to solve_*_enabled flags)
-    processed = process_stage_types(processed)
+    # Common failure path: upstream fell back to the defaults, which are already
+    # complete and normalized, so only the input-text fallbacks can change anything
+    if parsed_data == _DEFAULTS:
+        return _apply_fallbacks(dict(_DEFAULTS), input_text)
 
-    # Fix common errors
-    processed = fix_common_errors(processed)
+    return _apply_fallbacks(_finalize(parsed_data), input_text)
 
-    # Normalize names
-    processed = normalize_room_names(processed)
-    processed = normalize_object_names(processed)
 
-    # ── Keyword-based fallback when LLM missed rooms / stage flags ──
+def _apply_fallbacks(
+    processed: Dict[str, Any], input_text: Optional[str]
+) -> Dict[str, Any]:
+    """Keyword-based fallback when LLM missed rooms / stage flags."""
     if input_text:
         # Fallback 1: If LLM returned no rooms, try keyword extraction
         if not processed.get("restrict_parent_rooms"):
@@ -6,7 +6,57 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
+import operator
+import sys
+from collections import ChainMap
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Optional
+
 from infinigen.core import tags as t
+from infinigen_examples.nlp import tag_mapping, validate_constraints
+
+try:
+    import orjson
+except ImportError:
+    # optional, examples are then serialized with the json module
+    orjson = None
+
+_get_name = operator.attrgetter("name")
+
+# Tag registries are fixed for the lifetime of the process
+_ROOM_TYPE_NAMES = tuple(map(sys.intern, map(_get_name, t.get_room_types())))
+_OBJECT_TYPE_NAMES = tuple(map(sys.intern, map(_get_name, t.get_object_types())))
+_ROOM_TYPES_STR = ", ".join(_ROOM_TYPE_NAMES)
+_OBJECT_TYPES_STR = ", ".join(_OBJECT_TYPE_NAMES)
+
+# Object types grouped by the field they usually go in, following the
+# classification validate_constraints applies to the LLM output, so the prompt
+# lists each candidate where it belongs instead of one flat catalog
+_PARENT_OBJS = tuple(
+    name for name in _OBJECT_TYPE_NAMES if name in validate_constraints.PARENT_OBJECTS
+)
+_CHILD_PRIMARY = tuple(
+    name for name in _OBJECT_TYPE_NAMES if name in validate_constraints.PRIMARY_OBJECTS
+)
+_CHILD_SECONDARY = tuple(
+    name
+    for name in _OBJECT_TYPE_NAMES
+    if name in validate_constraints.SECONDARY_OBJECTS
+    or name in validate_constraints.SECONDARY_TO_PARENT
+)
+# Remaining placeable types. Access* tags describe how an object is used, not
+# what it is, and are never useful restrictions.
+_OTHER_OBJS = tuple(
+    name
+    for name in _OBJECT_TYPE_NAMES
+    if name not in _PARENT_OBJS + _CHILD_PRIMARY + _CHILD_SECONDARY
+    and not name.startswith("Access")
+)
 
 
 def get_room_types_for_prompt() -> str:
@@ -15,8 +65,7 @@ def get_room_types_for_prompt() -> str:
     Returns:
         Comma-separated string of room type names
     """
-    room_types = t.get_room_types()
-    return ", ".join(rt.name for rt in room_types)
+    return _ROOM_TYPES_STR
 
 
 def get_object_types_for_prompt() -> str:
@@ -25,9 +74,13 @@ def get_object_types_for_prompt() -> str:
     Returns:
         Comma-separated string of object type names
     """
-    object_types = t.get_object_types()
-    return ", ".join(ot.name for ot in object_types)
+    return _OBJECT_TYPES_STR
+
 
+SYSTEM_MESSAGE = (
+    "You are a natural language parser for indoor scene generation. "
+    "Extract structured information and return valid JSON only."
+)
 
 PROMPT_TEMPLATE = """You are a natural language parser for indoor scene generation. 
 Your task is to extract structured information from natural language descriptions 
@@ -41,12 +94,11 @@ Do not extract information that cannot be controlled.
 
 Available room types: {room_types}.
 
-Available object types: {object_types}.
-
-IMPORTANT - Object Classification Rules:
-- restrict_parent_objs: Objects that can have other objects placed ON them (e.g., KitchenCounter, Storage, Table, Desk)
-- restrict_child_primary: Objects placed directly IN rooms (on floor, against wall) (e.g., Bed, Storage, Table, Desk, KitchenCounter, Seating, KitchenAppliance)
-- restrict_child_secondary: Objects that can be placed ON TOP OF other objects (e.g., Sink on KitchenCounter, Dishware on Table, Watchable on Storage)
+IMPORTANT - Object Classification Rules (available object types per field):
+- restrict_parent_objs: Objects that can have other objects placed ON them: {parent_objs}
+- restrict_child_primary: Objects placed directly IN rooms (on floor, against wall): {child_primary}
+- restrict_child_secondary: Objects that can be placed ON TOP OF other objects (e.g., Sink on KitchenCounter, Dishware on Table, Watchable on Storage): {child_secondary}
+- Other object types: {other_objs}
 
 
 Location relationships cannot be directly controlled, but can be indirectly controlled 
@@ -155,340 +207,468 @@ Input: {input_text}
 Return ONLY the JSON object, nothing else:"""
 
 
+# Fields every example output leaves at False, shared instead of repeated
+_COMMON_OUTPUT_FIELDS = MappingProxyType(
+    {
+        "terrain_enabled": False,
+        "topview": False,
+        "animate_cameras_enabled": False,
+        "floating_objs_enabled": False,
+        "restrict_single_supported_roomtype": False,
+    }
+)
+
 EXAMPLE_INPUTS_OUTPUTS = [
     # Example 1: Simple placement — no stage restriction
     {
         "input": "침실에 침대와 옷장을 배치한 씬을 1개 생성해줘.",
-        "output": {
-            "restrict_parent_rooms": ["Bedroom"],
-            "restrict_parent_objs": None,
-            "restrict_child_primary": ["Bed", "Storage"],
-            "restrict_child_secondary": None,
-            "solve_max_rooms": 1,
-            "solve_max_parent_obj": None,
-            "consgraph_filters": None,
-            "solve_steps": None,
-            "solve_large_enabled": True,
-            "solve_medium_enabled": True,
-            "solve_small_enabled": True,
-            "stage_types": None,
-            "stage_exclusive": False,
-            "terrain_enabled": False,
-            "topview": False,
-            "animate_cameras_enabled": False,
-            "floating_objs_enabled": False,
-            "restrict_single_supported_roomtype": False,
-        },
+        "output": ChainMap(
+            {
+                "restrict_parent_rooms": ["Bedroom"],
+                "restrict_parent_objs": None,
+                "restrict_child_primary": ["Bed", "Storage"],
+                "restrict_child_secondary": None,
+                "solve_max_rooms": 1,
+                "solve_max_parent_obj": None,
+                "consgraph_filters": None,
+                "solve_steps": None,
+                "solve_large_enabled": True,
+                "solve_medium_enabled": True,
+                "solve_small_enabled": True,
+                "stage_types": None,
+                "stage_exclusive": False,
+            },
+            _COMMON_OUTPUT_FIELDS,
+        ),
     },
     # Example 2: "바닥에만" = "only" → stage_exclusive=True, restricts to large stage
     {
         "input": "주방에 조리대와 싱크대만 배치하고, 바닥에만 배치해줘.",
-        "output": {
-            "restrict_parent_rooms": ["Kitchen"],
-            "restrict_parent_objs": ["KitchenCounter"],
-            "restrict_child_primary": ["KitchenCounter"],
-            "restrict_child_secondary": ["Sink"],
-            "solve_max_rooms": None,
-            "solve_max_parent_obj": None,
-            "consgraph_filters": None,
-            "solve_steps": None,
-            "solve_large_enabled": True,
-            "solve_medium_enabled": False,
-            "solve_small_enabled": False,
-            "stage_types": {
-                "on_floor_and_wall": True,
-                "on_floor_freestanding": True,
+        "output": ChainMap(
+            {
+                "restrict_parent_rooms": ["Kitchen"],
+                "restrict_parent_objs": ["KitchenCounter"],
+                "restrict_child_primary": ["KitchenCounter"],
+                "restrict_child_secondary": ["Sink"],
+                "solve_max_rooms": None,
+                "solve_max_parent_obj": None,
+                "consgraph_filters": None,
+                "solve_steps": None,
+                "solve_large_enabled": True,
+                "solve_medium_enabled": False,
+                "solve_small_enabled": False,
+                "stage_types": {
+                    "on_floor_and_wall": True,
+                    "on_floor_freestanding": True,
+                },
+                "stage_exclusive": True,
             },
-            "stage_exclusive": True,
-            "terrain_enabled": False,
-            "topview": False,
-            "animate_cameras_enabled": False,
-            "floating_objs_enabled": False,
-            "restrict_single_supported_roomtype": False,
-        },
+            _COMMON_OUTPUT_FIELDS,
+        ),
     },
     # Example 3: Simple description — no stage restriction
     {
         "input": "Create a scene with a dining table and chairs in the dining room. Maximum 2 rooms.",
-        "output": {
-            "restrict_parent_rooms": ["DiningRoom"],
-            "restrict_parent_objs": None,
-            "restrict_child_primary": ["Table", "Seating"],
-            "restrict_child_secondary": None,
-            "solve_max_rooms": 2,
-            "solve_max_parent_obj": None,
-            "consgraph_filters": None,
-            "solve_steps": None,
-            "solve_large_enabled": True,
-            "solve_medium_enabled": True,
-            "solve_small_enabled": True,
-            "stage_types": None,
-            "stage_exclusive": False,
-            "terrain_enabled": False,
-            "topview": False,
-            "animate_cameras_enabled": False,
-            "floating_objs_enabled": False,
-            "restrict_single_supported_roomtype": False,
-        },
+        "output": ChainMap(
+            {
+                "restrict_parent_rooms": ["DiningRoom"],
+                "restrict_parent_objs": None,
+                "restrict_child_primary": ["Table", "Seating"],
+                "restrict_child_secondary": None,
+                "solve_max_rooms": 2,
+                "solve_max_parent_obj": None,
+                "consgraph_filters": None,
+                "solve_steps": None,
+                "solve_large_enabled": True,
+                "solve_medium_enabled": True,
+                "solve_small_enabled": True,
+                "stage_types": None,
+                "stage_exclusive": False,
+            },
+            _COMMON_OUTPUT_FIELDS,
+        ),
     },
     # Example 4: "위에" = describes placement (NOT "only") → stage_exclusive=False, all stages True
     {
         "input": "1개 주방에 조리대를 배치하고 조리대 위에 음식을 배치해줘.",
-        "output": {
-            "restrict_parent_rooms": ["Kitchen"],
-            "restrict_parent_objs": ["KitchenCounter"],
-            "restrict_child_primary": ["KitchenCounter"],
-            "restrict_child_secondary": ["FoodPantryItem"],
-            "solve_max_rooms": 1,
-            "solve_max_parent_obj": None,
-            "consgraph_filters": None,
-            "solve_steps": None,
-            "solve_large_enabled": True,
-            "solve_medium_enabled": True,
-            "solve_small_enabled": True,
-            "stage_types": {
-                "obj_ontop_obj": True,
+        "output": ChainMap(
+            {
+                "restrict_parent_rooms": ["Kitchen"],
+                "restrict_parent_objs": ["KitchenCounter"],
+                "restrict_child_primary": ["KitchenCounter"],
+                "restrict_child_secondary": ["FoodPantryItem"],
+                "solve_max_rooms": 1,
+                "solve_max_parent_obj": None,
+                "consgraph_filters": None,
+                "solve_steps": None,
+                "solve_large_enabled": True,
+                "solve_medium_enabled": True,
+                "solve_small_enabled": True,
+                "stage_types": {
+                    "obj_ontop_obj": True,
+                },
+                "stage_exclusive": False,
             },
-            "stage_exclusive": False,
-            "terrain_enabled": False,
-            "topview": False,
-            "animate_cameras_enabled": False,
-            "floating_objs_enabled": False,
-            "restrict_single_supported_roomtype": False,
-        },
+            _COMMON_OUTPUT_FIELDS,
+        ),
     },
     # Example 5: "위에만" = "only on top" → stage_exclusive=True
     # But solve_large must stay True (desk needs to be placed on floor first!)
     {
         "input": "책상 위에만 물건을 배치해줘.",
-        "output": {
-            "restrict_parent_rooms": None,
-            "restrict_parent_objs": ["Desk"],
-            "restrict_child_primary": None,
-            "restrict_child_secondary": None,
-            "solve_max_rooms": None,
-            "solve_max_parent_obj": None,
-            "consgraph_filters": None,
-            "solve_steps": None,
-            "solve_large_enabled": True,
-            "solve_medium_enabled": False,
-            "solve_small_enabled": True,
-            "stage_types": {
-                "obj_ontop_obj": True,
+        "output": ChainMap(
+            {
+                "restrict_parent_rooms": None,
+                "restrict_parent_objs": ["Desk"],
+                "restrict_child_primary": None,
+                "restrict_child_secondary": None,
+                "solve_max_rooms": None,
+                "solve_max_parent_obj": None,
+                "consgraph_filters": None,
+                "solve_steps": None,
+                "solve_large_enabled": True,
+                "solve_medium_enabled": False,
+                "solve_small_enabled": True,
+                "stage_types": {
+                    "obj_ontop_obj": True,
+                },
+                "stage_exclusive": True,
             },
-            "stage_exclusive": True,
-            "terrain_enabled": False,
-            "topview": False,
-            "animate_cameras_enabled": False,
-            "floating_objs_enabled": False,
-            "restrict_single_supported_roomtype": False,
-        },
+            _COMMON_OUTPUT_FIELDS,
+        ),
     },
     # Example 6: "Put a mouse on the desk" — describes placement, NOT restriction → all stages True
     {
         "input": "책상 위에 마우스가 있게 해줘.",
-        "output": {
-            "restrict_parent_rooms": None,
-            "restrict_parent_objs": ["Desk"],
-            "restrict_child_primary": ["Desk"],
-            "restrict_child_secondary": ["HandheldItem"],
-            "solve_max_rooms": None,
-            "solve_max_parent_obj": None,
-            "consgraph_filters": None,
-            "solve_steps": None,
-            "solve_large_enabled": True,
-            "solve_medium_enabled": True,
-            "solve_small_enabled": True,
-            "stage_types": {
-                "obj_ontop_obj": True,
+        "output": ChainMap(
+            {
+                "restrict_parent_rooms": None,
+                "restrict_parent_objs": ["Desk"],
+                "restrict_child_primary": ["Desk"],
+                "restrict_child_secondary": ["HandheldItem"],
+                "solve_max_rooms": None,
+                "solve_max_parent_obj": None,
+                "consgraph_filters": None,
+                "solve_steps": None,
+                "solve_large_enabled": True,
+                "solve_medium_enabled": True,
+                "solve_small_enabled": True,
+                "stage_types": {
+                    "obj_ontop_obj": True,
+                },
+                "stage_exclusive": False,
             },
-            "stage_exclusive": False,
-            "terrain_enabled": False,
-            "topview": False,
-            "animate_cameras_enabled": False,
-            "floating_objs_enabled": False,
-            "restrict_single_supported_roomtype": False,
-        },
+            _COMMON_OUTPUT_FIELDS,
+        ),
     },
     # Example 7: "싱크대" in kitchen — Sink goes on KitchenCounter → restrict_child_secondary
     {
         "input": "주방에 싱크대를 배치해줘.",
-        "output": {
-            "restrict_parent_rooms": ["Kitchen"],
-            "restrict_parent_objs": ["KitchenCounter"],
-            "restrict_child_primary": ["KitchenCounter"],
-            "restrict_child_secondary": ["Sink"],
-            "solve_max_rooms": None,
-            "solve_max_parent_obj": None,
-            "consgraph_filters": None,
-            "solve_steps": None,
-            "solve_large_enabled": True,
-            "solve_medium_enabled": True,
-            "solve_small_enabled": True,
-            "stage_types": None,
-            "stage_exclusive": False,
-            "terrain_enabled": False,
-            "topview": False,
-            "animate_cameras_enabled": False,
-            "floating_objs_enabled": False,
-            "restrict_single_supported_roomtype": False,
-        },
+        "output": ChainMap(
+            {
+                "restrict_parent_rooms": ["Kitchen"],
+                "restrict_parent_objs": ["KitchenCounter"],
+                "restrict_child_primary": ["KitchenCounter"],
+                "restrict_child_secondary": ["Sink"],
+                "solve_max_rooms": None,
+                "solve_max_parent_obj": None,
+                "consgraph_filters": None,
+                "solve_steps": None,
+                "solve_large_enabled": True,
+                "solve_medium_enabled": True,
+                "solve_small_enabled": True,
+                "stage_types": None,
+                "stage_exclusive": False,
+            },
+            _COMMON_OUTPUT_FIELDS,
+        ),
     },
     # Example 8: Negation — "침대만", "다른 가구는 없이" → Bedroom, Bed only
     {
         "input": "침실에 침대만 배치하고 다른 가구는 없이 해줘.",
-        "output": {
-            "restrict_parent_rooms": ["Bedroom"],
-            "restrict_parent_objs": None,
-            "restrict_child_primary": ["Bed"],
-            "restrict_child_secondary": None,
-            "solve_max_rooms": None,
-            "solve_max_parent_obj": None,
-            "consgraph_filters": None,
-            "solve_steps": None,
-            "solve_large_enabled": True,
-            "solve_medium_enabled": True,
-            "solve_small_enabled": True,
-            "stage_types": None,
-            "stage_exclusive": False,
-            "terrain_enabled": False,
-            "topview": False,
-            "animate_cameras_enabled": False,
-            "floating_objs_enabled": False,
-            "restrict_single_supported_roomtype": False,
-        },
+        "output": ChainMap(
+            {
+                "restrict_parent_rooms": ["Bedroom"],
+                "restrict_parent_objs": None,
+                "restrict_child_primary": ["Bed"],
+                "restrict_child_secondary": None,
+                "solve_max_rooms": None,
+                "solve_max_parent_obj": None,
+                "consgraph_filters": None,
+                "solve_steps": None,
+                "solve_large_enabled": True,
+                "solve_medium_enabled": True,
+                "solve_small_enabled": True,
+                "stage_types": None,
+                "stage_exclusive": False,
+            },
+            _COMMON_OUTPUT_FIELDS,
+        ),
     },
     # Example 9: Real-world — "침대와 옷장이 있고, 창가에 책상" → include Desk
     {
         "input": "아늑한 침실을 만들어줘. 침대와 옷장이 있고, 창가에 책상이 있으면 좋겠어. 최대 2개 방으로 해줘.",
-        "output": {
-            "restrict_parent_rooms": ["Bedroom"],
-            "restrict_parent_objs": None,
-            "restrict_child_primary": ["Bed", "Storage", "Desk"],
-            "restrict_child_secondary": None,
-            "solve_max_rooms": 2,
-            "solve_max_parent_obj": None,
-            "consgraph_filters": None,
-            "solve_steps": None,
-            "solve_large_enabled": True,
-            "solve_medium_enabled": True,
-            "solve_small_enabled": True,
-            "stage_types": None,
-            "stage_exclusive": False,
-            "terrain_enabled": False,
-            "topview": False,
-            "animate_cameras_enabled": False,
-            "floating_objs_enabled": False,
-            "restrict_single_supported_roomtype": False,
-        },
+        "output": ChainMap(
+            {
+                "restrict_parent_rooms": ["Bedroom"],
+                "restrict_parent_objs": None,
+                "restrict_child_primary": ["Bed", "Storage", "Desk"],
+                "restrict_child_secondary": None,
+                "solve_max_rooms": 2,
+                "solve_max_parent_obj": None,
+                "consgraph_filters": None,
+                "solve_steps": None,
+                "solve_large_enabled": True,
+                "solve_medium_enabled": True,
+                "solve_small_enabled": True,
+                "stage_types": None,
+                "stage_exclusive": False,
+            },
+            _COMMON_OUTPUT_FIELDS,
+        ),
     },
     # Example 10: "바닥과 벽에만" → solve_small_enabled=False
     {
         "input": "거실에 가구를 바닥과 벽에만 배치해줘.",
-        "output": {
-            "restrict_parent_rooms": ["LivingRoom"],
-            "restrict_parent_objs": None,
-            "restrict_child_primary": ["Furniture"],
-            "restrict_child_secondary": None,
-            "solve_max_rooms": None,
-            "solve_max_parent_obj": None,
-            "consgraph_filters": None,
-            "solve_steps": None,
-            "solve_large_enabled": True,
-            "solve_medium_enabled": True,
-            "solve_small_enabled": False,
-            "stage_types": {
-                "on_floor_and_wall": True,
-                "on_floor_freestanding": True,
-                "on_wall": True,
+        "output": ChainMap(
+            {
+                "restrict_parent_rooms": ["LivingRoom"],
+                "restrict_parent_objs": None,
+                "restrict_child_primary": ["Furniture"],
+                "restrict_child_secondary": None,
+                "solve_max_rooms": None,
+                "solve_max_parent_obj": None,
+                "consgraph_filters": None,
+                "solve_steps": None,
+                "solve_large_enabled": True,
+                "solve_medium_enabled": True,
+                "solve_small_enabled": False,
+                "stage_types": {
+                    "on_floor_and_wall": True,
+                    "on_floor_freestanding": True,
+                    "on_wall": True,
+                },
+                "stage_exclusive": True,
             },
-            "stage_exclusive": True,
-            "terrain_enabled": False,
-            "topview": False,
-            "animate_cameras_enabled": False,
-            "floating_objs_enabled": False,
-            "restrict_single_supported_roomtype": False,
-        },
+            _COMMON_OUTPUT_FIELDS,
+        ),
     },
     # Example 11a: Ambiguous "가구" (furniture) → use Furniture tag when unspecified
     {
         "input": "침실에 적당히 가구를 배치해줘.",
-        "output": {
-            "restrict_parent_rooms": ["Bedroom"],
-            "restrict_parent_objs": None,
-            "restrict_child_primary": ["Furniture"],
-            "restrict_child_secondary": None,
-            "solve_max_rooms": None,
-            "solve_max_parent_obj": None,
-            "consgraph_filters": None,
-            "solve_steps": None,
-            "solve_large_enabled": True,
-            "solve_medium_enabled": True,
-            "solve_small_enabled": True,
-            "stage_types": None,
-            "stage_exclusive": False,
-            "terrain_enabled": False,
-            "topview": False,
-            "animate_cameras_enabled": False,
-            "floating_objs_enabled": False,
-            "restrict_single_supported_roomtype": False,
-        },
+        "output": ChainMap(
+            {
+                "restrict_parent_rooms": ["Bedroom"],
+                "restrict_parent_objs": None,
+                "restrict_child_primary": ["Furniture"],
+                "restrict_child_secondary": None,
+                "solve_max_rooms": None,
+                "solve_max_parent_obj": None,
+                "consgraph_filters": None,
+                "solve_steps": None,
+                "solve_large_enabled": True,
+                "solve_medium_enabled": True,
+                "solve_small_enabled": True,
+                "stage_types": None,
+                "stage_exclusive": False,
+            },
+            _COMMON_OUTPUT_FIELDS,
+        ),
     },
     # Example 11b: Multiple rooms + "바닥에만" → solve_small_enabled=False
     {
         "input": "침실과 거실에 침대, 소파, 테이블을 배치하고, 최대 3개 방, 바닥에만 배치해줘.",
-        "output": {
-            "restrict_parent_rooms": ["Bedroom", "LivingRoom"],
-            "restrict_parent_objs": None,
-            "restrict_child_primary": ["Bed", "LoungeSeating", "Table"],
-            "restrict_child_secondary": None,
-            "solve_max_rooms": 3,
-            "solve_max_parent_obj": None,
-            "consgraph_filters": None,
-            "solve_steps": None,
-            "solve_large_enabled": True,
-            "solve_medium_enabled": False,
-            "solve_small_enabled": False,
-            "stage_types": {"on_floor_and_wall": True, "on_floor_freestanding": True},
-            "stage_exclusive": True,
-            "terrain_enabled": False,
-            "topview": False,
-            "animate_cameras_enabled": False,
-            "floating_objs_enabled": False,
-            "restrict_single_supported_roomtype": False,
-        },
+        "output": ChainMap(
+            {
+                "restrict_parent_rooms": ["Bedroom", "LivingRoom"],
+                "restrict_parent_objs": None,
+                "restrict_child_primary": ["Bed", "LoungeSeating", "Table"],
+                "restrict_child_secondary": None,
+                "solve_max_rooms": 3,
+                "solve_max_parent_obj": None,
+                "consgraph_filters": None,
+                "solve_steps": None,
+                "solve_large_enabled": True,
+                "solve_medium_enabled": False,
+                "solve_small_enabled": False,
+                "stage_types": {
+                    "on_floor_and_wall": True,
+                    "on_floor_freestanding": True,
+                },
+                "stage_exclusive": True,
+            },
+            _COMMON_OUTPUT_FIELDS,
+        ),
     },
     # Example 12: Floor + on table only (no wall) → solve_medium_enabled=False
     {
         "input": "거실에 소파를 바닥에 배치하고, 테이블 위에 그릇을 올려줘.",
-        "output": {
-            "restrict_parent_rooms": ["LivingRoom"],
-            "restrict_parent_objs": ["Table"],
-            "restrict_child_primary": ["LoungeSeating", "Table"],
-            "restrict_child_secondary": ["Dishware"],
-            "solve_max_rooms": None,
-            "solve_max_parent_obj": None,
-            "consgraph_filters": None,
-            "solve_steps": None,
-            "solve_large_enabled": True,
-            "solve_medium_enabled": False,
-            "solve_small_enabled": True,
-            "stage_types": {
-                "on_floor_and_wall": True,
-                "on_floor_freestanding": True,
-                "obj_ontop_obj": True,
+        "output": ChainMap(
+            {
+                "restrict_parent_rooms": ["LivingRoom"],
+                "restrict_parent_objs": ["Table"],
+                "restrict_child_primary": ["LoungeSeating", "Table"],
+                "restrict_child_secondary": ["Dishware"],
+                "solve_max_rooms": None,
+                "solve_max_parent_obj": None,
+                "consgraph_filters": None,
+                "solve_steps": None,
+                "solve_large_enabled": True,
+                "solve_medium_enabled": False,
+                "solve_small_enabled": True,
+                "stage_types": {
+                    "on_floor_and_wall": True,
+                    "on_floor_freestanding": True,
+                    "obj_ontop_obj": True,
+                },
+                "stage_exclusive": False,
             },
-            "stage_exclusive": False,
-            "terrain_enabled": False,
-            "topview": False,
-            "animate_cameras_enabled": False,
-            "floating_objs_enabled": False,
-            "restrict_single_supported_roomtype": False,
-        },
+            _COMMON_OUTPUT_FIELDS,
+        ),
     },
 ]
 
+# Output field values shared by most examples. The few-shot block only lists
+# the fields of each example output that differ from these.
+_DEFAULT_OUTPUT = MappingProxyType(
+    {
+        "restrict_parent_rooms": None,
+        "restrict_parent_objs": None,
+        "restrict_child_primary": None,
+        "restrict_child_secondary": None,
+        "solve_max_rooms": None,
+        "solve_max_parent_obj": None,
+        "consgraph_filters": None,
+        "solve_steps": None,
+        "solve_large_enabled": True,
+        "solve_medium_enabled": True,
+        "solve_small_enabled": True,
+        "stage_types": None,
+        "stage_exclusive": False,
+        **_COMMON_OUTPUT_FIELDS,
+    }
+)
+
+_COMPACT_OUTPUTS = tuple(
+    {
+        key: value
+        for key, value in example["output"].items()
+        if key not in _DEFAULT_OUTPUT or _DEFAULT_OUTPUT[key] != value
+    }
+    for example in EXAMPLE_INPUTS_OUTPUTS
+)
+
+
+def _dumps_json(value: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, with orjson if it is installed.
 
+    Both produce the same bytes: no whitespace and non-ASCII kept as is.
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _to_json(value: Any) -> str:
+    # Compact separators keep the few-shot block, sent with every request, short
+    return _dumps_json(value).decode()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_fewshot_block() -> str:
+    # Built on first use, so processes that import this module without
+    # prompting an LLM never render it
+    return "\n\n".join(
+        [
+            "Example outputs only list the fields that differ from these defaults: "
+            + _to_json(dict(_DEFAULT_OUTPUT))
+        ]
+        + [
+            f"Example input: {input_text}\nExample output: {_to_json(output)}"
+            for input_text, output in zip(_EX_INPUTS, _COMPACT_OUTPUTS)
+        ]
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class Example:
+    """A few-shot example: natural language input and its expected parse."""
+
+    input: str
+    output: Mapping[str, Any]
+
+
+# Shared with every caller of get_examples(), so they must not be mutable
+EXAMPLE_INPUTS_OUTPUTS = tuple(
+    Example(input=example["input"], output=MappingProxyType(example["output"]))
+    for example in EXAMPLE_INPUTS_OUTPUTS
+)
+
+# Column views, for callers that only need the inputs or only the outputs
+_EX_INPUTS = tuple(example.input for example in EXAMPLE_INPUTS_OUTPUTS)
+_EX_OUTPUTS = tuple(example.output for example in EXAMPLE_INPUTS_OUTPUTS)
+
+_COMPACT_EXAMPLES = tuple(
+    Example(input=example.input, output=MappingProxyType(output))
+    for example, output in zip(EXAMPLE_INPUTS_OUTPUTS, _COMPACT_OUTPUTS)
+)
+
+
+# PROMPT_TEMPLATE is split here into its static instructions and the per-input tail
+_INPUT_LABEL = "Input: "
+_INPUT_MARKER = _INPUT_LABEL + "{input_text}"
+
+
+@functools.lru_cache(maxsize=1)
+def _get_prompt_parts() -> tuple[str, str]:
+    """Format PROMPT_TEMPLATE once around its input text.
+
+    Returns:
+        (prefix, suffix) such that prefix + input_text + suffix is the prompt.
+        The prefix ends with the input label.
+    """
+    index = PROMPT_TEMPLATE.index(_INPUT_MARKER)
+    instructions = PROMPT_TEMPLATE[:index].format(
+        room_types=get_room_types_for_prompt(),
+        parent_objs=", ".join(_PARENT_OBJS),
+        child_primary=", ".join(_CHILD_PRIMARY),
+        child_secondary=", ".join(_CHILD_SECONDARY),
+        other_objs=", ".join(_OTHER_OBJS),
+    )
+    suffix = PROMPT_TEMPLATE[index + len(_INPUT_MARKER) :].format()
+    return instructions + _INPUT_LABEL, suffix
+
+
+# Scene descriptions are a few sentences; anything far longer is not worth
+# sending to the LLM
+MAX_INPUT_LENGTH = 4000
+
+# C0 control characters other than tab and newline carry no meaning in a scene
+# description and produce invalid JSON if the LLM echoes them into a string
+_CONTROL_CHAR_TABLE = dict.fromkeys(
+    [c for c in range(0x20) if chr(c) not in "\t\n"] + [0x7F]
+)
+
+
+def _sanitize_input(input_text: str) -> str:
+    """Check the input length and strip control characters in one C-level pass.
+
+    Raises:
+        ValueError: If input_text is blank or longer than MAX_INPUT_LENGTH
+    """
+    if not input_text.strip():
+        raise ValueError("Input text is empty")
+    if len(input_text) > MAX_INPUT_LENGTH:
+        raise ValueError(
+            f"Input text is {len(input_text)} characters long; "
+            f"the maximum is {MAX_INPUT_LENGTH}"
+        )
+    return input_text.translate(_CONTROL_CHAR_TABLE)
+
+
+# Retries and parameter sweeps resend the same input; full prompts are a few KB
+# each, so fewer of them are kept than of the short user prompts
+@functools.lru_cache(maxsize=128)
 def get_prompt(input_text: str) -> str:
     """Get formatted prompt for LLM.
 
@@ -497,18 +677,201 @@ def get_prompt(input_text: str) -> str:
 
     Returns:
         Formatted prompt string
+
+    Raises:
+        ValueError: If input_text is blank or longer than MAX_INPUT_LENGTH
     """
-    room_types_str = get_room_types_for_prompt()
-    object_types_str = get_object_types_for_prompt()
-    return PROMPT_TEMPLATE.format(
-        room_types=room_types_str, object_types=object_types_str, input_text=input_text
-    )
+    prefix, suffix = _get_prompt_parts()
+    return "".join((prefix, _sanitize_input(input_text), suffix))
+
+
+@functools.lru_cache(maxsize=1)
+def _get_prefix_with_examples() -> str:
+    prefix, _ = _get_prompt_parts()
+    instructions = prefix[: -len(_INPUT_LABEL)]
+    return "".join((instructions, _get_fewshot_block(), "\n\n", _INPUT_LABEL))
+
+
+def get_prompt_with_examples(input_text: str) -> str:
+    """Get formatted prompt for LLM, with the few-shot examples included.
 
+    Like get_prompt(), but the examples are placed between the instructions
+    and the input text, for backends that take a single prompt string.
 
-def get_examples() -> list[dict]:
+    Args:
+        input_text: Natural language input text
+
+    Returns:
+        Formatted prompt string
+
+    Raises:
+        ValueError: If input_text is blank or longer than MAX_INPUT_LENGTH
+    """
+    _, suffix = _get_prompt_parts()
+    return "".join((_get_prefix_with_examples(), _sanitize_input(input_text), suffix))
+
+
+@functools.lru_cache(maxsize=8)
+def _tokenize_prompt_parts(tokenizer: Any) -> tuple[list[int], list[int]]:
+    _, suffix = _get_prompt_parts()
+    prefix_ids = tokenizer.encode(_get_prefix_with_examples(), add_special_tokens=False)
+    suffix_ids = tokenizer.encode(suffix, add_special_tokens=False)
+    return prefix_ids, suffix_ids
+
+
+def get_prompt_token_ids(tokenizer: Any, input_text: str) -> list[int]:
+    """Get the token IDs of get_prompt_with_examples(input_text).
+
+    The static prefix and suffix are tokenized once per tokenizer, so only the
+    input text is tokenized per call. Every prompt starts with the same prefix
+    IDs, which lets local model servers share its KV cache between requests.
+    Tokens may split differently at the two seams than when tokenizing the
+    whole prompt string.
+
+    Args:
+        tokenizer: Tokenizer with a Hugging Face style
+            encode(text, add_special_tokens=False) method
+        input_text: Natural language input text
+
+    Returns:
+        Prompt token IDs, without special tokens
+
+    Raises:
+        ValueError: If input_text is blank or longer than MAX_INPUT_LENGTH
+    """
+    prefix_ids, suffix_ids = _tokenize_prompt_parts(tokenizer)
+    input_ids = tokenizer.encode(_sanitize_input(input_text), add_special_tokens=False)
+    return prefix_ids + input_ids + suffix_ids
+
+
+@functools.lru_cache(maxsize=1)
+def get_system_prompt() -> str:
+    """Get the static part of the prompt as one system message.
+
+    Contains the system message, the instructions of PROMPT_TEMPLATE and all
+    few-shot examples, in a fixed order. Since it is identical for every input,
+    LLM servers can reuse their cached computation of this prompt prefix.
+
+    Returns:
+        System prompt string
+    """
+    prefix, _ = _get_prompt_parts()
+    instructions = prefix[: -len(_INPUT_LABEL)]
+    return "\n\n".join([SYSTEM_MESSAGE, instructions.rstrip(), _get_fewshot_block()])
+
+
+@functools.lru_cache(maxsize=1024)
+def get_user_prompt(input_text: str) -> str:
+    """Get the per-input part of the prompt, to follow get_system_prompt().
+
+    Args:
+        input_text: Natural language input text
+
+    Returns:
+        User prompt string
+
+    Raises:
+        ValueError: If input_text is blank or longer than MAX_INPUT_LENGTH
+    """
+    _, suffix = _get_prompt_parts()
+    return "".join((_INPUT_LABEL, _sanitize_input(input_text), suffix))
+
+
+@functools.lru_cache(maxsize=1)
+def get_prompt_version() -> str:
+    """Get a fingerprint of the prompts sent to the LLM.
+
+    It changes whenever the instructions, few-shot examples or per-input template
+    change, so stored parse results can be matched to the prompt that produced them.
+
+    Returns:
+        16 hex character digest
+    """
+    _, suffix = _get_prompt_parts()
+    text = "\0".join((get_system_prompt(), _INPUT_LABEL, suffix))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def get_examples() -> tuple[Example, ...]:
     """Get example inputs and outputs for few-shot learning.
 
     Returns:
-        List of example dictionaries with 'input' and 'output' keys
+        Frozen examples, each with a read-only output mapping
     """
     return EXAMPLE_INPUTS_OUTPUTS
+
+
+def get_example_inputs() -> tuple[str, ...]:
+    """Get the inputs of the few-shot examples, in get_examples() order.
+
+    Returns:
+        Example input texts
+    """
+    return _EX_INPUTS
+
+
+def get_example_outputs() -> tuple[Mapping[str, Any], ...]:
+    """Get the outputs of the few-shot examples, in get_examples() order.
+
+    Returns:
+        Read-only example output mappings
+    """
+    return _EX_OUTPUTS
+
+
+def get_compact_examples() -> tuple[Example, ...]:
+    """Get the few-shot examples with only non-default output fields.
+
+    Returns:
+        Frozen examples whose output omits the fields equal to their common
+        default value
+    """
+    return _COMPACT_EXAMPLES
+
+
+# Furniture names containing a placement keyword that describes no placement.
+# They are matched like keywords (the longest match wins) and then ignored
+_NON_PLACEMENT_PHRASES = frozenset({"entertainment center", "media center"})
+
+# Longest keywords first, so "not against wall" wins over "against wall";
+# English keywords only match whole words
+_STAGE_TYPE_RE = tag_mapping._compile_keywords(
+    tag_mapping.STAGE_TYPE_KEYWORDS.keys() | _NON_PLACEMENT_PHRASES
+)
+
+
+def try_fast_parse(input_text: str) -> Optional[dict[str, Any]]:
+    """Extract stage_types from the placement keywords taught in the prompt.
+
+    Scans the input once with a precompiled pattern over
+    tag_mapping.STAGE_TYPE_KEYWORDS, without calling the LLM. Callers can use
+    it to handle obvious phrasings directly or to check an LLM result.
+
+    Args:
+        input_text: Natural language input text
+
+    Returns:
+        Partial parsed data {"stage_types": {...}} with each mentioned
+        sub-stage set to True, or None if no keyword is found
+    """
+    stage_types = {
+        tag_mapping.STAGE_TYPE_KEYWORDS[keyword]: True
+        for keyword in _STAGE_TYPE_RE.findall(input_text.lower())
+        if keyword not in _NON_PLACEMENT_PHRASES
+    }
+    if not stage_types:
+        return None
+    return {"stage_types": stage_types}
+
+
+@functools.lru_cache(maxsize=1)
+def get_examples_serialized() -> tuple[tuple[str, bytes], ...]:
+    """Get the few-shot examples with their outputs serialized once.
+
+    Returns:
+        (input, output JSON as UTF-8 bytes) pairs, in get_examples() order
+    """
+    return tuple(
+        (input_text, _dumps_json(dict(output)))
+        for input_text, output in zip(_EX_INPUTS, _EX_OUTPUTS)
+    )
@@ -0,0 +1,276 @@
+# Copyright (C) 2024, Princeton University.
+# This source code is licensed under the BSD 3-Clause license found in the LICENSE file in the root directory
+# of this source tree.
+
+"""Embedding-similarity cache for LLM parse results.
+
+Paraphrases of an already-parsed input ("place a desk in the bedroom" vs
+"put a desk in the bedroom") reuse the earlier parse instead of calling the LLM
+again. Embeddings come from Ollama's embed endpoint, so no extra dependency is
+needed beyond the ollama package.
+"""
+
+import base64
+import functools
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBED_MODEL = "nomic-embed-text"
+DEFAULT_THRESHOLD = 0.92
+# Seconds to wait for an embed request; parse_with_local_llm's default timeout,
+# so both use the same client
+_EMBED_TIMEOUT = 60
+
+_ENTRIES_FILE = "entries.jsonl"
+
+
+class _Rows:
+    """Growable row storage; the rows below a length never change once written.
+
+    A lookup can therefore keep using a (rows, length) snapshot while add() appends.
+    """
+
+    def __init__(self, dim: int, capacity: int = 64):
+        self.matrix = np.empty((capacity, dim), dtype=np.float32)
+        self.times = np.empty(capacity, dtype=np.float64)
+        self.key_ids = np.empty(capacity, dtype=np.int32)
+        self.entries: List[Dict[str, Any]] = []
+
+    def append(self, embedding: np.ndarray, key_id: int, entry: Dict[str, Any]):
+        n = len(self.entries)
+        if n == len(self.matrix):
+            # Grow by doubling into new arrays, leaving snapshots of the old ones intact
+            self.matrix = np.concatenate([self.matrix, np.empty_like(self.matrix)])
+            self.times = np.concatenate([self.times, np.empty_like(self.times)])
+            self.key_ids = np.concatenate([self.key_ids, np.empty_like(self.key_ids)])
+        self.matrix[n] = embedding
+        self.times[n] = entry["time"]
+        self.key_ids[n] = key_id
+        self.entries.append(entry)
+
+
+class SemanticCache:
+    """Cache of parse results keyed by L2-normalized input embeddings.
+
+    Embeddings are kept as rows of a single matrix, so a lookup is one
+    matrix-vector product. Entries are persisted as an append-only JSON lines file,
+    one line per entry holding the input text, parse result, insertion time, the
+    models involved and the embedding, so adding an entry writes only that entry.
+
+    An entry is only reused for the same embedding model and the same parser,
+    which identifies the LLM and prompt that produced the parse result.
+    """
+
+    def __init__(self, cache_dir: Path):
+        """
+        Args:
+            cache_dir: Directory holding the persisted cache
+        """
+        self.cache_dir = Path(cache_dir)
+        self._rows: Optional[_Rows] = None
+        # (embed_model, parsed_by) -> id stored per row
+        self._key_ids: Dict[Tuple[str, str], int] = {}
+        # Batched parsing looks up / adds entries from several threads
+        self._lock = threading.Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        rows = self._rows
+        return 0 if rows is None else len(rows.entries)
+
+    def _key_id(self, embed_model: str, parsed_by: str) -> int:
+        return self._key_ids.setdefault((embed_model, parsed_by), len(self._key_ids))
+
+    def _load(self):
+        entries_path = self.cache_dir / _ENTRIES_FILE
+        try:
+            with open(entries_path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(
+                f"Ignoring unreadable semantic cache in {self.cache_dir}: {e}"
+            )
+            return
+
+        loaded = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                embedding = np.frombuffer(
+                    base64.b64decode(entry.pop("embedding")), dtype=np.float32
+                )
+            except (ValueError, KeyError, TypeError, AttributeError):
+                # e.g. the last line of a write that was interrupted
+                logger.warning(
+                    f"Skipping malformed semantic cache entry in {entries_path}"
+                )
+                continue
+            loaded.append((embedding, entry))
+        if not loaded:
+            return
+
+        # Rows from before an embedding dimension change can never match again
+        dim = len(loaded[-1][0])
+        rows = _Rows(dim, capacity=max(64, len(loaded)))
+        for embedding, entry in loaded:
+            if len(embedding) == dim:
+                key_id = self._key_id(entry["embed_model"], entry["parsed_by"])
+                rows.append(embedding, key_id, entry)
+        self._rows = rows
+
+    def _write(self, lines: Sequence[str], mode: str):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # One write per call, so concurrent appends do not interleave within a line
+        with open(self.cache_dir / _ENTRIES_FILE, mode, encoding="utf-8") as f:
+            f.write("".join(lines))
+
+    def embed(
+        self,
+        texts: Sequence[str],
+        base_url: str = "http://localhost:11434",
+        embed_model: str = DEFAULT_EMBED_MODEL,
+    ) -> np.ndarray:
+        """Embed texts in a single request, returning L2-normalized rows.
+
+        Args:
+            texts: Texts to embed
+            base_url: Ollama server base URL used for embedding
+            embed_model: Ollama embedding model name
+
+        Raises:
+            ImportError: If ollama package is not installed
+            RuntimeError: If the installed ollama only has the legacy module API
+        """
+        from infinigen_examples.nlp import parse_natural_language
+
+        if parse_natural_language.ollama is None:
+            raise ImportError(
+                "ollama package is required. Install with: pip install ollama"
+            )
+        # Shares the parser's client, and with it the keep-alive connection pool
+        client = parse_natural_language.get_ollama_client(base_url, _EMBED_TIMEOUT)
+        if client is None:
+            raise RuntimeError("Semantic cache requires an ollama version with Client")
+
+        response = client.embed(model=embed_model, input=list(texts))
+        if isinstance(response, dict):
+            embeddings = response["embeddings"]
+        else:
+            embeddings = response.embeddings
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def lookup(
+        self,
+        embedding: np.ndarray,
+        parsed_by: str,
+        embed_model: str = DEFAULT_EMBED_MODEL,
+        threshold: float = DEFAULT_THRESHOLD,
+        ttl: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Return the cached parse for the most similar input, or None below threshold.
+
+        Args:
+            embedding: L2-normalized embedding of the input, from embed()
+            parsed_by: Identifies the LLM and prompt whose parse results may be reused
+            embed_model: Embedding model that produced embedding
+            threshold: Minimum cosine similarity for a hit
+            ttl: Maximum age of a reusable entry in seconds (None: never expires)
+        """
+        with self._lock:
+            rows = self._rows
+            key_id = self._key_ids.get((embed_model, parsed_by))
+            if rows is None or key_id is None:
+                return None
+            # Snapshot: the first n rows stay as they are while other threads add
+            n = len(rows.entries)
+            matrix, times, key_ids = rows.matrix, rows.times, rows.key_ids
+        if matrix.shape[1] != embedding.shape[0]:
+            # Embedding model changed since the cache was written
+            return None
+
+        scores = matrix[:n] @ embedding
+        invalid = key_ids[:n] != key_id
+        if ttl is not None:
+            invalid |= times[:n] < time.time() - ttl
+        scores[invalid] = -np.inf
+
+        best = int(np.argmax(scores))
+        score = float(scores[best])
+        if score < threshold:
+            return None
+
+        entry = rows.entries[best]
+        logger.info(
+            f"Semantic cache hit (similarity {score:.3f}) for cached input: {entry['text']}"
+        )
+        return entry["parsed"]
+
+    def add(
+        self,
+        text: str,
+        embedding: np.ndarray,
+        parsed: Dict[str, Any],
+        parsed_by: str,
+        embed_model: str = DEFAULT_EMBED_MODEL,
+    ):
+        """Add a parse result and append it to the persisted cache.
+
+        Args:
+            text: Input text that was parsed
+            embedding: L2-normalized embedding of text, from embed()
+            parsed: Parse result of text
+            parsed_by: Identifies the LLM and prompt that produced parsed
+            embed_model: Embedding model that produced embedding
+        """
+        embedding = embedding.astype(np.float32, copy=False)
+        entry = {
+            "text": text,
+            "parsed": parsed,
+            "time": time.time(),
+            "embed_model": embed_model,
+            "parsed_by": parsed_by,
+        }
+        line = (
+            json.dumps(
+                {**entry, "embedding": base64.b64encode(embedding.tobytes()).decode()},
+                ensure_ascii=False,
+            )
+            + "\n"
+        )
+        with self._lock:
+            key_id = self._key_id(embed_model, parsed_by)
+            if self._rows is None or self._rows.matrix.shape[1] != len(embedding):
+                # First entry, or the embedding dimension changed: start over
+                self._rows = _Rows(len(embedding))
+                mode = "w"
+            else:
+                mode = "a"
+            self._rows.append(embedding, key_id, entry)
+            try:
+                self._write([line], mode)
+            except OSError as e:
+                logger.warning(
+                    f"Could not write semantic cache to {self.cache_dir}: {e}"
+                )
+
+
+@functools.lru_cache(maxsize=8)
+def get_semantic_cache(cache_dir: str) -> SemanticCache:
+    """Return the process-wide SemanticCache of cache_dir, loading it only once.
+
+    There is one instance per directory, so that all callers see (and append to)
+    the same entries whatever thresholds or models they look up with.
+    """
+    return SemanticCache(Path(cache_dir))
@@ -6,6 +6,14 @@
 
 from __future__ import annotations
 
+import functools
+import itertools
+import re
+import sys
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, fields
+from enum import StrEnum
+from types import MappingProxyType
 from typing import Optional
 
 from infinigen.core import tags as t
@@ -209,39 +217,101 @@ OBJECT_MAPPINGS = {
     "accesshand": t.Semantics.AccessHand,
 }
 
+
+def _freeze(mapping: dict) -> MappingProxyType:
+    """Read-only view of a keyword table, with its keys interned."""
+    return MappingProxyType({sys.intern(key): value for key, value in mapping.items()})
+
+
+# The keyword tables are shared module state and are never modified
+ROOM_MAPPINGS = _freeze(ROOM_MAPPINGS)
+OBJECT_MAPPINGS = _freeze(OBJECT_MAPPINGS)
+
+# Keywords meaning both a room and an object ("closet": the room, or a
+# wardrobe). Room matching on free text skips these to avoid furniture -> room
+# confusion; any other overlap between the two tables is a mistake.
+AMBIGUOUS_KEYWORDS = frozenset({"closet"})
+
+_unexpected_overlap = ROOM_MAPPINGS.keys() & OBJECT_MAPPINGS.keys()
+_unexpected_overlap -= AMBIGUOUS_KEYWORDS
+if _unexpected_overlap:
+    raise ValueError(
+        f"Keywords mapped to both a room and an object type: {sorted(_unexpected_overlap)}"
+    )
+del _unexpected_overlap
+
+
+def _build_tag_names(mappings: Mapping[str, t.Semantics]) -> dict[str, str]:
+    """Map each keyword, and each target tag's own lowercased name, to the tag name.
+
+    Keywords come from a frozen table and enum member names are identifiers, so
+    both are already interned; only the lowercased names are new strings.
+    """
+    tag_names = {keyword: tag.name for keyword, tag in mappings.items()}
+    for tag in mappings.values():
+        tag_names.setdefault(sys.intern(tag.name.lower()), tag.name)
+    return tag_names
+
+
+# Lowercased natural language name -> Semantics tag name, for normalizing parsed names
+# with a single dict lookup
+ROOM_TAG_NAMES = _build_tag_names(ROOM_MAPPINGS)
+OBJECT_TAG_NAMES = _build_tag_names(OBJECT_MAPPINGS)
+
+# Bound once; lookups try the raw name before normalizing it
+_get_room = ROOM_MAPPINGS.get
+_get_object = OBJECT_MAPPINGS.get
+
+
+class LocationKind(StrEnum):
+    """Normalized location keyword. Members compare equal to their string value."""
+
+    FLOOR = "floor"
+    FLOOR_ONLY = "floor_only"
+    WALL = "wall"
+    WALL_ONLY = "wall_only"
+    CEILING = "ceiling"
+    CEILING_ONLY = "ceiling_only"
+    ON_TOP = "on_top"
+    ON_TOP_ONLY = "on_top_only"
+
+
 # Location relationship keywords (for stage control)
 LOCATION_KEYWORDS = {
     # Korean
-    "바닥": "floor",
-    "바닥에": "floor",
-    "바닥에만": "floor_only",
-    "벽": "wall",
-    "벽에": "wall",
-    "벽에만": "wall_only",
-    "천장": "ceiling",
-    "천장에": "ceiling",
-    "천장에만": "ceiling_only",
-    "위에": "on_top",
-    "위에만": "on_top_only",
+    "바닥": LocationKind.FLOOR,
+    "바닥에": LocationKind.FLOOR,
+    "바닥에만": LocationKind.FLOOR_ONLY,
+    "벽": LocationKind.WALL,
+    "벽에": LocationKind.WALL,
+    "벽에만": LocationKind.WALL_ONLY,
+    "천장": LocationKind.CEILING,
+    "천장에": LocationKind.CEILING,
+    "천장에만": LocationKind.CEILING_ONLY,
+    "위에": LocationKind.ON_TOP,
+    "위에만": LocationKind.ON_TOP_ONLY,
     # English
-    "floor": "floor",
-    "on floor": "floor",
-    "on the floor": "floor",
-    "floor only": "floor_only",
-    "wall": "wall",
-    "on wall": "wall",
-    "on the wall": "wall",
-    "wall only": "wall_only",
-    "ceiling": "ceiling",
-    "on ceiling": "ceiling",
-    "on the ceiling": "ceiling",
-    "ceiling only": "ceiling_only",
-    "on top": "on_top",
-    "on top of": "on_top",
-    "on top only": "on_top_only",
+    "floor": LocationKind.FLOOR,
+    "on floor": LocationKind.FLOOR,
+    "on the floor": LocationKind.FLOOR,
+    "floor only": LocationKind.FLOOR_ONLY,
+    "wall": LocationKind.WALL,
+    "on wall": LocationKind.WALL,
+    "on the wall": LocationKind.WALL,
+    "wall only": LocationKind.WALL_ONLY,
+    "ceiling": LocationKind.CEILING,
+    "on ceiling": LocationKind.CEILING,
+    "on the ceiling": LocationKind.CEILING,
+    "ceiling only": LocationKind.CEILING_ONLY,
+    "on top": LocationKind.ON_TOP,
+    "on top of": LocationKind.ON_TOP,
+    "on top only": LocationKind.ON_TOP_ONLY,
 }
+LOCATION_KEYWORDS = _freeze(LOCATION_KEYWORDS)
+_get_location = LOCATION_KEYWORDS.get
 
 
+@functools.lru_cache(maxsize=1024)
 def map_room_name_to_tag(room_name: str) -> Optional[t.Semantics]:
     """Map natural language room name to Semantics tag.
 
@@ -251,10 +321,14 @@ def map_room_name_to_tag(room_name: str) -> Optional[t.Semantics]:
     Returns:
         Semantics tag if found, None otherwise
     """
-    room_name_lower = room_name.lower().strip()
-    return ROOM_MAPPINGS.get(room_name_lower)
+    # Names coming from the LLM are usually already normalized
+    tag = _get_room(room_name)
+    if tag is not None:
+        return tag
+    return _get_room(room_name.lower().strip())
 
 
+@functools.lru_cache(maxsize=1024)
 def map_object_name_to_tag(object_name: str) -> Optional[t.Semantics]:
     """Map natural language object name to Semantics tag.
 
@@ -264,11 +338,40 @@ def map_object_name_to_tag(object_name: str) -> Optional[t.Semantics]:
     Returns:
         Semantics tag if found, None otherwise
     """
-    object_name_lower = object_name.lower().strip()
-    return OBJECT_MAPPINGS.get(object_name_lower)
+    tag = _get_object(object_name)
+    if tag is not None:
+        return tag
+    return _get_object(object_name.lower().strip())
+
+
+def map_room_names_to_tags(room_names: Sequence[str]) -> list[Optional[t.Semantics]]:
+    """Map several natural language room names to Semantics tags.
+
+    Args:
+        room_names: Natural language room names (Korean or English)
+
+    Returns:
+        Semantics tag for each name, None where no tag is found
+    """
+    return list(map(map_room_name_to_tag, room_names))
+
+
+def map_object_names_to_tags(
+    object_names: Sequence[str],
+) -> list[Optional[t.Semantics]]:
+    """Map several natural language object names to Semantics tags.
+
+    Args:
+        object_names: Natural language object names (Korean or English)
+
+    Returns:
+        Semantics tag for each name, None where no tag is found
+    """
+    return list(map(map_object_name_to_tag, object_names))
 
 
-def parse_location_keyword(keyword: str) -> Optional[str]:
+@functools.lru_cache(maxsize=1024)
+def parse_location_keyword(keyword: str) -> Optional[LocationKind]:
     """Parse location keyword to determine stage control.
 
     Args:
@@ -277,79 +380,167 @@ def parse_location_keyword(keyword: str) -> Optional[str]:
     Returns:
         Normalized location keyword or None
     """
-    keyword_lower = keyword.lower().strip()
-    return LOCATION_KEYWORDS.get(keyword_lower)
+    location = _get_location(keyword)
+    if location is not None:
+        return location
+    return _get_location(keyword.lower().strip())
+
+
+def _keyword_alternation(keywords) -> str:
+    # Longest keywords first, so the longest match wins at each position
+    return "|".join(
+        re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)
+    )
+
+
+def _compile_keywords(keywords) -> re.Pattern:
+    """Compile a pattern matching any of the (lowercase) keywords.
+
+    English keywords only match whole words, optionally followed by a plural
+    "s"/"es" ("bed" matches "beds" but not "bedroom"); the suffix is not part of
+    the match, so each match is a keyword. Korean keywords are matched anywhere,
+    since particles attach directly to nouns ("침대를").
+    """
+    ascii_keywords = [keyword for keyword in keywords if keyword.isascii()]
+    other_keywords = [keyword for keyword in keywords if not keyword.isascii()]
+    alternatives = []
+    if ascii_keywords:
+        alternatives.append(
+            rf"(?<![a-z0-9_])(?:{_keyword_alternation(ascii_keywords)})"
+            r"(?=(?:e?s)?(?![a-z0-9_]))"
+        )
+    if other_keywords:
+        alternatives.append(_keyword_alternation(other_keywords))
+    return re.compile("|".join(alternatives))
+
+
+@functools.lru_cache(maxsize=1)
+def _room_keyword_re() -> re.Pattern:
+    return _compile_keywords(ROOM_MAPPINGS)
+
+
+@functools.lru_cache(maxsize=1)
+def _object_keyword_re() -> re.Pattern:
+    return _compile_keywords(OBJECT_MAPPINGS)
+
+
+def find_rooms_in_text(text: str) -> list[t.Semantics]:
+    """Find all room keywords in a text with a single scan.
+
+    Args:
+        text: Natural language text (Korean or English)
+
+    Returns:
+        Semantics tags of the non-overlapping keyword matches, in order of
+        appearance, preferring the longest keyword at each position
+    """
+    return [ROOM_MAPPINGS[match] for match in _room_keyword_re().findall(text.lower())]
+
+
+def find_objects_in_text(text: str) -> list[t.Semantics]:
+    """Find all object keywords in a text with a single scan.
+
+    Args:
+        text: Natural language text (Korean or English)
+
+    Returns:
+        Semantics tags of the non-overlapping keyword matches, in order of
+        appearance, preferring the longest keyword at each position
+    """
+    return [
+        OBJECT_MAPPINGS[match] for match in _object_keyword_re().findall(text.lower())
+    ]
+
 
+# The mappings are frozen, so their tag sets never change
+_ALL_ROOM_TYPES = frozenset(ROOM_MAPPINGS.values())
+_ALL_OBJECT_TYPES = frozenset(OBJECT_MAPPINGS.values())
 
-def get_all_room_types():
+
+def get_all_room_types() -> frozenset[t.Semantics]:
     """Get all available room types as Semantics tags.
 
     Returns:
-        Set of room type Semantics tags
+        Shared frozenset of room type Semantics tags
     """
-    return set(ROOM_MAPPINGS.values())
+    return _ALL_ROOM_TYPES
 
 
-def get_all_object_types():
+def get_all_object_types() -> frozenset[t.Semantics]:
     """Get all available object types as Semantics tags.
 
     Returns:
-        Set of object type Semantics tags
+        Shared frozenset of object type Semantics tags
     """
-    return set(OBJECT_MAPPINGS.values())
+    return _ALL_OBJECT_TYPES
+
+
+class StageType(StrEnum):
+    """Placement sub-stage. Members compare equal to their string value."""
+
+    ON_FLOOR_AND_WALL = "on_floor_and_wall"
+    ON_FLOOR_FREESTANDING = "on_floor_freestanding"
+    ON_WALL = "on_wall"
+    ON_CEILING = "on_ceiling"
+    SIDE_OBJ = "side_obj"
+    OBJ_ONTOP_OBJ = "obj_ontop_obj"
+    OBJ_ON_SUPPORT = "obj_on_support"
 
 
 # Detailed stage type keywords mapping
 STAGE_TYPE_KEYWORDS = {
     # Korean
-    "벽에 붙여서": "on_floor_and_wall",
-    "벽에 붙은": "on_floor_and_wall",
-    "벽면": "on_floor_and_wall",
-    "독립형": "on_floor_freestanding",
-    "프리스탠딩": "on_floor_freestanding",
-    "중앙에": "on_floor_freestanding",
-    "방 중앙": "on_floor_freestanding",
-    "벽에만": "on_wall",
-    "벽 장식": "on_wall",
-    "벽 선반": "on_wall",
-    "천장": "on_ceiling",
-    "천장에": "on_ceiling",
-    "매달린": "on_ceiling",
-    "옆에": "side_obj",
-    "옆으로": "side_obj",
-    "나란히": "side_obj",
-    "위에": "obj_ontop_obj",
-    "위에만": "obj_ontop_obj",
-    "지지면에": "obj_on_support",
-    "표면에": "obj_on_support",
+    "벽에 붙여서": StageType.ON_FLOOR_AND_WALL,
+    "벽에 붙은": StageType.ON_FLOOR_AND_WALL,
+    "벽면": StageType.ON_FLOOR_AND_WALL,
+    "독립형": StageType.ON_FLOOR_FREESTANDING,
+    "프리스탠딩": StageType.ON_FLOOR_FREESTANDING,
+    "중앙에": StageType.ON_FLOOR_FREESTANDING,
+    "방 중앙": StageType.ON_FLOOR_FREESTANDING,
+    "벽에만": StageType.ON_WALL,
+    "벽 장식": StageType.ON_WALL,
+    "벽 선반": StageType.ON_WALL,
+    "천장": StageType.ON_CEILING,
+    "천장에": StageType.ON_CEILING,
+    "매달린": StageType.ON_CEILING,
+    "옆에": StageType.SIDE_OBJ,
+    "옆으로": StageType.SIDE_OBJ,
+    "나란히": StageType.SIDE_OBJ,
+    "위에": StageType.OBJ_ONTOP_OBJ,
+    "위에만": StageType.OBJ_ONTOP_OBJ,
+    "지지면에": StageType.OBJ_ON_SUPPORT,
+    "표면에": StageType.OBJ_ON_SUPPORT,
     # English
-    "against wall": "on_floor_and_wall",
-    "wall-mounted": "on_floor_and_wall",
-    "touching wall": "on_floor_and_wall",
-    "freestanding": "on_floor_freestanding",
-    "center": "on_floor_freestanding",
-    "middle of room": "on_floor_freestanding",
-    "not against wall": "on_floor_freestanding",
-    "on wall": "on_wall",
-    "wall decoration": "on_wall",
-    "wall shelf": "on_wall",
-    "ceiling": "on_ceiling",
-    "hanging": "on_ceiling",
-    "ceiling light": "on_ceiling",
-    "beside": "side_obj",
-    "next to": "side_obj",
-    "side by side": "side_obj",
-    "on top of": "obj_ontop_obj",
-    "ontop": "obj_ontop_obj",
-    "above": "obj_ontop_obj",
-    "on support": "obj_on_support",
-    "on surface": "obj_on_support",
-    "on counter": "obj_on_support",
-    "on table": "obj_on_support",
+    "against wall": StageType.ON_FLOOR_AND_WALL,
+    "wall-mounted": StageType.ON_FLOOR_AND_WALL,
+    "touching wall": StageType.ON_FLOOR_AND_WALL,
+    "freestanding": StageType.ON_FLOOR_FREESTANDING,
+    "center": StageType.ON_FLOOR_FREESTANDING,
+    "middle of room": StageType.ON_FLOOR_FREESTANDING,
+    "not against wall": StageType.ON_FLOOR_FREESTANDING,
+    "on wall": StageType.ON_WALL,
+    "wall decoration": StageType.ON_WALL,
+    "wall shelf": StageType.ON_WALL,
+    "ceiling": StageType.ON_CEILING,
+    "hanging": StageType.ON_CEILING,
+    "ceiling light": StageType.ON_CEILING,
+    "beside": StageType.SIDE_OBJ,
+    "next to": StageType.SIDE_OBJ,
+    "side by side": StageType.SIDE_OBJ,
+    "on top of": StageType.OBJ_ONTOP_OBJ,
+    "ontop": StageType.OBJ_ONTOP_OBJ,
+    "above": StageType.OBJ_ONTOP_OBJ,
+    "on support": StageType.OBJ_ON_SUPPORT,
+    "on surface": StageType.OBJ_ON_SUPPORT,
+    "on counter": StageType.OBJ_ON_SUPPORT,
+    "on table": StageType.OBJ_ON_SUPPORT,
 }
+STAGE_TYPE_KEYWORDS = _freeze(STAGE_TYPE_KEYWORDS)
+_get_stage_type = STAGE_TYPE_KEYWORDS.get
 
 
-def parse_stage_type_keyword(keyword: str) -> Optional[str]:
+@functools.lru_cache(maxsize=1024)
+def parse_stage_type_keyword(keyword: str) -> Optional[StageType]:
     """Parse stage type keyword to determine specific stage type.
 
     Args:
@@ -358,11 +549,63 @@ def parse_stage_type_keyword(keyword: str) -> Optional[str]:
     Returns:
         Normalized stage type name or None
     """
-    keyword_lower = keyword.lower().strip()
-    return STAGE_TYPE_KEYWORDS.get(keyword_lower)
+    stage_type = _get_stage_type(keyword)
+    if stage_type is not None:
+        return stage_type
+    return _get_stage_type(keyword.lower().strip())
+
+
+# eq=False keeps Mapping.__eq__, so flags compare equal to the equivalent dict
+@dataclass(frozen=True, slots=True, eq=False)
+class StageFlags(Mapping):
+    """High-level stage enable/disable flags.
+
+    Also a read-only mapping keyed by field name, so existing callers can keep
+    indexing and comparing it like the dicts this module used to return. It is not
+    a dict subclass: serialize dict(flags) rather than the flags themselves.
+    """
+
+    solve_large_enabled: bool
+    solve_medium_enabled: bool
+    solve_small_enabled: bool
 
+    def __hash__(self) -> int:
+        return hash(
+            (
+                self.solve_large_enabled,
+                self.solve_medium_enabled,
+                self.solve_small_enabled,
+            )
+        )
 
-def location_to_stage_flags(location: str) -> dict[str, bool]:
+    def __getitem__(self, key: str) -> bool:
+        if key not in _STAGE_FLAG_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(_STAGE_FLAG_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_STAGE_FLAG_FIELDS)
+
+
+_STAGE_FLAG_FIELDS = tuple(field.name for field in fields(StageFlags))
+
+# Shared instances for all 8 flag combinations, returned by reference
+_STAGE_FLAGS = MappingProxyType(
+    {
+        flags: StageFlags(*flags)
+        for flags in itertools.product((False, True), repeat=len(_STAGE_FLAG_FIELDS))
+    }
+)
+_FLAGS_ALL = _STAGE_FLAGS[True, True, True]
+_FLAGS_FLOOR_ONLY = _STAGE_FLAGS[True, False, False]
+_FLAGS_WALL_CEILING_ONLY = _STAGE_FLAGS[False, True, False]
+_FLAGS_ON_TOP_ONLY = _STAGE_FLAGS[False, False, True]
+
+
+def location_to_stage_flags(location: str) -> StageFlags:
     """Convert location description to stage enable/disable flags.
 
     Note: Location relationships cannot be directly controlled via gin config.
@@ -375,41 +618,79 @@ def location_to_stage_flags(location: str) -> dict[str, bool]:
         location: Location description (e.g., "floor only", "wall", "on top")
 
     Returns:
-        Dictionary with solve_*_enabled flags
+        Shared StageFlags instance
     """
     normalized = parse_location_keyword(location)
 
-    if normalized == "floor_only":
-        return {
-            "solve_large_enabled": True,
-            "solve_medium_enabled": False,
-            "solve_small_enabled": False,
-        }
-    elif normalized in ("wall_only", "ceiling_only"):
-        return {
-            "solve_large_enabled": False,
-            "solve_medium_enabled": True,
-            "solve_small_enabled": False,
-        }
-    elif normalized in ("on_top_only"):
-        return {
-            "solve_large_enabled": False,
-            "solve_medium_enabled": False,
-            "solve_small_enabled": True,
-        }
+    if normalized is LocationKind.FLOOR_ONLY:
+        return _FLAGS_FLOOR_ONLY
+    elif (
+        normalized is LocationKind.WALL_ONLY or normalized is LocationKind.CEILING_ONLY
+    ):
+        return _FLAGS_WALL_CEILING_ONLY
+    elif normalized is LocationKind.ON_TOP_ONLY:
+        return _FLAGS_ON_TOP_ONLY
     else:
         # Default: enable all stages
-        return {
-            "solve_large_enabled": True,
-            "solve_medium_enabled": True,
-            "solve_small_enabled": True,
-        }
+        return _FLAGS_ALL
+
+
+# One bit per sub-stage, so a stage_types dict packs into a small int
+_STAGE_TYPE_BITS = MappingProxyType(
+    {stage_type: 1 << i for i, stage_type in enumerate(StageType)}
+)
+
+
+def _stage_mask(*stage_types: StageType) -> int:
+    mask = 0
+    for stage_type in stage_types:
+        mask |= _STAGE_TYPE_BITS[stage_type]
+    return mask
+
+
+# Sub-stages of each of the 3 main stages
+_LARGE_MASK = _stage_mask(StageType.ON_FLOOR_AND_WALL, StageType.ON_FLOOR_FREESTANDING)
+_MEDIUM_MASK = _stage_mask(StageType.ON_WALL, StageType.ON_CEILING, StageType.SIDE_OBJ)
+_SMALL_MASK = _stage_mask(StageType.OBJ_ONTOP_OBJ, StageType.OBJ_ON_SUPPORT)
+_SIDE_OBJ_MASK = _stage_mask(StageType.SIDE_OBJ)
+
+
+def _pack_stage_types(stage_types: Mapping) -> int:
+    """Bitmask of the known sub-stages that are explicitly set to True."""
+    mask = 0
+    for key, value in stage_types.items():
+        if value is True:
+            mask |= _STAGE_TYPE_BITS.get(key, 0)
+    return mask
+
+
+def _mask_to_stage_flags(mask: int) -> StageFlags:
+    """Exclusive-mode stage flags for a packed set of sub-stages."""
+    # Only enable stages that have at least one sub-type explicitly True
+    solve_large = bool(mask & _LARGE_MASK)
+    solve_medium = bool(mask & _MEDIUM_MASK)
+    solve_small = bool(mask & _SMALL_MASK)
+
+    # Enforce stage dependencies:
+    # - solve_small requires solve_large (objects on top need base objects on floor first)
+    # - side_obj (in medium) requires solve_large (objects beside need base objects first)
+    if solve_small or mask & _SIDE_OBJ_MASK:
+        solve_large = True
+
+    return _STAGE_FLAGS[solve_large, solve_medium, solve_small]
+
+
+# Exclusive-mode flags for every one of the 2^7 sub-stage combinations, indexed
+# by _pack_stage_types mask
+_EXCLUSIVE_STAGE_FLAGS = tuple(
+    _mask_to_stage_flags(mask) for mask in range(1 << len(StageType))
+)
 
 
 def stage_types_to_stage_flags(
     stage_types: dict[str, bool],
     exclusive: bool = False,
-) -> dict[str, bool]:
+) -> StageFlags:
     """Convert detailed stage types to high-level stage enable/disable flags.
 
     This function maps the 7 detailed stage types to the 3 main stages:
@@ -432,45 +713,12 @@ def stage_types_to_stage_flags(
                    If False, all stages remain True (stage_types is informational only).
 
     Returns:
-        Dictionary with solve_*_enabled flags
+        Shared StageFlags instance
     """
-    # Default: all stages enabled
-    default_flags = {
-        "solve_large_enabled": True,
-        "solve_medium_enabled": True,
-        "solve_small_enabled": True,
-    }
-
-    if not stage_types:
-        return default_flags
-
-    # If not exclusive, stage_types is descriptive only — don't restrict anything
-    if not exclusive:
-        return default_flags
+    # Default: all stages enabled. Without stage_types, or when not exclusive
+    # (stage_types is descriptive only), nothing is restricted.
+    if not stage_types or not exclusive:
+        return _FLAGS_ALL
 
     # Exclusive mode: only enable stages that have at least one sub-type explicitly True
-    large_types = ["on_floor_and_wall", "on_floor_freestanding"]
-    medium_types = ["on_wall", "on_ceiling", "side_obj"]
-    small_types = ["obj_ontop_obj", "obj_on_support"]
-
-    def _any_explicitly_true(sub_types: list[str]) -> bool:
-        """Return True if any sub-type is explicitly set to True."""
-        return any(stage_types.get(st) is True for st in sub_types)
-
-    solve_large = _any_explicitly_true(large_types)
-    solve_medium = _any_explicitly_true(medium_types)
-    solve_small = _any_explicitly_true(small_types)
-
-    # Enforce stage dependencies:
-    # - solve_small requires solve_large (objects on top need base objects on floor first)
-    # - side_obj (in medium) requires solve_large (objects beside need base objects first)
-    if solve_small:
-        solve_large = True
-    if stage_types.get("side_obj") is True:
-        solve_large = True
-
-    return {
-        "solve_large_enabled": solve_large,
-        "solve_medium_enabled": solve_medium,
-        "solve_small_enabled": solve_small,
-    }
+    return _EXCLUSIVE_STAGE_FLAGS[_pack_stage_types(stage_types)]
@@ -4,7 +4,11 @@
 
 """Validation module for parsed constraints."""
 
+import functools
+import itertools
 import logging
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional, Set
 
 from infinigen_examples.nlp import tag_mapping
@@ -15,67 +19,173 @@ logger = logging.getLogger(__name__)
 # These define which objects should be in which category
 
 # Primary objects: Objects placed directly in rooms (on floor, against wall, etc.)
-PRIMARY_OBJECTS: Set[str] = {
-    "Bed",
-    "Storage",
-    "Table",
-    "Desk",
-    "Seating",
-    "LoungeSeating",
-    "KitchenCounter",
-    "KitchenAppliance",
-    "Furniture",
-    "WallDecoration",
-    "CeilingLight",
-    "Chair",
-    "SideTable",
-    # Note: TVStand is not a Semantics tag - TVStandFactory uses Storage tag
-}
+PRIMARY_OBJECTS: frozenset[str] = frozenset(
+    {
+        "Bed",
+        "Storage",
+        "Table",
+        "Desk",
+        "Seating",
+        "LoungeSeating",
+        "KitchenCounter",
+        "KitchenAppliance",
+        "Furniture",
+        "WallDecoration",
+        "CeilingLight",
+        "Chair",
+        "SideTable",
+        # Note: TVStand is not a Semantics tag - TVStandFactory uses Storage tag
+    }
+)
 
 # Secondary objects: Objects placed on top of other objects
-SECONDARY_OBJECTS: Set[str] = {
-    "Sink",  # Placed on KitchenCounter
-    "Dishware",
-    "Cookware",
-    "Utensils",
-    "OfficeShelfItem",
-    "KitchenCounterItem",
-    "TableDisplayItem",
-    "BathroomItem",
-    "FoodPantryItem",
-    "Lighting",  # Some lighting (lamps) placed on furniture
-    "Watchable",  # TV, Monitor placed on Storage/TVStand (which uses Storage tag)
-}
+SECONDARY_OBJECTS: frozenset[str] = frozenset(
+    {
+        "Sink",  # Placed on KitchenCounter
+        "Dishware",
+        "Cookware",
+        "Utensils",
+        "OfficeShelfItem",
+        "KitchenCounterItem",
+        "TableDisplayItem",
+        "BathroomItem",
+        "FoodPantryItem",
+        "Lighting",  # Some lighting (lamps) placed on furniture
+        "Watchable",  # TV, Monitor placed on Storage/TVStand (which uses Storage tag)
+    }
+)
 
 # Parent objects: Objects that can have other objects placed on them
-PARENT_OBJECTS: Set[str] = {
-    "KitchenCounter",
-    "Storage",
-    "Table",
-    "Desk",
-    "SideTable",
-    "Bed",  # Some objects can be placed on beds
-    # Note: TVStand is not a Semantics tag - TVStandFactory uses Storage tag
-}
+PARENT_OBJECTS: frozenset[str] = frozenset(
+    {
+        "KitchenCounter",
+        "Storage",
+        "Table",
+        "Desk",
+        "SideTable",
+        "Bed",  # Some objects can be placed on beds
+        # Note: TVStand is not a Semantics tag - TVStandFactory uses Storage tag
+    }
+)
 
 # Mapping from secondary objects to their typical parent objects.
 # Used to auto-infer restrict_parent_objs and restrict_child_primary when
 # the LLM provides secondary objects but forgets the parent.
-SECONDARY_TO_PARENT: Dict[str, str] = {
-    "Sink": "KitchenCounter",
-    "Dishware": "Table",
-    "Cookware": "KitchenCounter",
-    "Utensils": "Table",
-    "KitchenCounterItem": "KitchenCounter",
-    "FoodPantryItem": "KitchenCounter",
-    "TableDisplayItem": "Table",
-    "OfficeShelfItem": "Storage",
-    "BathroomItem": "Storage",
-    "Lighting": "SideTable",
-    "Watchable": "Storage",
-    "ShelfTrinket": "Storage",
-    "HandheldItem": "Desk",
-}
+SECONDARY_TO_PARENT: Mapping[str, str] = MappingProxyType(
+    {
+        "Sink": "KitchenCounter",
+        "Dishware": "Table",
+        "Cookware": "KitchenCounter",
+        "Utensils": "Table",
+        "KitchenCounterItem": "KitchenCounter",
+        "FoodPantryItem": "KitchenCounter",
+        "TableDisplayItem": "Table",
+        "OfficeShelfItem": "Storage",
+        "BathroomItem": "Storage",
+        "Lighting": "SideTable",
+        "Watchable": "Storage",
+        "ShelfTrinket": "Storage",
+        "HandheldItem": "Desk",
+    }
+)
+
+# Object name -> (is_parent, is_primary, is_secondary), so each object is
+# classified with a single lookup
+OBJECT_CATEGORY: Mapping[str, tuple[bool, bool, bool]] = MappingProxyType(
+    {
+        name: (
+            name in PARENT_OBJECTS,
+            name in PRIMARY_OBJECTS,
+            name in SECONDARY_OBJECTS,
+        )
+        for name in PARENT_OBJECTS | PRIMARY_OBJECTS | SECONDARY_OBJECTS
+    }
+)
+_UNKNOWN_CATEGORY = (False, False, False)
+_get_category = OBJECT_CATEGORY.get
+
+_PARENT_KEY = "restrict_parent_objs"
+_PRIMARY_KEY = "restrict_child_primary"
+_SECONDARY_KEY = "restrict_child_secondary"
+_OBJECT_KEYS = (_PARENT_KEY, _PRIMARY_KEY, _SECONDARY_KEY)
+
+# Outcomes of _reclassify_target other than moving to another list
+_KEEP = None
+_DROP = ""
+_KEEP_UNKNOWN = "unknown"
+
+# Warnings returned by validate_object_classification
+_RECLASSIFIED_WARNING = (
+    "Object '{obj}' was in {source} but should be in {target}. "
+    "Automatically reclassified."
+)
+_INFERRED_PARENT_WARNING = (
+    "Auto-inferred parent '{parent}' for secondary object '{obj}'."
+)
+
+
+def _reclassify_target(
+    source_key: str, is_parent: bool, is_primary: bool, is_secondary: bool
+) -> Optional[str]:
+    """Where an object of the given category found in source_key belongs.
+
+    Returns:
+        Key of the list to move it to, _DROP to remove it, _KEEP to leave it, or
+        _KEEP_UNKNOWN to leave it and log that its category is unknown
+    """
+    if source_key == _PARENT_KEY:
+        if is_parent:
+            return _KEEP
+        # This object shouldn't be a parent; check if it should be primary or secondary
+        if is_primary:
+            return _PRIMARY_KEY
+        if is_secondary:
+            return _SECONDARY_KEY
+        return _DROP
+    if source_key == _PRIMARY_KEY:
+        if is_secondary:
+            return _SECONDARY_KEY
+        # Unknown object, but if it's in PARENT_OBJECTS, it might be valid as primary
+        if not is_primary and not is_parent:
+            return _KEEP_UNKNOWN
+        return _KEEP
+    if is_primary and not is_secondary:
+        return _PRIMARY_KEY
+    if not is_secondary and not is_primary:
+        return _KEEP_UNKNOWN
+    return _KEEP
+
+
+# Source key -> category -> _reclassify_target result, for all 8 categories
+_RECLASSIFY_RULES: Mapping[str, Mapping[tuple[bool, bool, bool], Optional[str]]] = (
+    MappingProxyType(
+        {
+            source_key: MappingProxyType(
+                {
+                    category: _reclassify_target(source_key, *category)
+                    for category in itertools.product((False, True), repeat=3)
+                }
+            )
+            for source_key in _OBJECT_KEYS
+        }
+    )
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _room_names() -> frozenset[str]:
+    """Room names accepted as-is: Semantics tag names and mapping keywords."""
+    return frozenset(tag.name for tag in tag_mapping.get_all_room_types()).union(
+        tag_mapping.ROOM_MAPPINGS
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _object_names() -> frozenset[str]:
+    """Object names accepted as-is: Semantics tag names and mapping keywords."""
+    return frozenset(tag.name for tag in tag_mapping.get_all_object_types()).union(
+        tag_mapping.OBJECT_MAPPINGS
+    )
 
 
 def validate_room_types(room_types: Optional[List[str]]) -> tuple[List[str], List[str]]:
@@ -90,19 +200,23 @@ def validate_room_types(room_types: Optional[List[str]]) -> tuple[List[str], Lis
     if room_types is None:
         return [], []
 
+    available_room_names = _room_names()
+    if available_room_names.issuperset(room_types):
+        # Usual case: every name is already a tag name or keyword
+        return list(room_types), []
+
     valid = []
     invalid = []
-    available_rooms = tag_mapping.get_all_room_types()
-    available_room_names = {tag.name for tag in available_rooms}
-
     for room in room_types:
-        # Try to map the room name
-        mapped = tag_mapping.map_room_name_to_tag(room)
-        if mapped is not None or room in available_room_names:
+        # Anything not accepted as-is, e.g. unnormalized names, must map to a tag
+        if (
+            room in available_room_names
+            or tag_mapping.map_room_name_to_tag(room) is not None
+        ):
             valid.append(room)
         else:
             invalid.append(room)
-            logger.warning(f"Unknown room type: {room}")
+            logger.warning("Unknown room type: %s", room)
 
     return valid, invalid
 
@@ -121,19 +235,23 @@ def validate_object_types(
     if object_types is None:
         return [], []
 
+    available_object_names = _object_names()
+    if available_object_names.issuperset(object_types):
+        # Usual case: every name is already a tag name or keyword
+        return list(object_types), []
+
     valid = []
     invalid = []
-    available_objects = tag_mapping.get_all_object_types()
-    available_object_names = {tag.name for tag in available_objects}
-
     for obj in object_types:
-        # Try to map the object name
-        mapped = tag_mapping.map_object_name_to_tag(obj)
-        if mapped is not None or obj in available_object_names:
+        # Anything not accepted as-is, e.g. unnormalized names, must map to a tag
+        if (
+            obj in available_object_names
+            or tag_mapping.map_object_name_to_tag(obj) is not None
+        ):
             valid.append(obj)
         else:
             invalid.append(obj)
-            logger.warning(f"Unknown object type: {obj}")
+            logger.warning("Unknown object type: %s", obj)
 
     return valid, invalid
 
@@ -175,18 +293,27 @@ def validate_quantity_limits(parsed_data: Dict[str, Any]) -> tuple[bool, List[st
 
     if max_rooms is not None and max_rooms < 1:
         logger.warning(
-            f"solve_max_rooms must be at least 1, got {max_rooms}. Setting to 1."
+            "solve_max_rooms must be at least 1, got %s. Setting to 1.", max_rooms
         )
         warnings.append("solve_max_rooms should be at least 1; was adjusted to 1.")
         parsed_data["solve_max_rooms"] = 1
 
     if max_parent_obj is not None and max_parent_obj < 0:
-        logger.error(f"solve_max_parent_obj must be non-negative, got {max_parent_obj}")
+        logger.error(
+            "solve_max_parent_obj must be non-negative, got %s", max_parent_obj
+        )
         is_valid = False
 
     return is_valid, warnings
 
 
+def _append_missing(objs: List[str], new_objs: Dict[str, None]):
+    """Append the objects in new_objs that objs does not already contain."""
+    if new_objs:
+        present = set(objs)
+        objs.extend(obj for obj in new_objs if obj not in present)
+
+
 def validate_object_classification(
     parsed_data: Dict[str, Any],
 ) -> tuple[bool, List[str]]:
@@ -202,126 +329,73 @@ def validate_object_classification(
     Returns:
         Tuple of (is_valid, list_of_warnings)
     """
+    # Get current classifications
+    objs_by_key = {key: parsed_data.get(key) or [] for key in _OBJECT_KEYS}
+
+    if not any(objs_by_key.values()):
+        # Nothing to reclassify; only normalize the empty lists to None
+        for key in _OBJECT_KEYS:
+            parsed_data[key] = None
+        return True, []
+
     warnings = []
     is_valid = True
 
-    # Get current classifications
-    restrict_parent_objs = parsed_data.get("restrict_parent_objs") or []
-    restrict_child_primary = parsed_data.get("restrict_child_primary") or []
-    restrict_child_secondary = parsed_data.get("restrict_child_secondary") or []
-
-    # Track objects that need to be moved
-    to_remove_from_parent = []
-    to_remove_from_primary = []
-    to_remove_from_secondary = []
-
-    to_add_to_parent = []
-    to_add_to_primary = []
-    to_add_to_secondary = []
-
-    # Check restrict_parent_objs
-    for obj in restrict_parent_objs:
-        obj_normalized = obj  # Already normalized in post_process
-        if obj_normalized not in PARENT_OBJECTS:
-            # This object shouldn't be a parent
-            to_remove_from_parent.append(obj)
-            # Check if it should be primary or secondary
-            if obj_normalized in PRIMARY_OBJECTS:
-                to_add_to_primary.append(obj)
-                warnings.append(
-                    f"Object '{obj}' was in restrict_parent_objs but should be in "
-                    f"restrict_child_primary. Automatically reclassified."
+    # Track objects that need to be moved. Additions are dicts used as ordered
+    # sets, so each object is added once in first-seen order
+    to_remove: Dict[str, Set[str]] = {key: set() for key in _OBJECT_KEYS}
+    to_add: Dict[str, Dict[str, None]] = {key: {} for key in _OBJECT_KEYS}
+
+    # Check each list in turn with its reclassification rules
+    for source_key in _OBJECT_KEYS:
+        rules = _RECLASSIFY_RULES[source_key]
+        for obj in objs_by_key[source_key]:
+            # Already normalized in post_process
+            target = rules[_get_category(obj, _UNKNOWN_CATEGORY)]
+            if target is _KEEP:
+                continue
+            if target is _KEEP_UNKNOWN:
+                # Unknown object, keep it but warn
+                logger.debug(
+                    "Object '%s' in %s is not in known categories", obj, source_key
                 )
-            elif obj_normalized in SECONDARY_OBJECTS:
-                to_add_to_secondary.append(obj)
+                continue
+            to_remove[source_key].add(obj)
+            if target:
+                to_add[target][obj] = None
                 warnings.append(
-                    f"Object '{obj}' was in restrict_parent_objs but should be in "
-                    f"restrict_child_secondary. Automatically reclassified."
-                )
-
-    # Check restrict_child_primary
-    for obj in restrict_child_primary:
-        obj_normalized = obj
-        if obj_normalized in SECONDARY_OBJECTS:
-            # This object should be secondary, not primary
-            to_remove_from_primary.append(obj)
-            to_add_to_secondary.append(obj)
-            warnings.append(
-                f"Object '{obj}' was in restrict_child_primary but should be in "
-                f"restrict_child_secondary. Automatically reclassified."
-            )
-        elif (
-            obj_normalized not in PRIMARY_OBJECTS
-            and obj_normalized not in SECONDARY_OBJECTS
-        ):
-            # Unknown object, but if it's in PARENT_OBJECTS, it might be valid as primary
-            # We'll keep it but warn
-            if obj_normalized not in PARENT_OBJECTS:
-                logger.debug(
-                    f"Object '{obj}' in restrict_child_primary is not in known categories"
+                    _RECLASSIFIED_WARNING.format(
+                        obj=obj, source=source_key, target=target
+                    )
                 )
 
-    # Check restrict_child_secondary
-    for obj in restrict_child_secondary:
-        obj_normalized = obj
-        if (
-            obj_normalized in PRIMARY_OBJECTS
-            and obj_normalized not in SECONDARY_OBJECTS
-        ):
-            # This object should be primary, not secondary
-            to_remove_from_secondary.append(obj)
-            to_add_to_primary.append(obj)
-            warnings.append(
-                f"Object '{obj}' was in restrict_child_secondary but should be in "
-                f"restrict_child_primary. Automatically reclassified."
-            )
-        elif (
-            obj_normalized not in SECONDARY_OBJECTS
-            and obj_normalized not in PRIMARY_OBJECTS
-        ):
-            # Unknown object, keep it but warn
-            logger.debug(
-                f"Object '{obj}' in restrict_child_secondary is not in known categories"
-            )
-
-    # Apply reclassifications
-    if to_remove_from_parent:
-        restrict_parent_objs = [
-            obj for obj in restrict_parent_objs if obj not in to_remove_from_parent
-        ]
-    if to_remove_from_primary:
-        restrict_child_primary = [
-            obj for obj in restrict_child_primary if obj not in to_remove_from_primary
-        ]
-    if to_remove_from_secondary:
-        restrict_child_secondary = [
-            obj
-            for obj in restrict_child_secondary
-            if obj not in to_remove_from_secondary
-        ]
-
-    # Add objects to correct categories (avoid duplicates)
-    for obj in to_add_to_parent:
-        if obj not in restrict_parent_objs:
-            restrict_parent_objs.append(obj)
-    for obj in to_add_to_primary:
-        if obj not in restrict_child_primary:
-            restrict_child_primary.append(obj)
-    for obj in to_add_to_secondary:
-        if obj not in restrict_child_secondary:
-            restrict_child_secondary.append(obj)
-
-    # Auto-infer parent objects from secondary objects when LLM omitted them
+    # Apply reclassifications, then add objects to correct categories (avoid
+    # duplicates)
+    for key in _OBJECT_KEYS:
+        if to_remove[key]:
+            objs_by_key[key] = [
+                obj for obj in objs_by_key[key] if obj not in to_remove[key]
+            ]
+        _append_missing(objs_by_key[key], to_add[key])
+
+    restrict_parent_objs = objs_by_key[_PARENT_KEY]
+    restrict_child_primary = objs_by_key[_PRIMARY_KEY]
+    restrict_child_secondary = objs_by_key[_SECONDARY_KEY]
+
+    # Auto-infer parent objects from secondary objects when LLM omitted them.
+    # The sets mirror the lists, which keep their order
+    parent_set = set(restrict_parent_objs)
+    primary_set = set(restrict_child_primary)
     for obj in restrict_child_secondary:
         parent = SECONDARY_TO_PARENT.get(obj)
         if parent:
-            if parent not in restrict_parent_objs:
+            if parent not in parent_set:
+                parent_set.add(parent)
                 restrict_parent_objs.append(parent)
-                warnings.append(
-                    f"Auto-inferred parent '{parent}' for secondary object '{obj}'."
-                )
+                warnings.append(_INFERRED_PARENT_WARNING.format(parent=parent, obj=obj))
             # Parent must also appear in restrict_child_primary (it is placed in the room)
-            if parent not in restrict_child_primary:
+            if parent not in primary_set:
+                primary_set.add(parent)
                 restrict_child_primary.append(parent)
 
     # Update parsed_data
@@ -369,21 +443,19 @@ def validate_constraints(parsed_data: Dict[str, Any]) -> tuple[bool, List[str]]:
             # Update parsed_data to only include valid rooms
             parsed_data["restrict_parent_rooms"] = valid_rooms if valid_rooms else None
 
-    # Validate object types (check if they exist)
-    for key in [
-        "restrict_parent_objs",
-        "restrict_child_primary",
-        "restrict_child_secondary",
-    ]:
-        obj_types = parsed_data.get(key)
-        if obj_types:
-            valid_objs, invalid_objs = validate_object_types(obj_types)
-            if invalid_objs:
-                warnings.append(
-                    f"Invalid object types in {key} (will be ignored): {invalid_objs}"
-                )
-                # Update parsed_data to only include valid objects
-                parsed_data[key] = valid_objs if valid_objs else None
+    # Validate object types (check if they exist). Usually all of them are known,
+    # which one subset check over the three lists confirms
+    object_lists = [parsed_data.get(key) or () for key in _OBJECT_KEYS]
+    if not _object_names().issuperset(itertools.chain.from_iterable(object_lists)):
+        for key, obj_types in zip(_OBJECT_KEYS, object_lists):
+            if obj_types:
+                valid_objs, invalid_objs = validate_object_types(obj_types)
+                if invalid_objs:
+                    warnings.append(
+                        f"Invalid object types in {key} (will be ignored): {invalid_objs}"
+                    )
+                    # Update parsed_data to only include valid objects
+                    parsed_data[key] = valid_objs if valid_objs else None
 
     # Validate and reclassify object categories
     classification_valid, classification_warnings = validate_object_classification(
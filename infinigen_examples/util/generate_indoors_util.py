@@ -27,6 +27,7 @@ from infinigen.core.util.camera import points_inview
 from infinigen.terrain.core import Terrain, hidden_in_viewport
 from infinigen.terrain.utils import Mesh
 from infinigen_examples.constraints import util as cu
+from infinigen_examples.nlp.generate_config import build_consgraph_matcher
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -187,7 +188,7 @@ def apply_greedy_restriction(
         if scope_domain is not None and not d.intersects(scope_domain):
             continue
         stages[k], match = r.domain_tag_substitute(
-            d, var, r.Domain(filter_tags).with_tags(var), return_match=True
+            d, var, r.Domain(set(filter_tags)).with_tags(var), return_match=True
         )
         logger.info(
             f"{apply_greedy_restriction.__name__} restricting {k=} to {filter_tags=} for {var=}"
@@ -256,7 +257,7 @@ def restrict_solving(
                     logger.info(
                         f"restrict_solving applying restrict_child_primary, limiting {k} to objects satisfying {restrict_child_primary}"
                     )
-                    stages[k] = d.intersection(r.Domain(restrict_child_primary))
+                    stages[k] = d.intersection(r.Domain(set(restrict_child_primary)))
         else:
             # Multiple tags: Domain intersection creates AND (requires ALL tags),
             # which no single object satisfies. Negation also fails due to
@@ -282,7 +283,7 @@ def restrict_solving(
                     logger.info(
                         f"restrict_solving applying restrict_child_secondary, limiting {k} to objects satisfying {restrict_child_secondary}"
                     )
-                    stages[k] = d.intersection(r.Domain(restrict_child_secondary))
+                    stages[k] = d.intersection(r.Domain(set(restrict_child_secondary)))
         else:
             logger.info(
                 f"restrict_solving: restrict_child_secondary has multiple tags {pos_tags_sec}; "
@@ -300,10 +301,10 @@ def restrict_solving(
         assert isinstance(consgraph_filters, typing.Iterable)
         old_counts = (len(problem.constraints), len(problem.score_terms))
 
+        matches = build_consgraph_matcher(consgraph_filters)
+
         def filter(d):
-            return {
-                k: v for k, v in d.items() if any(fi in k for fi in consgraph_filters)
-            }
+            return {k: v for k, v in d.items() if matches(k)}
 
         problem = cl.Problem(filter(problem.constraints), filter(problem.score_terms))
 
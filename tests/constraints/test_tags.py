@@ -4,6 +4,8 @@
 
 # Authors: Alexander Raistrick
 
+import pytest
+
 from infinigen.core import tags as t
 
 
@@ -13,3 +15,33 @@ def test_implies():
     assert t.implies({t.Subpart.Wall}, set())
 
     assert t.implies({t.Semantics.Room, t.Variable("room")}, {t.Semantics.Room})
+
+
+def test_interned():
+    assert t.Variable("room") is t.Variable("room")
+    assert -t.Semantics.Room is t.Negated(t.Semantics.Room)
+    assert t.SpecificObject("a") is not t.SpecificObject("b")
+
+
+def test_semantics_values_unique():
+    # duplicate values would silently turn members into aliases of each other
+    assert len(t.Semantics.__members__) == len({m.value for m in t.Semantics})
+    assert len(t.Subpart.__members__) == len({m.value for m in t.Subpart})
+
+
+def test_to_tag_sees_replaced_factory():
+    class DeskFactory:
+        pass
+
+    class ChairFactory:
+        pass
+
+    fac_context = {DeskFactory: {}}
+    assert t.to_tag("DeskFactory", fac_context) is t.FromGenerator(DeskFactory)
+
+    # Same length, different factory
+    del fac_context[DeskFactory]
+    fac_context[ChairFactory] = {}
+    assert t.to_tag("ChairFactory", fac_context) is t.FromGenerator(ChairFactory)
+    with pytest.raises(ValueError):
+        t.to_tag("DeskFactory", fac_context)
@@ -5,12 +5,15 @@
 """Test runner for NLP parsing module."""
 
 import argparse
+import dataclasses
 import json
 import logging
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 # Add infinigen to path
 infinigen_root = Path(__file__).parent.parent.parent
@@ -36,6 +39,12 @@ except ImportError:
         import test_cases
         import test_nlp_evaluation
 
+try:
+    import orjson
+except ImportError:
+    # optional, results are then written with the json module
+    orjson = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -46,7 +55,7 @@ def run_single_test(
     use_local_llm: bool = True,
     ollama_model: str = "gemma3",
     ollama_base_url: str = "http://localhost:11434",
-) -> Dict[str, Any]:
+) -> test_nlp_evaluation.EvalResult:
     """Run a single test case.
 
     Args:
@@ -57,10 +66,10 @@ def run_single_test(
         ollama_base_url: Ollama server base URL
 
     Returns:
-        Evaluation result dictionary
+        Evaluation result
     """
-    logger.info(f"Running test {test_case['id']}: {test_case['description']}")
-    logger.info(f"Input: {test_case['input']}")
+    logger.info("Running test %s: %s", test_case["id"], test_case["description"])
+    logger.info("Input: %s", test_case["input"])
 
     try:
         # Step 1: Parse natural language
@@ -71,20 +80,20 @@ def run_single_test(
             ollama_model=ollama_model,
             ollama_base_url=ollama_base_url,
         )
-        logger.debug(f"Parsed data: {parsed_data}")
+        logger.debug("Parsed data: %s", parsed_data)
     except Exception as e:
-        logger.error(f"Failed to parse: {e}")
+        logger.error("Failed to parse: %s", e)
         parsed_data = parse_natural_language.get_default_parsed_data()
 
     # Step 2: Post-process (pass input_text for fallback extraction)
     post_processed = post_process.post_process_parsed_data(
         parsed_data.copy(), input_text=test_case["input"]
     )
-    logger.debug(f"Post-processed: {post_processed}")
+    logger.debug("Post-processed: %s", post_processed)
 
     # Step 3: Validate (pass in-place so reclassification updates post_processed)
     is_valid, warnings = validate_constraints.validate_constraints(post_processed)
-    logger.debug(f"Validation: is_valid={is_valid}, warnings={warnings}")
+    logger.debug("Validation: is_valid=%s, warnings=%s", is_valid, warnings)
 
     # Step 4: Evaluate
     evaluation = test_nlp_evaluation.evaluate_parsing_result(
@@ -95,15 +104,15 @@ def run_single_test(
         is_valid,
     )
     # Include actual parsing results for inspection in saved JSON
-    evaluation["actual_parsed"] = parsed_data
-    evaluation["actual_post_processed"] = post_processed
+    evaluation.actual_parsed = parsed_data
+    evaluation.actual_post_processed = post_processed
 
     logger.info(
-        f"Test {test_case['id']}: {'PASSED' if evaluation['passed'] else 'FAILED'}"
+        "Test %s: %s", test_case["id"], "PASSED" if evaluation.passed else "FAILED"
     )
-    if evaluation["issues"]:
-        for issue in evaluation["issues"]:
-            logger.warning(f"  Issue: {issue}")
+    if evaluation.issues:
+        for issue in evaluation.issues:
+            logger.warning("  Issue: %s", issue)
 
     return evaluation
 
@@ -115,7 +124,9 @@ def run_all_tests(
     ollama_base_url: str = "http://localhost:11434",
     test_ids: List[str] = None,
     categories: List[str] = None,
-) -> List[Dict[str, Any]]:
+    max_concurrency: int = 4,
+    results_stream: Optional[Path] = None,
+) -> List[test_nlp_evaluation.EvalResult]:
     """Run all test cases.
 
     Args:
@@ -125,9 +136,12 @@ def run_all_tests(
         ollama_base_url: Ollama server base URL
         test_ids: Optional list of test IDs to run (if None, run all)
         categories: Optional list of categories to run (if None, run all)
+        max_concurrency: Maximum number of tests run concurrently (default: 4)
+        results_stream: Optional JSONL file, overwritten, that receives each result
+            as soon as its test finishes, so partial runs leave their results behind
 
     Returns:
-        List of evaluation result dictionaries
+        List of evaluation results, in test case order
     """
     all_test_cases = test_cases.get_test_cases()
 
@@ -142,46 +156,96 @@ def run_all_tests(
 
     logger.info(f"Running {len(test_cases_to_run)} test cases...")
 
-    results = []
-    for test_case in test_cases_to_run:
+    def run_one(test_case: Dict[str, Any]) -> test_nlp_evaluation.EvalResult:
         try:
-            result = run_single_test(
+            return run_single_test(
                 test_case,
                 use_openai=use_openai,
                 use_local_llm=use_local_llm,
                 ollama_model=ollama_model,
                 ollama_base_url=ollama_base_url,
             )
-            results.append(result)
         except Exception as e:
             logger.error(f"Error running test {test_case['id']}: {e}")
-            results.append(
-                {
-                    "test_id": test_case["id"],
-                    "category": test_case["category"],
-                    "description": test_case["description"],
-                    "input": test_case["input"],
-                    "passed": False,
-                    "issues": [f"Test execution error: {str(e)}"],
-                    "warnings": [],
-                    "validation_passed": False,
-                    "field_accuracy": {},
-                    "reclassification_detected": False,
-                    "stage_consistency": False,
-                    "actual_parsed": None,
-                    "actual_post_processed": None,
-                }
+            return test_nlp_evaluation.EvalResult(
+                test_id=test_case["id"],
+                category=test_case["category"],
+                description=test_case["description"],
+                input=test_case["input"],
+                passed=False,
+                issues=[f"Test execution error: {str(e)}"],
+                stage_consistency=False,
             )
 
-    return results
+    def run_and_stream(test_case: Dict[str, Any]) -> test_nlp_evaluation.EvalResult:
+        result = run_one(test_case)
+        if stream is not None:
+            line = _dumps_json_line(result)
+            with stream_lock:
+                stream.write(line)
+                stream.flush()
+        return result
+
+    stream = None
+    stream_lock = threading.Lock()
+    if results_stream is not None:
+        stream = open(results_stream, "w", encoding="utf-8")
+    try:
+        if len(test_cases_to_run) <= 1 or max_concurrency <= 1:
+            return [run_and_stream(test_case) for test_case in test_cases_to_run]
+
+        # Tests spend most of their time waiting on the LLM server, so overlap them
+        with ThreadPoolExecutor(
+            max_workers=min(max_concurrency, len(test_cases_to_run))
+        ) as pool:
+            return list(pool.map(run_and_stream, test_cases_to_run))
+    finally:
+        if stream is not None:
+            stream.close()
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize evaluation results for the json module; orjson does so natively."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            field.name: getattr(value, field.name)
+            for field in dataclasses.fields(value)
+        }
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps_json_line(value: Any) -> str:
+    """Serialize value as one line of JSON, with orjson if it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode() + "\n"
+    return json.dumps(value, ensure_ascii=False, default=_json_default) + "\n"
+
+
+def _write_json(path: Path, value: Any):
+    """Write value as indented UTF-8 JSON, with orjson if it is installed."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(
+                orjson.dumps(
+                    value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                )
+            )
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(value, f, indent=2, ensure_ascii=False, default=_json_default)
 
 
-def generate_report(results: List[Dict[str, Any]], output_dir: Path) -> Path:
+def generate_report(
+    results: List[test_nlp_evaluation.EvalResult],
+    output_dir: Path,
+    stats: Optional[Dict[str, Any]] = None,
+) -> Path:
     """Generate test report.
 
     Args:
         results: List of evaluation results
         output_dir: Output directory for reports
+        stats: Statistics of results, if already calculated
 
     Returns:
         Path to generated report file
@@ -189,106 +253,103 @@ def generate_report(results: List[Dict[str, Any]], output_dir: Path) -> Path:
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Calculate statistics
-    stats = test_nlp_evaluation.calculate_statistics(results)
+    if stats is None:
+        stats = test_nlp_evaluation.calculate_statistics(results)
 
     # Generate timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
     # Save JSON results
     json_path = output_dir / f"results_{timestamp}.json"
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(
-            {
-                "timestamp": timestamp,
-                "statistics": stats,
-                "results": results,
-            },
-            f,
-            indent=2,
-            ensure_ascii=False,
-        )
+    _write_json(
+        json_path,
+        {
+            "timestamp": timestamp,
+            "statistics": stats,
+            "results": results,
+        },
+    )
     logger.info(f"Saved JSON results to {json_path}")
 
     # Generate markdown report
     report_path = output_dir / f"report_{timestamp}.md"
-    with open(report_path, "w", encoding="utf-8") as f:
-        f.write("# NLP Parsing Test Report\n\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-
-        # Summary
-        f.write("## Summary\n\n")
-        f.write(f"- **Total Tests**: {stats['total']}\n")
-        f.write(f"- **Passed**: {stats['passed']}\n")
-        f.write(f"- **Failed**: {stats['failed']}\n")
-        f.write(f"- **Pass Rate**: {stats['pass_rate']:.1%}\n")
-        f.write(
-            f"- **Reclassification Detected**: {stats['reclassification_detected']} ({stats['reclassification_rate']:.1%})\n"
+    parts: List[str] = []
+    parts.append("# NLP Parsing Test Report\n\n")
+    parts.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
+    # Summary
+    parts.append("## Summary\n\n")
+    parts.append(f"- **Total Tests**: {stats['total']}\n")
+    parts.append(f"- **Passed**: {stats['passed']}\n")
+    parts.append(f"- **Failed**: {stats['failed']}\n")
+    parts.append(f"- **Pass Rate**: {stats['pass_rate']:.1%}\n")
+    parts.append(
+        f"- **Reclassification Detected**: {stats['reclassification_detected']} ({stats['reclassification_rate']:.1%})\n"
+    )
+    parts.append(
+        f"- **Stage Consistency**: {stats['stage_consistency']} ({stats['stage_consistency_rate']:.1%})\n\n"
+    )
+
+    # Category breakdown
+    parts.append("## Category Breakdown\n\n")
+    parts.append("| Category | Total | Passed | Failed | Pass Rate |\n")
+    parts.append("|----------|-------|--------|--------|-----------|\n")
+    for category, cat_stats in sorted(stats["category_stats"].items()):
+        pass_rate = (
+            cat_stats["passed"] / cat_stats["total"] if cat_stats["total"] > 0 else 0.0
+        )
+        parts.append(
+            f"| {category} | {cat_stats['total']} | {cat_stats['passed']} | {cat_stats['failed']} | {pass_rate:.1%} |\n"
+        )
+    parts.append("\n")
+
+    # Field accuracy
+    parts.append("## Field Accuracy\n\n")
+    parts.append("| Field | Accurate | Total | Accuracy Rate |\n")
+    parts.append("|-------|----------|-------|---------------|\n")
+    for field, field_stats in sorted(stats["field_accuracy"].items()):
+        accuracy_rate = (
+            field_stats["accurate"] / field_stats["total"]
+            if field_stats["total"] > 0
+            else 0.0
+        )
+        parts.append(
+            f"| {field} | {field_stats['accurate']} | {field_stats['total']} | {accuracy_rate:.1%} |\n"
         )
-        f.write(
-            f"- **Stage Consistency**: {stats['stage_consistency']} ({stats['stage_consistency_rate']:.1%})\n\n"
+    parts.append("\n")
+
+    # Failed tests
+    failed_tests = [r for r in results if not r.passed]
+    if failed_tests:
+        parts.append("## Failed Tests\n\n")
+        for result in failed_tests:
+            parts.append(f"### {result.test_id}: {result.description}\n\n")
+            parts.append(f"**Input**: {result.input}\n\n")
+            parts.append(f"**Category**: {result.category}\n\n")
+            if result.issues:
+                parts.append("**Issues**:\n")
+                parts.extend(f"- {issue}\n" for issue in result.issues)
+                parts.append("\n")
+            if result.warnings:
+                parts.append("**Warnings**:\n")
+                parts.extend(f"- {warning}\n" for warning in result.warnings)
+                parts.append("\n")
+            parts.append("\n")
+
+    # All test results
+    parts.append("## All Test Results\n\n")
+    parts.append("| ID | Category | Description | Passed | Issues |\n")
+    parts.append("|----|----------|-------------|--------|--------|\n")
+    for result in results:
+        issues_count = len(result.issues)
+        passed_mark = "✓" if result.passed else "✗"
+        parts.append(
+            f"| {result.test_id} | {result.category} | {result.description[:50]} | {passed_mark} | {issues_count} |\n"
         )
+    parts.append("\n")
 
-        # Category breakdown
-        f.write("## Category Breakdown\n\n")
-        f.write("| Category | Total | Passed | Failed | Pass Rate |\n")
-        f.write("|----------|-------|--------|--------|-----------|\n")
-        for category, cat_stats in sorted(stats["category_stats"].items()):
-            pass_rate = (
-                cat_stats["passed"] / cat_stats["total"]
-                if cat_stats["total"] > 0
-                else 0.0
-            )
-            f.write(
-                f"| {category} | {cat_stats['total']} | {cat_stats['passed']} | {cat_stats['failed']} | {pass_rate:.1%} |\n"
-            )
-        f.write("\n")
-
-        # Field accuracy
-        f.write("## Field Accuracy\n\n")
-        f.write("| Field | Accurate | Total | Accuracy Rate |\n")
-        f.write("|-------|----------|-------|---------------|\n")
-        for field, field_stats in sorted(stats["field_accuracy"].items()):
-            accuracy_rate = (
-                field_stats["accurate"] / field_stats["total"]
-                if field_stats["total"] > 0
-                else 0.0
-            )
-            f.write(
-                f"| {field} | {field_stats['accurate']} | {field_stats['total']} | {accuracy_rate:.1%} |\n"
-            )
-        f.write("\n")
-
-        # Failed tests
-        failed_tests = [r for r in results if not r["passed"]]
-        if failed_tests:
-            f.write("## Failed Tests\n\n")
-            for result in failed_tests:
-                f.write(f"### {result['test_id']}: {result['description']}\n\n")
-                f.write(f"**Input**: {result['input']}\n\n")
-                f.write(f"**Category**: {result['category']}\n\n")
-                if result["issues"]:
-                    f.write("**Issues**:\n")
-                    for issue in result["issues"]:
-                        f.write(f"- {issue}\n")
-                    f.write("\n")
-                if result["warnings"]:
-                    f.write("**Warnings**:\n")
-                    for warning in result["warnings"]:
-                        f.write(f"- {warning}\n")
-                    f.write("\n")
-                f.write("\n")
-
-        # All test results
-        f.write("## All Test Results\n\n")
-        f.write("| ID | Category | Description | Passed | Issues |\n")
-        f.write("|----|----------|-------------|--------|--------|\n")
-        for result in results:
-            issues_count = len(result.get("issues", []))
-            passed_mark = "✓" if result["passed"] else "✗"
-            f.write(
-                f"| {result['test_id']} | {result['category']} | {result['description'][:50]} | {passed_mark} | {issues_count} |\n"
-            )
-        f.write("\n")
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
 
     logger.info(f"Generated report to {report_path}")
     return report_path
@@ -332,6 +393,12 @@ def main():
         nargs="+",
         help="Specific categories to run",
     )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of tests run concurrently (default: 4)",
+    )
     parser.add_argument(
         "--output-dir",
         type=str,
@@ -340,6 +407,8 @@ def main():
     )
 
     args = parser.parse_args()
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     # Run tests
     results = run_all_tests(
@@ -349,14 +418,15 @@ def main():
         ollama_base_url=args.ollama_base_url,
         test_ids=args.test_ids,
         categories=args.categories,
+        max_concurrency=args.max_concurrency,
+        results_stream=output_dir / "results_stream.jsonl",
     )
 
     # Generate report
-    output_dir = Path(args.output_dir)
-    report_path = generate_report(results, output_dir)
+    stats = test_nlp_evaluation.calculate_statistics(results)
+    report_path = generate_report(results, output_dir, stats=stats)
 
     # Print summary
-    stats = test_nlp_evaluation.calculate_statistics(results)
     print(f"\n{'=' * 60}")
     print("Test Summary")
     print(f"{'=' * 60}")
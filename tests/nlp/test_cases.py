@@ -4,10 +4,13 @@
 
 """Test cases for NLP parsing module - Edge cases and scenarios."""
 
-from typing import Any, Dict, List
+import sys
+from collections.abc import Mapping, Sequence
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional
 
 # 20 Edge case test scenarios
-TEST_CASES = [
+_TEST_CASE_DEFINITIONS = [
     # 1. 오브젝트 분류 오류 - Sink를 primary에 넣는 경우
     #    LLM이 Sink를 parent_objs에 넣음 → validate가 secondary로 재분류
     #    fallback이 Kitchen 추출, validate가 KitchenCounter를 parent로 자동 추론
@@ -280,37 +283,67 @@ TEST_CASES = [
 ]
 
 
-def get_test_cases() -> List[Dict[str, Any]]:
+def _freeze(value: Any) -> Any:
+    """Read-only copy of value, with dicts as MappingProxyType and lists as tuples.
+
+    Strings are interned as well, so comparing them with other interned strings
+    short-circuits on identity.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType(
+            {_freeze(key): _freeze(item) for key, item in value.items()}
+        )
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+# Read-only, so the cases can be shared with every caller without copying
+TEST_CASES: Sequence[Mapping[str, Any]] = _freeze(_TEST_CASE_DEFINITIONS)
+del _TEST_CASE_DEFINITIONS
+
+# Lookup indexes over TEST_CASES, built once
+_TEST_CASES_BY_ID: Dict[str, Mapping[str, Any]] = {}
+_by_category: Dict[str, List[Mapping[str, Any]]] = {}
+for _case in TEST_CASES:
+    _TEST_CASES_BY_ID.setdefault(_case["id"], _case)
+    _by_category.setdefault(_case["category"], []).append(_case)
+_TEST_CASES_BY_CATEGORY: Dict[str, Sequence[Mapping[str, Any]]] = {
+    category: tuple(cases) for category, cases in _by_category.items()
+}
+del _case, _by_category
+
+
+def get_test_cases() -> Sequence[Mapping[str, Any]]:
     """Get all test cases.
 
     Returns:
-        List of test case dictionaries
+        Read-only sequence of read-only test case mappings
     """
     return TEST_CASES
 
 
-def get_test_case_by_id(test_id: str) -> Dict[str, Any]:
+def get_test_case_by_id(test_id: str) -> Optional[Mapping[str, Any]]:
     """Get a specific test case by ID.
 
     Args:
         test_id: Test case ID (e.g., "edge_001")
 
     Returns:
-        Test case dictionary or None if not found
+        Test case mapping or None if not found
     """
-    for case in TEST_CASES:
-        if case["id"] == test_id:
-            return case
-    return None
+    return _TEST_CASES_BY_ID.get(test_id)
 
 
-def get_test_cases_by_category(category: str) -> List[Dict[str, Any]]:
+def get_test_cases_by_category(category: str) -> Sequence[Mapping[str, Any]]:
     """Get test cases by category.
 
     Args:
         category: Category name (e.g., "object_classification_error")
 
     Returns:
-        List of test case dictionaries in the category
+        Read-only sequence of the test case mappings in the category
     """
-    return [case for case in TEST_CASES if case["category"] == category]
+    return _TEST_CASES_BY_CATEGORY.get(category, ())
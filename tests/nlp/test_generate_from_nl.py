@@ -0,0 +1,95 @@
+# Copyright (C) 2024, Princeton University.
+# This source code is licensed under the BSD 3-Clause license found in the LICENSE file in the root directory
+# of this source tree.
+
+import pytest
+
+import infinigen
+from infinigen_examples.nlp import generate_from_nl, parse_natural_language
+
+
+@pytest.fixture
+def llm_calls(monkeypatch, tmp_path):
+    """Stub out the local LLM and the configs folder; records (input, model) calls."""
+    calls = []
+
+    def parse_with_local_llm(input_text, model_name="gemma3", **kwargs):
+        calls.append((input_text, model_name))
+        return {"restrict_parent_rooms": ["Bedroom"]}
+
+    monkeypatch.setattr(
+        parse_natural_language, "parse_with_local_llm", parse_with_local_llm
+    )
+    monkeypatch.setattr(infinigen, "repo_root", lambda: tmp_path)
+    return calls
+
+
+def _generate(natural_languages, tmp_path, **kwargs):
+    return generate_from_nl.generate_scenes_from_nl(
+        natural_languages, tmp_path / "output", **kwargs
+    )
+
+
+def test_cache_reused_for_same_input_and_llm(llm_calls, tmp_path):
+    first = _generate(["a bedroom"], tmp_path)
+    second = _generate(["a bedroom"], tmp_path)
+    assert first == second
+    assert llm_calls == [("a bedroom", "gemma3")]
+
+
+def test_cache_not_reused_for_other_model(llm_calls, tmp_path):
+    _generate(["a bedroom"], tmp_path, ollama_model="gemma3")
+    _generate(["a bedroom"], tmp_path, ollama_model="llama3")
+    assert llm_calls == [("a bedroom", "gemma3"), ("a bedroom", "llama3")]
+
+
+def test_cache_not_reused_for_other_prompt_version(llm_calls, tmp_path, monkeypatch):
+    _generate(["a bedroom"], tmp_path)
+    monkeypatch.setattr(generate_from_nl.prompts, "get_prompt_version", lambda: "v2")
+    _generate(["a bedroom"], tmp_path)
+    assert len(llm_calls) == 2
+
+
+def test_cache_not_reused_for_other_input_with_same_hash(
+    llm_calls, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(generate_from_nl, "_nl_hash", lambda text: "deadbeef")
+    _generate(["a bedroom"], tmp_path)
+    _generate(["a kitchen"], tmp_path)
+    assert llm_calls == [("a bedroom", "gemma3"), ("a kitchen", "gemma3")]
+
+    # In one batch the two inputs would share a config file
+    with pytest.raises(ValueError):
+        _generate(["a bedroom", "a kitchen"], tmp_path)
+
+
+def test_configs_in_input_order_with_repeats_parsed_once(llm_calls, tmp_path):
+    inputs = ["a kitchen", "a bedroom", "a kitchen", "a bathroom"]
+    paths = _generate(inputs, tmp_path, max_concurrency=4)
+
+    assert len(paths) == len(inputs)
+    assert paths[0] == paths[2]
+    assert len(set(paths)) == 3
+    for natural_language, path in zip(inputs, paths):
+        assert generate_from_nl._nl_hash(natural_language) in path.name
+        assert path.exists()
+    assert sorted(text for text, _ in llm_calls) == [
+        "a bathroom",
+        "a bedroom",
+        "a kitchen",
+    ]
+
+
+def test_failed_parse_is_not_cached(llm_calls, tmp_path, monkeypatch):
+    def parse_with_local_llm(input_text, model_name="gemma3", **kwargs):
+        llm_calls.append((input_text, model_name))
+        raise ConnectionError("server down")
+
+    monkeypatch.setattr(
+        parse_natural_language, "parse_with_local_llm", parse_with_local_llm
+    )
+    # Falls back to the defaults, but still writes a config
+    (path,) = _generate(["a bedroom"], tmp_path)
+    assert path.exists()
+    _generate(["a bedroom"], tmp_path)
+    assert len(llm_calls) == 2
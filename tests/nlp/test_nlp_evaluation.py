@@ -4,14 +4,166 @@
 
 """Evaluation functions for NLP parsing test results."""
 
+import dataclasses
+import functools
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import re
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# (field, comparator): the comparator takes the actual value of the field and
+# returns (is_match, list_of_issues)
+_ExpectedCheck = Tuple[str, Callable[[Any], Tuple[bool, List[str]]]]
+
+
+@dataclass(frozen=True, slots=True)
+class _PreparedCase:
+    """Parts of a test case definition that evaluation derives only once."""
+
+    output_checks: Optional[Tuple[_ExpectedCheck, ...]]
+    # A None comparator marks a field expected_output already checks against
+    # the same value, whose result is reused instead of compared again
+    fix_checks: Optional[Tuple[Tuple[str, Optional[Callable]], ...]]
+    # (expected issue, pattern matching it in lowercased text)
+    expected_issues: Optional[Tuple[Tuple[str, re.Pattern], ...]]
+
+
+@dataclass(slots=True)
+class EvalResult:
+    """Evaluation result of a single test case."""
+
+    test_id: str
+    category: str
+    description: str
+    input: str
+    passed: bool = True
+    issues: List[str] = dataclasses.field(default_factory=list)
+    warnings: List[str] = dataclasses.field(default_factory=list)
+    validation_passed: bool = False
+    field_accuracy: Dict[str, bool] = dataclasses.field(default_factory=dict)
+    reclassification_detected: bool = False
+    stage_consistency: bool = True
+    # Filled in by the test runner for inspection in saved JSON
+    actual_parsed: Optional[Dict[str, Any]] = None
+    actual_post_processed: Optional[Dict[str, Any]] = None
+
+
+@dataclass(frozen=True, slots=True)
+class BatchResult:
+    """Evaluation results of several test cases.
+
+    The per-case outcomes are also laid out as arrays indexed like the test
+    cases, for statistics over large sweeps.
+    """
+
+    passed: np.ndarray
+    # Index into categories of each test case's category
+    category_id: np.ndarray
+    categories: Tuple[str, ...]
+    reclassification_detected: np.ndarray
+    stage_consistency: np.ndarray
+    results: List[EvalResult]
+
+
+# id(test_case) -> (test_case, prepared), only for read-only test cases such as
+# test_cases.TEST_CASES. Holding the test case keeps its id from being reused
+_PREPARED_CASES: Dict[int, Tuple[Mapping, _PreparedCase]] = {}
+_MAX_PREPARED_CASES = 1024
+
+# Lowercase substrings of validation warnings that indicate a reclassification,
+# matched all at once against lowercased warnings
+_RECLASSIFICATION_KEYWORDS = (
+    "reclassified",
+    "automatically",
+    "should be in",
+    "was in",
+)
+_RECLASSIFICATION_RE = re.compile("|".join(map(re.escape, _RECLASSIFICATION_KEYWORDS)))
+
+# Issues reported by the stage consistency checks
+_SECONDARY_STAGE_ISSUE = "Stage inconsistency: restrict_child_secondary has objects but solve_small_enabled=False"
+_PRIMARY_STAGE_ISSUE = "Stage inconsistency: restrict_child_primary has objects but both solve_large_enabled and solve_medium_enabled are False"
+
+
+def _expected_checks(
+    expected: Optional[Mapping],
+) -> Optional[Tuple[_ExpectedCheck, ...]]:
+    """Bind a comparator to each expected field, chosen by the expected value's type.
+
+    Frozen test cases hold tuples; these are given back to compare_lists as lists
+    so issue messages show the same values either way.
+    """
+    if expected is None:
+        return None
+    return tuple(
+        (
+            field,
+            functools.partial(
+                compare_lists,
+                expected=list(value),
+                field_name=field,
+                expected_set=frozenset(value),
+            )
+            if isinstance(value, (list, tuple))
+            else functools.partial(compare_values, expected=value, field_name=field),
+        )
+        for field, value in expected.items()
+    )
+
+
+def _prepare_test_case(test_case: Mapping) -> _PreparedCase:
+    """Return the derived parts of test_case, computing them on first use."""
+    entry = _PREPARED_CASES.get(id(test_case))
+    if entry is not None and entry[0] is test_case:
+        return entry[1]
+
+    expected_output = test_case.get("expected_output")
+    fix_checks = _expected_checks(test_case.get("expected_after_fix"))
+    if fix_checks is not None and expected_output is not None:
+        expected_after_fix = test_case["expected_after_fix"]
+        fix_checks = tuple(
+            (
+                field,
+                None
+                if field in expected_output
+                and expected_output[field] == expected_after_fix[field]
+                else compare,
+            )
+            for field, compare in fix_checks
+        )
+
+    prepared = _PreparedCase(
+        output_checks=_expected_checks(expected_output),
+        fix_checks=fix_checks,
+        expected_issues=(
+            tuple(
+                (issue, re.compile(re.escape(issue.lower())))
+                for issue in test_case["expected_issues"]
+            )
+            if "expected_issues" in test_case
+            else None
+        ),
+    )
+    if (
+        isinstance(test_case, MappingProxyType)
+        and len(_PREPARED_CASES) < _MAX_PREPARED_CASES
+    ):
+        _PREPARED_CASES[id(test_case)] = (test_case, prepared)
+    return prepared
+
 
 def compare_lists(
-    actual: Optional[List], expected: Optional[List], field_name: str
+    actual: Optional[List],
+    expected: Optional[List],
+    field_name: str,
+    expected_set: Optional[frozenset] = None,
 ) -> Tuple[bool, List[str]]:
     """Compare two lists (order-independent).
 
@@ -19,6 +171,7 @@ def compare_lists(
         actual: Actual list value
         expected: Expected list value
         field_name: Name of the field being compared
+        expected_set: The items of expected, if already built
 
     Returns:
         Tuple of (is_match, list_of_issues)
@@ -39,23 +192,37 @@ def compare_lists(
         issues.append(f"{field_name}: Expected None but got {actual}")
         return False, issues
 
-    actual_set = set(actual) if actual else set()
-    expected_set = set(expected) if expected else set()
-
-    if actual_set == expected_set:
+    if expected_set is None:
+        expected_set = frozenset(expected)
+    is_match, missing, extra = _compare_frozen(frozenset(actual), expected_set)
+    if is_match:
         return True, []
 
-    missing = expected_set - actual_set
-    extra = actual_set - expected_set
-
+    # set() keeps the messages showing a plain set
     if missing:
-        issues.append(f"{field_name}: Missing items {missing}")
+        issues.append(f"{field_name}: Missing items {set(missing)}")
     if extra:
-        issues.append(f"{field_name}: Extra items {extra}")
+        issues.append(f"{field_name}: Extra items {set(extra)}")
 
     return False, issues
 
 
+@functools.lru_cache(maxsize=4096)
+def _compare_frozen(
+    actual_set: frozenset, expected_set: frozenset
+) -> Tuple[bool, frozenset, frozenset]:
+    """Return (is_match, missing, extra) for two item sets.
+
+    Sweeps compare the same outputs against the same expected values many
+    times, so the result is cached; issue formatting is left to the caller.
+    """
+    if actual_set == expected_set:
+        return True, frozenset(), frozenset()
+    # Items on exactly one side, split by the side they came from
+    difference = actual_set ^ expected_set
+    return False, expected_set & difference, actual_set & difference
+
+
 def compare_values(
     actual: Any, expected: Any, field_name: str
 ) -> Tuple[bool, List[str]]:
@@ -88,12 +255,12 @@ def compare_values(
 
 
 def evaluate_parsing_result(
-    test_case: Dict[str, Any],
+    test_case: Mapping[str, Any],
     actual_parsed: Dict[str, Any],
     actual_post_processed: Dict[str, Any],
     validation_warnings: List[str],
     validation_is_valid: bool,
-) -> Dict[str, Any]:
+) -> EvalResult:
     """Evaluate a single test case result.
 
     Args:
@@ -104,175 +271,213 @@ def evaluate_parsing_result(
         validation_is_valid: Whether validation passed
 
     Returns:
-        Evaluation result dictionary
+        Evaluation result
     """
-    result = {
-        "test_id": test_case["id"],
-        "category": test_case["category"],
-        "description": test_case["description"],
-        "input": test_case["input"],
-        "passed": True,
-        "issues": [],
-        "warnings": validation_warnings,
-        "validation_passed": validation_is_valid,
-        "field_accuracy": {},
-        "reclassification_detected": False,
-        "stage_consistency": True,
-    }
-
-    # Check expected output if provided
-    if "expected_output" in test_case:
-        expected = test_case["expected_output"]
-        field_issues = {}
-
-        for field, expected_value in expected.items():
-            actual_value = actual_post_processed.get(field)
+    result = EvalResult(
+        test_id=test_case["id"],
+        category=test_case["category"],
+        description=test_case["description"],
+        input=test_case["input"],
+        warnings=validation_warnings,
+        validation_passed=validation_is_valid,
+    )
 
-            if isinstance(expected_value, list):
-                is_match, issues = compare_lists(actual_value, expected_value, field)
-            else:
-                is_match, issues = compare_values(actual_value, expected_value, field)
+    prepared = _prepare_test_case(test_case)
+    get_actual = actual_post_processed.get
+    field_issues = {}
 
-            result["field_accuracy"][field] = is_match
+    # Check expected output if provided
+    if prepared.output_checks is not None:
+        for field, compare in prepared.output_checks:
+            is_match, issues = compare(get_actual(field))
+            result.field_accuracy[field] = is_match
             if not is_match:
                 field_issues[field] = issues
-                result["passed"] = False
-
-        if field_issues:
-            result["issues"].extend(
-                [
-                    f"{field}: {', '.join(issues)}"
-                    for field, issues in field_issues.items()
-                ]
-            )
+                result.issues.append(f"{field}: {', '.join(issues)}")
+                result.passed = False
+
+    # Lowercase each warning and issue once for the case-insensitive checks below
+    warnings_lower = [warning.lower() for warning in validation_warnings]
 
     # Check expected issues if provided
-    if "expected_issues" in test_case:
-        expected_issues = test_case["expected_issues"]
+    if prepared.expected_issues is not None:
+        issues_lower = [issue.lower() for issue in result.issues]
         found_issues = []
 
-        for expected_issue in expected_issues:
+        for expected_issue, pattern in prepared.expected_issues:
             # Check if this issue is mentioned in warnings or actual issues
-            issue_found = False
-            for warning in validation_warnings:
-                if expected_issue.lower() in warning.lower():
-                    issue_found = True
-                    found_issues.append(expected_issue)
-                    break
-
-            if not issue_found:
-                for actual_issue in result["issues"]:
-                    if expected_issue.lower() in actual_issue.lower():
-                        issue_found = True
-                        found_issues.append(expected_issue)
-                        break
-
-            if not issue_found:
-                result["issues"].append(
-                    f"Expected issue not detected: {expected_issue}"
-                )
-                result["passed"] = False
+            if any(map(pattern.search, warnings_lower)) or any(
+                map(pattern.search, issues_lower)
+            ):
+                found_issues.append(expected_issue)
+            else:
+                not_detected = f"Expected issue not detected: {expected_issue}"
+                result.issues.append(not_detected)
+                issues_lower.append(not_detected.lower())
+                result.passed = False
 
         if found_issues:
-            result["issues"].append(
-                f"Expected issues detected: {', '.join(found_issues)}"
-            )
+            result.issues.append(f"Expected issues detected: {', '.join(found_issues)}")
 
     # Check expected_after_fix if provided
-    if "expected_after_fix" in test_case:
-        expected_fixed = test_case["expected_after_fix"]
-        for field, expected_value in expected_fixed.items():
-            actual_value = actual_post_processed.get(field)
-
-            if isinstance(expected_value, list):
-                is_match, issues = compare_lists(actual_value, expected_value, field)
+    if prepared.fix_checks is not None:
+        for field, compare in prepared.fix_checks:
+            if compare is None:
+                # Same expectation as expected_output: reuse that comparison
+                issues = field_issues.get(field)
+                is_match = issues is None
             else:
-                is_match, issues = compare_values(actual_value, expected_value, field)
-
+                is_match, issues = compare(get_actual(field))
             if not is_match:
-                result["issues"].append(f"After fix - {field}: {', '.join(issues)}")
-                result["passed"] = False
+                result.issues.append(f"After fix - {field}: {', '.join(issues)}")
+                result.passed = False
 
     # Check for reclassification
-    reclassification_keywords = [
-        "reclassified",
-        "automatically",
-        "should be in",
-        "was in",
-    ]
-    for warning in validation_warnings:
-        for keyword in reclassification_keywords:
-            if keyword.lower() in warning.lower():
-                result["reclassification_detected"] = True
-                break
+    result.reclassification_detected = any(
+        map(_RECLASSIFICATION_RE.search, warnings_lower)
+    )
 
     # Check stage consistency
-    restrict_child_secondary = actual_post_processed.get("restrict_child_secondary")
-    solve_small_enabled = actual_post_processed.get("solve_small_enabled", True)
+    restrict_child_secondary = get_actual("restrict_child_secondary")
+    restrict_child_primary = get_actual("restrict_child_primary")
+    solve_large_enabled = get_actual("solve_large_enabled", True)
+    solve_medium_enabled = get_actual("solve_medium_enabled", True)
+    solve_small_enabled = get_actual("solve_small_enabled", True)
+
+    stage_checks = (
+        (
+            restrict_child_secondary and not solve_small_enabled,
+            _SECONDARY_STAGE_ISSUE,
+        ),
+        (
+            restrict_child_primary
+            and not (solve_large_enabled or solve_medium_enabled),
+            _PRIMARY_STAGE_ISSUE,
+        ),
+    )
+    for inconsistent, issue in stage_checks:
+        if inconsistent:
+            result.stage_consistency = False
+            result.issues.append(issue)
+            result.passed = False
 
-    if restrict_child_secondary and not solve_small_enabled:
-        result["stage_consistency"] = False
-        result["issues"].append(
-            "Stage inconsistency: restrict_child_secondary has objects but solve_small_enabled=False"
-        )
-        result["passed"] = False
+    return result
 
-    restrict_child_primary = actual_post_processed.get("restrict_child_primary")
-    solve_large_enabled = actual_post_processed.get("solve_large_enabled", True)
-    solve_medium_enabled = actual_post_processed.get("solve_medium_enabled", True)
 
-    if restrict_child_primary and not (solve_large_enabled or solve_medium_enabled):
-        result["stage_consistency"] = False
-        result["issues"].append(
-            "Stage inconsistency: restrict_child_primary has objects but both solve_large_enabled and solve_medium_enabled are False"
-        )
-        result["passed"] = False
+def evaluate_parsing_results(
+    test_cases: Sequence[Mapping[str, Any]],
+    actuals_parsed: Sequence[Dict[str, Any]],
+    actuals_post_processed: Sequence[Dict[str, Any]],
+    validation_warnings: Sequence[List[str]],
+    validation_is_valid: Sequence[bool],
+) -> BatchResult:
+    """Evaluate the results of several test cases at once.
 
-    return result
+    Args:
+        test_cases: Test case definitions
+        actuals_parsed: Raw parsed data from LLM, per test case
+        actuals_post_processed: Post-processed parsed data, per test case
+        validation_warnings: Warnings from validation, per test case
+        validation_is_valid: Whether validation passed, per test case
 
+    Returns:
+        Batch of evaluation results
 
-def calculate_statistics(evaluation_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    Raises:
+        ValueError: If the sequences differ in length
+    """
+    n = len(test_cases)
+    if not (
+        len(actuals_parsed)
+        == len(actuals_post_processed)
+        == len(validation_warnings)
+        == len(validation_is_valid)
+        == n
+    ):
+        raise ValueError("All sequences must have one entry per test case")
+
+    passed = np.empty(n, dtype=bool)
+    category_id = np.empty(n, dtype=np.int32)
+    reclassification_detected = np.empty(n, dtype=bool)
+    stage_consistency = np.empty(n, dtype=bool)
+    category_ids: Dict[str, int] = {}
+    results = []
+
+    for i, test_case in enumerate(test_cases):
+        result = evaluate_parsing_result(
+            test_case,
+            actuals_parsed[i],
+            actuals_post_processed[i],
+            validation_warnings[i],
+            validation_is_valid[i],
+        )
+        passed[i] = result.passed
+        category_id[i] = category_ids.setdefault(result.category, len(category_ids))
+        reclassification_detected[i] = result.reclassification_detected
+        stage_consistency[i] = result.stage_consistency
+        results.append(result)
+
+    return BatchResult(
+        passed=passed,
+        category_id=category_id,
+        categories=tuple(category_ids),
+        reclassification_detected=reclassification_detected,
+        stage_consistency=stage_consistency,
+        results=results,
+    )
+
+
+def calculate_statistics(evaluation_results: List[EvalResult]) -> Dict[str, Any]:
     """Calculate statistics from evaluation results.
 
     Args:
-        evaluation_results: List of evaluation result dictionaries
+        evaluation_results: List of evaluation results
 
     Returns:
         Statistics dictionary
     """
     total = len(evaluation_results)
-    passed = sum(1 for r in evaluation_results if r["passed"])
-    failed = total - passed
-
-    # Category breakdown
-    category_stats = {}
+    reclassification_count = 0
+    consistent_count = 0
+    category_total = Counter()
+    category_passed = Counter()
+    field_total = Counter()
+    field_accurate = Counter()
+
+    # One pass over the results for all counters
     for result in evaluation_results:
-        category = result["category"]
-        if category not in category_stats:
-            category_stats[category] = {"total": 0, "passed": 0, "failed": 0}
-        category_stats[category]["total"] += 1
-        if result["passed"]:
-            category_stats[category]["passed"] += 1
-        else:
-            category_stats[category]["failed"] += 1
-
-    # Reclassification stats
-    reclassification_count = sum(
-        1 for r in evaluation_results if r["reclassification_detected"]
-    )
+        category = result.category
+        category_total[category] += 1
+        if result.passed:
+            category_passed[category] += 1
+
+        if result.reclassification_detected:
+            reclassification_count += 1
+        if result.stage_consistency:
+            consistent_count += 1
+
+        field_results = result.field_accuracy
+        field_total.update(field_results.keys())
+        field_accurate.update(
+            field for field, is_accurate in field_results.items() if is_accurate
+        )
 
-    # Stage consistency stats
-    consistent_count = sum(1 for r in evaluation_results if r["stage_consistency"])
+    passed = sum(category_passed.values())
+    failed = total - passed
 
-    # Field accuracy
-    field_accuracy = {}
-    for result in evaluation_results:
-        for field, is_accurate in result.get("field_accuracy", {}).items():
-            if field not in field_accuracy:
-                field_accuracy[field] = {"total": 0, "accurate": 0}
-            field_accuracy[field]["total"] += 1
-            if is_accurate:
-                field_accuracy[field]["accurate"] += 1
+    # Category breakdown and field accuracy, in first-seen order
+    category_stats = {
+        category: {
+            "total": count,
+            "passed": category_passed[category],
+            "failed": count - category_passed[category],
+        }
+        for category, count in category_total.items()
+    }
+    field_accuracy = {
+        field: {"total": count, "accurate": field_accurate[field]}
+        for field, count in field_total.items()
+    }
 
     return {
         "total": total,
@@ -0,0 +1,61 @@
+# Copyright (C) 2024, Princeton University.
+# This source code is licensed under the BSD 3-Clause license found in the LICENSE file in the root directory
+# of this source tree.
+
+import socket
+import time
+
+import pytest
+
+from infinigen_examples.nlp import parse_natural_language
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Local LLM stub: later inputs answer sooner, and "fail" raises."""
+
+    def parse_with_local_llm(input_text, **kwargs):
+        if input_text == "fail":
+            raise ConnectionError("server down")
+        time.sleep(0.05 / (1 + len(input_text)))
+        return {"input": input_text}
+
+    monkeypatch.setattr(
+        parse_natural_language, "parse_with_local_llm", parse_with_local_llm
+    )
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 4])
+def test_batch_results_in_input_order(fake_llm, max_concurrency):
+    inputs = ["a", "bb", "ccc", "dddd", "a"]
+    results = parse_natural_language.parse_natural_language_batch(
+        inputs, max_concurrency=max_concurrency
+    )
+    assert results == [{"input": text} for text in inputs]
+
+
+def test_batch_failure_yields_defaults(fake_llm):
+    results = parse_natural_language.parse_natural_language_batch(["a", "fail"])
+    assert results[0] == {"input": "a"}
+    assert results[1] == parse_natural_language.get_default_parsed_data()
+
+
+def test_batch_failure_yields_exception(fake_llm):
+    results = parse_natural_language.parse_natural_language_batch(
+        ["fail", "a"], return_exceptions=True
+    )
+    assert isinstance(results[0], ConnectionError)
+    assert results[1] == {"input": "a"}
+
+
+def test_unreachable_server_times_out():
+    pytest.importorskip("ollama")
+    # Accepts connections but never answers
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        base_url = f"http://127.0.0.1:{server.getsockname()[1]}"
+        start = time.monotonic()
+        with pytest.raises(ConnectionError):
+            parse_natural_language.parse_with_local_llm(
+                "a bedroom", base_url=base_url, timeout=0.5
+            )
+        assert time.monotonic() - start < 5
@@ -0,0 +1,31 @@
+# Copyright (C) 2024, Princeton University.
+# This source code is licensed under the BSD 3-Clause license found in the LICENSE file in the root directory
+# of this source tree.
+
+from infinigen_examples.nlp import post_process, tag_mapping
+
+
+def _large_enabled(value):
+    parsed_data = {
+        "stage_types": {"on_floor_and_wall": value},
+        "stage_exclusive": True,
+    }
+    return post_process.process_stage_types(parsed_data)["solve_large_enabled"]
+
+
+def _large_enabled_uncached(value):
+    return tag_mapping.stage_types_to_stage_flags(
+        {"on_floor_and_wall": value}, exclusive=True
+    )["solve_large_enabled"]
+
+
+def test_process_stage_types_independent_of_call_order():
+    # 1 == True and both hash alike, but only True enables a stage, so the
+    # stage flag cache must not hand one's result to the other
+    assert not _large_enabled_uncached(1)
+    assert _large_enabled_uncached(True)
+
+    for order in ((1, True), (True, 1)):
+        post_process._stage_flags_cached.cache_clear()
+        for value in order:
+            assert _large_enabled(value) == _large_enabled_uncached(value)
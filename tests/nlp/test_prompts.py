@@ -0,0 +1,26 @@
+# Copyright (C) 2024, Princeton University.
+# This source code is licensed under the BSD 3-Clause license found in the LICENSE file in the root directory
+# of this source tree.
+
+from infinigen_examples.nlp import prompts
+from infinigen_examples.nlp.tag_mapping import StageType
+
+
+def test_try_fast_parse_prefers_longest_keyword():
+    assert prompts.try_fast_parse("a sofa, not against wall") == {
+        "stage_types": {StageType.ON_FLOOR_FREESTANDING: True}
+    }
+    assert prompts.try_fast_parse("a sofa against wall") == {
+        "stage_types": {StageType.ON_FLOOR_AND_WALL: True}
+    }
+
+
+def test_try_fast_parse_ignores_keywords_inside_words_and_names():
+    assert prompts.try_fast_parse("an entertainment center") is None
+    assert prompts.try_fast_parse("aboveground pool") is None
+    assert prompts.try_fast_parse("a rug in the center") == {
+        "stage_types": {StageType.ON_FLOOR_FREESTANDING: True}
+    }
+    assert prompts.try_fast_parse("천장에 조명") == {
+        "stage_types": {StageType.ON_CEILING: True}
+    }
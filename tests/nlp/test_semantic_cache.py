@@ -0,0 +1,149 @@
+# Copyright (C) 2024, Princeton University.
+# This source code is licensed under the BSD 3-Clause license found in the LICENSE file in the root directory
+# of this source tree.
+
+import numpy as np
+import pytest
+
+from infinigen_examples.nlp import parse_natural_language, semantic_cache
+
+PARSED_BY = "ollama/gemma3@v1"
+
+
+def _unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_lookup_threshold(tmp_path):
+    cache = semantic_cache.SemanticCache(tmp_path)
+    cache.add("a bedroom", _unit(1, 0, 0), {"rooms": ["Bedroom"]}, PARSED_BY)
+
+    # cos = 0.8
+    assert cache.lookup(_unit(0.8, 0.6, 0), PARSED_BY, threshold=0.9) is None
+    assert cache.lookup(_unit(0.8, 0.6, 0), PARSED_BY, threshold=0.7) == {
+        "rooms": ["Bedroom"]
+    }
+
+
+def test_lookup_picks_most_similar(tmp_path):
+    cache = semantic_cache.SemanticCache(tmp_path)
+    cache.add("a bedroom", _unit(1, 0, 0), {"rooms": ["Bedroom"]}, PARSED_BY)
+    cache.add("a kitchen", _unit(0, 1, 0), {"rooms": ["Kitchen"]}, PARSED_BY)
+    assert cache.lookup(_unit(0.3, 1, 0), PARSED_BY, threshold=0.5) == {
+        "rooms": ["Kitchen"]
+    }
+
+
+def test_lookup_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache.time, "time", lambda: now[0])
+    cache = semantic_cache.SemanticCache(tmp_path)
+    cache.add("old", _unit(1, 0), {"rooms": ["Bedroom"]}, PARSED_BY)
+    now[0] = 1100.0
+    cache.add("new", _unit(0.9, 0.1), {"rooms": ["Kitchen"]}, PARSED_BY)
+    now[0] = 1150.0
+
+    assert cache.lookup(_unit(1, 0), PARSED_BY, threshold=0.9) == {"rooms": ["Bedroom"]}
+    # The closer but expired entry is skipped
+    assert cache.lookup(_unit(1, 0), PARSED_BY, threshold=0.9, ttl=100) == {
+        "rooms": ["Kitchen"]
+    }
+    assert cache.lookup(_unit(1, 0), PARSED_BY, threshold=0.9, ttl=10) is None
+
+
+def test_lookup_only_reuses_same_parser_and_embed_model(tmp_path):
+    cache = semantic_cache.SemanticCache(tmp_path)
+    cache.add("a bedroom", _unit(1, 0), {"rooms": ["Bedroom"]}, PARSED_BY)
+    assert cache.lookup(_unit(1, 0), "ollama/llama3@v1") is None
+    assert cache.lookup(_unit(1, 0), "ollama/gemma3@v2") is None
+    assert cache.lookup(_unit(1, 0), PARSED_BY, embed_model="other") is None
+    assert cache.lookup(_unit(1, 0), PARSED_BY) == {"rooms": ["Bedroom"]}
+
+
+def test_add_and_reload(tmp_path):
+    cache = semantic_cache.SemanticCache(tmp_path)
+    cache.add("침실", _unit(1, 0, 0), {"rooms": ["Bedroom"]}, PARSED_BY)
+    cache.add("a kitchen", _unit(0, 1, 0), {"rooms": ["Kitchen"]}, "ollama/llama3@v1")
+
+    reloaded = semantic_cache.SemanticCache(tmp_path)
+    assert len(reloaded) == 2
+    assert reloaded.lookup(_unit(1, 0, 0), PARSED_BY) == {"rooms": ["Bedroom"]}
+    assert reloaded.lookup(_unit(0, 1, 0), "ollama/llama3@v1") == {"rooms": ["Kitchen"]}
+
+    # Appending after a reload keeps the earlier entries
+    reloaded.add("a bathroom", _unit(0, 0, 1), {"rooms": ["Bathroom"]}, PARSED_BY)
+    assert len(semantic_cache.SemanticCache(tmp_path)) == 3
+
+
+def test_reload_skips_interrupted_write(tmp_path):
+    cache = semantic_cache.SemanticCache(tmp_path)
+    cache.add("a bedroom", _unit(1, 0), {"rooms": ["Bedroom"]}, PARSED_BY)
+    with open(tmp_path / semantic_cache._ENTRIES_FILE, "a") as f:
+        f.write('{"text": "a kit')
+
+    reloaded = semantic_cache.SemanticCache(tmp_path)
+    assert len(reloaded) == 1
+    assert reloaded.lookup(_unit(1, 0), PARSED_BY) == {"rooms": ["Bedroom"]}
+
+
+def test_embedding_dimension_change(tmp_path):
+    cache = semantic_cache.SemanticCache(tmp_path)
+    cache.add("a bedroom", _unit(1, 0), {"rooms": ["Bedroom"]}, PARSED_BY)
+    assert cache.lookup(_unit(1, 0, 0), PARSED_BY) is None
+
+    # Entries of the old dimension can never match again, so the cache starts over
+    cache.add("a kitchen", _unit(0, 1, 0), {"rooms": ["Kitchen"]}, PARSED_BY)
+    for instance in (cache, semantic_cache.SemanticCache(tmp_path)):
+        assert len(instance) == 1
+        assert instance.lookup(_unit(0, 1, 0), PARSED_BY) == {"rooms": ["Kitchen"]}
+
+
+def test_get_semantic_cache_one_instance_per_directory(tmp_path):
+    semantic_cache.get_semantic_cache.cache_clear()
+    assert semantic_cache.get_semantic_cache(
+        str(tmp_path)
+    ) is semantic_cache.get_semantic_cache(str(tmp_path))
+
+
+@pytest.fixture
+def stub_embed(monkeypatch):
+    """Embed texts by their first word, so paraphrases get identical embeddings."""
+    vocabulary = {"bedroom": _unit(1, 0, 0), "kitchen": _unit(0, 1, 0)}
+
+    def embed(self, texts, **kwargs):
+        return np.stack([vocabulary[text.split()[0].rstrip(",")] for text in texts])
+
+    monkeypatch.setattr(semantic_cache.SemanticCache, "embed", embed)
+
+
+def test_parse_natural_language_reuses_paraphrase_of_same_llm(
+    tmp_path, monkeypatch, stub_embed
+):
+    calls = []
+
+    def parse_with_local_llm(input_text, model_name="gemma3", **kwargs):
+        calls.append((input_text, model_name))
+        return {"restrict_parent_rooms": [input_text]}
+
+    monkeypatch.setattr(
+        parse_natural_language, "parse_with_local_llm", parse_with_local_llm
+    )
+    semantic_cache.get_semantic_cache.cache_clear()
+
+    def parse(input_text, **kwargs):
+        return parse_natural_language.parse_natural_language(
+            input_text, semantic_cache_dir=tmp_path, **kwargs
+        )
+
+    assert parse("bedroom with a desk") == {
+        "restrict_parent_rooms": ["bedroom with a desk"]
+    }
+    assert parse("bedroom, desk") == {"restrict_parent_rooms": ["bedroom with a desk"]}
+    parse("kitchen")
+    parse("bedroom, desk", ollama_model="llama3")
+    assert calls == [
+        ("bedroom with a desk", "gemma3"),
+        ("kitchen", "gemma3"),
+        ("bedroom, desk", "llama3"),
+    ]
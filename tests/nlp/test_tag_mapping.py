@@ -0,0 +1,61 @@
+# Copyright (C) 2024, Princeton University.
+# This source code is licensed under the BSD 3-Clause license found in the LICENSE file in the root directory
+# of this source tree.
+
+import json
+
+from infinigen.core import tags as t
+from infinigen_examples.nlp import tag_mapping
+
+
+def test_stage_flags_behave_like_dict():
+    flags = tag_mapping.location_to_stage_flags("floor only")
+    expected = {
+        "solve_large_enabled": True,
+        "solve_medium_enabled": False,
+        "solve_small_enabled": False,
+    }
+
+    assert flags == expected
+    assert expected == flags
+    assert flags != {**expected, "solve_small_enabled": True}
+    assert flags["solve_large_enabled"] is True
+    assert flags.solve_medium_enabled is False
+    assert dict(flags) == expected
+    assert json.loads(json.dumps(dict(flags))) == expected
+
+
+def test_stage_flags_shared_and_hashable():
+    flags = tag_mapping.stage_types_to_stage_flags(
+        {"on_floor_freestanding": True}, exclusive=True
+    )
+    assert flags is tag_mapping.location_to_stage_flags("floor only")
+    assert flags == tag_mapping.StageFlags(True, False, False)
+    assert len({flags, tag_mapping.StageFlags(True, False, False)}) == 1
+
+
+def test_find_keywords_match_whole_english_words():
+    assert tag_mapping.find_rooms_in_text("a bedroom and a bathroom") == [
+        t.Semantics.Bedroom,
+        t.Semantics.Bathroom,
+    ]
+    # "bed" and "bath" are object keywords, but not inside "bedroom"/"bathroom"
+    assert tag_mapping.find_objects_in_text("a bedroom and a bathroom") == []
+    assert tag_mapping.find_objects_in_text("a mattress in the doorway") == []
+
+
+def test_find_keywords_match_plurals_and_korean_particles():
+    assert tag_mapping.find_objects_in_text("two beds, three Chairs") == [
+        t.Semantics.Bed,
+        t.Semantics.Chair,
+    ]
+    assert tag_mapping.find_objects_in_text("침대를 침실에") == [t.Semantics.Bed]
+    assert tag_mapping.find_rooms_in_text("bedroom에 책상") == [t.Semantics.Bedroom]
+
+
+def test_find_keywords_prefer_longest_match():
+    assert tag_mapping.find_objects_in_text("a side table and a table") == [
+        t.Semantics.SideTable,
+        t.Semantics.Table,
+    ]
+    assert tag_mapping.find_rooms_in_text("living room") == [t.Semantics.LivingRoom]